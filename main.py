@@ -470,6 +470,7 @@ class TIHubApp:
     # Adicionar método para exibir a tela de contato na classe TIHubApp
     def _show_contact_view(self):
         """Exibe a tela de informações de contato"""
+        self._unmount_current_module()
         self.module_content.controls.clear()
         
         # Carrega as informações de contato
@@ -661,6 +662,7 @@ class TIHubApp:
     # Adicionar método para mostrar a tela do PACS
     def _show_pacs_view(self):
         """Exibe a tela do módulo PACS"""
+        self._unmount_current_module()
         self.module_content.controls.clear()
 
         try:
@@ -1369,7 +1371,7 @@ class TIHubApp:
         )
     
         self.module_content.controls.append(main_container)
-        self.current_module = None  # Marca que estamos na tela inicial
+        self._unmount_current_module()  # Marca que estamos na tela inicial
         self.page.update()
 
     def _create_links_card(self):
@@ -1479,34 +1481,27 @@ class TIHubApp:
 
     def _show_links_view(self):
         """Exibe a tela de Links Úteis"""
+        # Desmonta o módulo anterior (inclusive uma visita anterior a esta tela)
+        self._unmount_current_module()
         self.module_content.controls.clear()
         
         # Carrega o módulo de links úteis
         try:
-            # Verifica se o módulo já existe
-            module_path = os.path.join(MODULES_DIR, "useful_links.py")
-            if not os.path.exists(module_path):
-                # Se não existir, cria o diretório e o arquivo
-                os.makedirs(MODULES_DIR, exist_ok=True)
-                
-                # Importa o módulo
-                spec = importlib.util.spec_from_file_location("useful_links", module_path)
-                module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(module)
-                
-                # Instancia o módulo
-                links_module = module.Module()
-            else:
-                # Se já existir, carrega normalmente
+            # Reaproveita a instância do carregador de módulos, para não acumular uma por visita
+            links_module = self.module_loader.get_modules().get("useful_links")
+            if links_module is None:
+                module_path = os.path.join(MODULES_DIR, "useful_links.py")
                 spec = importlib.util.spec_from_file_location("useful_links", module_path)
                 module = importlib.util.module_from_spec(spec)
                 spec.loader.exec_module(module)
                 
-                # Instancia o módulo
+                # Instancia o módulo e o registra para as próximas visitas
                 links_module = module.Module()
+                self.module_loader.get_modules()["useful_links"] = links_module
             
             # Adiciona a visualização do módulo
             self.module_content.controls.append(links_module.get_view())
+            self.current_module = "useful_links"
             
             # Configura a página para o módulo
             links_module.did_mount(self.page)
@@ -1653,6 +1648,7 @@ class TIHubApp:
 
     def _show_admin_view(self):
         """Exibe a tela de administração"""
+        self._unmount_current_module()
         self.module_content.controls.clear()
         
         # Título
@@ -2032,6 +2028,9 @@ class TIHubApp:
         self.page.update()
 
     def _handle_logout(self, e):
+        # Para as threads do módulo em exibição antes de sair
+        self._unmount_current_module()
+        
         # Redefine o estado de autenticação
         self.is_authenticated = False
         self.auth_manager.current_user = None
@@ -2039,13 +2038,27 @@ class TIHubApp:
         # Redireciona para a tela de login
         self._show_login_view()
 
+    def _unmount_current_module(self):
+        """Avisa o módulo em exibição de que ele será removido da página"""
+        module = self.module_loader.get_modules().get(self.current_module)
+        if module and hasattr(module, "will_unmount"):
+            module.will_unmount()
+        self.current_module = None
+
     def _show_module_view(self, module_name):
         module = self.module_loader.get_modules().get(module_name)
         if module:
+            # Desmonta também ao clicar de novo no módulo atual, pareando com o did_mount abaixo
+            self._unmount_current_module()
+
             self.module_content.controls.clear()
             self.module_content.controls.append(module.get_view())
+            self.current_module = module_name
             self.page.update()
 
+            if hasattr(module, "did_mount"):
+                module.did_mount(self.page)
+
     # Modificar o método _create_sidebar para adicionar o botão de suporte
     def _create_sidebar(self, modules_rail, theme_switch):
         """Cria a barra lateral com layout melhorado e responsivo"""
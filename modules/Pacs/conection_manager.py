@@ -10,23 +10,329 @@ import requests
 import zipfile
 import tarfile
 import shutil
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Callable
 import re
+import threading
+import time
+import hashlib
+import shlex
+import bisect
+import importlib.util
+import socket
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import paramiko
+except ImportError:
+    # Sem paramiko, a execução em lote usa o cliente OpenSSH (somente autenticação por chave)
+    paramiko = None
 
 # Configurações
 CONFIG_FILE = "ssh_manager_config.json"
 SCRIPTS_FILE = "ssh_manager_scripts.json"
+CLIENT_CACHE_FILE = "ssh_manager_clients_cache.json"
+CONFIG_SAVE_DELAY = 0.5  # segundos: alterações em sequência geram uma única gravação
+SEARCH_NGRAM = 3  # tamanho máximo dos n-gramas do índice de busca de hosts
+SEARCH_DEBOUNCE_SECONDS = 0.25  # espera após a última tecla antes de filtrar a grade
+HOST_GRID_PAGE_SIZE = 60  # cards renderizados por vez na grade de hosts
+HOST_GRID_LOAD_MARGIN = 400  # pixels antes do fim da rolagem para carregar a próxima página
 DEFAULT_GROUP = "Default"
 ICON_PATH = os.path.join(os.path.dirname(__file__), "assets")
 
+# Conexões SSH reutilizáveis (ControlMaster do OpenSSH / sessões paramiko)
+SSH_POOL_DIR = os.path.join(str(Path.home()), ".ssh_manager_cm")  # caminho curto: sockets têm limite de ~100 caracteres
+SSH_POOL_IDLE_SECONDS = 600  # conexão mestre encerrada após esse tempo sem uso
+SSH_POOL_MAX_MASTERS = 32  # além disso, as menos usadas recentemente são encerradas
+KNOWN_HOSTS_FILE = os.path.join(str(Path.home()), ".ssh", "known_hosts")
+
+# Downloads dos clientes (PuTTY, MobaXterm)
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+DOWNLOAD_TIMEOUT = (10, 60)  # segundos: conexão, leitura entre blocos
+DOWNLOAD_RETRIES = 3  # novas tentativas (retomando do ponto em que parou)
+DOWNLOAD_PROGRESS_INTERVAL = 0.5  # segundos entre mensagens de progresso
+DOWNLOAD_PREFETCH_WORKERS = 4
+
+# Verificação de disponibilidade dos hosts (porta SSH/RDP)
+PROBE_TIMEOUT = 1.5  # segundos por tentativa de conexão
+PROBE_TTL = 60  # segundos em que um resultado é reaproveitado
+PROBE_CONCURRENCY = 32
+RDP_DEFAULT_PORT = 3389
+
+# Execução em lote
+BATCH_MAX_CONCURRENCY = 8  # hosts processados ao mesmo tempo
+BATCH_MAX_CONCURRENCY_LIMIT = 32
+BATCH_DEFAULT_TIMEOUT = 60  # segundos por host (conexão + execução)
+BATCH_CONNECT_TIMEOUT = 10  # segundos para estabelecer a conexão SSH
+BATCH_OUTPUT_LIMIT = 64 * 1024  # bytes de stdout/stderr mantidos por host
+BATCH_STATUS_LABELS = {
+    "pending": "Aguardando",
+    "running": "Executando",
+    "success": "Sucesso",
+    "failed": "Falhou",
+    "timeout": "Tempo esgotado",
+    "error": "Erro de conexão",
+    "cancelled": "Cancelado",
+}
+
+# Transferência de arquivos (SFTP)
+TRANSFER_CHUNK_SIZE = 32 * 1024  # maior bloco de dados aceito por servidores SFTP comuns
+TRANSFER_MAX_STREAMS = 4  # arquivos transferidos ao mesmo tempo
+TRANSFER_MAX_STREAMS_LIMIT = 16
+TRANSFER_RETRIES = 2  # novas tentativas após falha de rede (retomando do ponto em que parou)
+TRANSFER_TIMEOUT = 30  # segundos sem resposta do servidor antes de considerar a conexão perdida
+TRANSFER_VERIFY_TIMEOUT = 300  # segundos para calcular a soma SHA-256 no host remoto
+TRANSFER_PROGRESS_INTERVAL = 0.25  # segundos entre atualizações de progresso
+TRANSFER_PART_SUFFIX = ".part"
+TRANSFER_STATUS_LABELS = {
+    "pending": "Na fila",
+    "running": "Transferindo",
+    "verifying": "Conferindo",
+    "success": "Concluído",
+    "failed": "Soma divergente",
+    "error": "Erro",
+    "cancelled": "Cancelado",
+}
+
 class ConnectionType:
     SSH = "SSH"
     RDP = "RDP"
 
+class ClientDiscoveryCache:
+    """Caminhos dos clientes SSH/RDP instalados, resolvidos uma vez e persistidos em JSON
+
+    A validade é conferida por uma impressão digital barata: o valor do PATH e o mtime
+    das pastas do PATH e das pastas de instalação. Se algo mudou, a descoberta é refeita
+    em segundo plano; enquanto isso, consultas usam shutil.which (sem varrer o disco).
+    """
+    
+    def __init__(self, ssh_client: "SSHClient", cache_file: str = CLIENT_CACHE_FILE):
+        self.ssh_client = ssh_client
+        self.cache_file = cache_file
+        self.paths: Dict[str, Optional[str]] = {}
+        self.fingerprint: Dict = {}
+        self.lock = threading.Lock()
+        self.refreshing = False
+        self._load()
+        if not self.paths or self.fingerprint != self._current_fingerprint():
+            self.refresh_async()
+    
+    def _watched_dirs(self) -> List[str]:
+        dirs = [d for d in os.environ.get("PATH", "").split(os.pathsep) if d]
+        return dirs + [d for d in self.ssh_client.search_roots() if d]
+    
+    def _current_fingerprint(self) -> Dict:
+        mtimes = {}
+        for directory in self._watched_dirs():
+            try:
+                mtimes[directory] = os.stat(directory).st_mtime
+            except OSError:
+                mtimes[directory] = None
+        return {"system": platform.system(), "path": os.environ.get("PATH", ""), "mtimes": mtimes}
+    
+    def _load(self) -> None:
+        try:
+            if os.path.exists(self.cache_file):
+                with open(self.cache_file, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self.paths = data.get("paths", {})
+                self.fingerprint = data.get("fingerprint", {})
+        except Exception as e:
+            print(f"Erro ao carregar cache de clientes: {str(e)}")
+    
+    def _save(self) -> None:
+        try:
+            with self.lock:
+                data = {"paths": dict(self.paths), "fingerprint": self.fingerprint}
+            temp_file = f"{self.cache_file}.tmp"
+            with open(temp_file, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(temp_file, self.cache_file)
+        except Exception as e:
+            print(f"Erro ao salvar cache de clientes: {str(e)}")
+    
+    def refresh(self, client_name: Optional[str] = None) -> None:
+        """Refaz a descoberta de um cliente (ou de todos) e persiste o resultado"""
+        names = [client_name] if client_name else list(self.ssh_client.get_platform_clients())
+        found = {name: self.ssh_client.locate_client(name) for name in names}
+        fingerprint = self._current_fingerprint()
+        with self.lock:
+            if client_name is None:
+                self.paths = found
+            else:
+                self.paths.update(found)
+            self.fingerprint = fingerprint
+        self._save()
+    
+    def refresh_async(self) -> None:
+        with self.lock:
+            if self.refreshing:
+                return
+            self.refreshing = True
+        
+        def worker():
+            try:
+                self.refresh()
+            finally:
+                self.refreshing = False
+        
+        threading.Thread(target=worker, daemon=True).start()
+    
+    def get(self, client_name: str) -> Optional[str]:
+        """Caminho do cliente ou None; nunca varre o disco"""
+        with self.lock:
+            if client_name in self.paths:
+                return self.paths[client_name]
+        # Ainda não descoberto: consulta rápida no PATH, sem persistir
+        return self.ssh_client.locate_client(client_name, walk=False)
+
+class DownloadManager:
+    """Downloads de clientes com retomada, verificação SHA-256 e cache local
+
+    Os arquivos baixados ficam em cache_dir com um manifesto (url -> arquivo, sha256,
+    tamanho); reinstalar um cliente reutiliza o arquivo se o hash conferir. Downloads
+    interrompidos continuam de onde pararam com HTTP Range (arquivo .part).
+    """
+    
+    MANIFEST = "manifest.json"
+    
+    def __init__(self, cache_dir: str, session: Optional[requests.Session] = None):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self.session = session or requests.Session()
+        self.session.headers.setdefault("User-Agent", "ssh-manager-pro")
+        self.lock = threading.Lock()
+        self.manifest: Dict[str, Dict] = self._load_manifest()
+    
+    def _load_manifest(self) -> Dict[str, Dict]:
+        try:
+            with open(os.path.join(self.cache_dir, self.MANIFEST), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_manifest(self) -> None:
+        path = os.path.join(self.cache_dir, self.MANIFEST)
+        with self.lock:
+            with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+                json.dump(self.manifest, f, indent=2)
+            os.replace(f"{path}.tmp", path)
+    
+    @staticmethod
+    def file_sha256(path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    def cached_path(self, url: str, expected_sha256: Optional[str] = None) -> Optional[str]:
+        """Arquivo já baixado para a URL, se ainda íntegro"""
+        entry = self.manifest.get(url)
+        if not entry:
+            return None
+        path = os.path.join(self.cache_dir, entry["file"])
+        if not os.path.exists(path) or os.path.getsize(path) != entry["size"]:
+            return None
+        sha256 = self.file_sha256(path)
+        if sha256 != entry["sha256"] or (expected_sha256 and sha256 != expected_sha256.lower()):
+            return None
+        return path
+    
+    def fetch_sha256(self, sums_url: str, file_name: str) -> Optional[str]:
+        """Lê o hash de um arquivo em uma lista no formato do sha256sum"""
+        response = self.session.get(sums_url, timeout=DOWNLOAD_TIMEOUT)
+        response.raise_for_status()
+        for line in response.text.splitlines():
+            parts = line.split()
+            if len(parts) == 2 and parts[1].lstrip("*") == file_name:
+                return parts[0].lower()
+        return None
+    
+    @staticmethod
+    def _format_rate(rate: float) -> str:
+        for unit in ("B/s", "KB/s", "MB/s"):
+            if rate < 1024:
+                return f"{rate:.1f} {unit}"
+            rate /= 1024
+        return f"{rate:.1f} GB/s"
+    
+    def download(self, url: str, file_name: str, expected_sha256: Optional[str] = None,
+                 progress_callback: Optional[Callable[[str], None]] = None) -> str:
+        """Baixa a URL para o cache (ou reutiliza o arquivo em cache) e retorna o caminho"""
+        cached = self.cached_path(url, expected_sha256)
+        if cached:
+            if progress_callback:
+                progress_callback(f"{file_name} já baixado (cache local)")
+            return cached
+        
+        final_path = os.path.join(self.cache_dir, file_name)
+        part_path = f"{final_path}.part"
+        for attempt in range(DOWNLOAD_RETRIES + 1):
+            try:
+                self._download_part(url, file_name, part_path, progress_callback)
+                break
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+                if attempt == DOWNLOAD_RETRIES:
+                    raise Exception(f"Falha ao baixar {file_name} após {DOWNLOAD_RETRIES + 1} tentativas: {str(e)}")
+                if progress_callback:
+                    progress_callback(f"Conexão interrompida, retomando {file_name} ({attempt + 1}/{DOWNLOAD_RETRIES})...")
+                time.sleep(2 ** attempt)
+        
+        sha256 = self.file_sha256(part_path)
+        if expected_sha256 and sha256 != expected_sha256.lower():
+            os.remove(part_path)
+            raise Exception(f"Checksum SHA-256 de {file_name} não confere (esperado {expected_sha256}, obtido {sha256})")
+        os.replace(part_path, final_path)
+        with self.lock:
+            self.manifest[url] = {
+                "file": file_name,
+                "sha256": sha256,
+                "size": os.path.getsize(final_path),
+                "downloaded_at": time.time(),
+            }
+        self._save_manifest()
+        return final_path
+    
+    def _download_part(self, url: str, file_name: str, part_path: str,
+                       progress_callback: Optional[Callable[[str], None]]) -> None:
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        with self.session.get(url, stream=True, headers=headers, timeout=DOWNLOAD_TIMEOUT) as response:
+            if response.status_code == 416:
+                # O arquivo parcial já está completo
+                return
+            response.raise_for_status()
+            if offset and response.status_code != 206:
+                # Servidor ignorou o Range: recomeça do zero
+                offset = 0
+            total = response.headers.get("Content-Length")
+            total = int(total) + offset if total is not None else None
+            
+            received = offset
+            started = time.time()
+            last_report = 0.0
+            with open(part_path, "ab" if offset else "wb") as f:
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+                    received += len(chunk)
+                    now = time.time()
+                    if progress_callback and now - last_report >= DOWNLOAD_PROGRESS_INTERVAL:
+                        last_report = now
+                        rate = (received - offset) / max(now - started, 0.001)
+                        message = f"Baixando {file_name}: {received / (1024 * 1024):.1f} MB"
+                        if total:
+                            eta = (total - received) / rate if rate else 0
+                            message += f" de {total / (1024 * 1024):.1f} MB ({received * 100 // total}%) - ETA {eta:.0f}s"
+                        progress_callback(f"{message} - {self._format_rate(rate)}")
+            if total is not None and received < total:
+                raise requests.ConnectionError(f"Download incompleto ({received} de {total} bytes)")
+
 class SSHClient:
     def __init__(self):
         self.install_dir = os.path.join(str(Path.home()), "ssh_manager_clients")
         os.makedirs(self.install_dir, exist_ok=True)
+        self.downloads = DownloadManager(os.path.join(self.install_dir, "downloads"))
+        self.system = platform.system()
         
         # Cria diretório para ícones se não existir
         os.makedirs(ICON_PATH, exist_ok=True)
@@ -41,6 +347,9 @@ class SSHClient:
                 "PuTTY": {
                     "command": "putty",
                     "download_url": "https://the.earth.li/~sgtatham/putty/latest/w64/putty.exe",
+                    "download_file": "putty.exe",
+                    "sha256_url": "https://the.earth.li/~sgtatham/putty/latest/sha256sums",
+                    "sha256_name": "w64/putty.exe",
                     "install": self.install_putty,
                     "icon": "putty.png"
                 },
@@ -53,6 +362,7 @@ class SSHClient:
                 "MobaXterm": {
                     "command": "mobaxterm",
                     "download_url": "https://download.mobatek.net/2312022023112-38/MobaXterm_Portable_v23.1.zip",
+                    "download_file": "MobaXterm.zip",
                     "executable": "MobaXterm.exe",
                     "install": self.install_mobaxterm,
                     "icon": "mobaxterm.png"
@@ -88,10 +398,57 @@ class SSHClient:
                 }
             }
         }
+        
+        # Ícones resolvidos uma vez (consultados por card da grade de hosts)
+        self.icon_paths = {
+            name: os.path.join(ICON_PATH, client.get("icon", "terminal.png"))
+            for name, client in self.get_platform_clients().items()
+        }
+        self.discovery = ClientDiscoveryCache(self)
     
     def get_platform_clients(self) -> Dict:
-        system = platform.system()
-        return self.clients.get(system, {})
+        return self.clients.get(self.system, {})
+    
+    def search_roots(self) -> List[str]:
+        """Pastas onde clientes fora do PATH (MobaXterm) são procurados"""
+        if self.system != "Windows":
+            return []
+        return [
+            os.environ.get("ProgramFiles", ""),
+            os.environ.get("ProgramFiles(x86)", ""),
+            os.path.join(os.environ.get("LOCALAPPDATA", ""), "Programs") if os.environ.get("LOCALAPPDATA") else "",
+            self.install_dir
+        ]
+    
+    def locate_client(self, client_name: str, walk: bool = True) -> Optional[str]:
+        """Localiza o executável de um cliente; walk=False evita varrer as pastas de instalação"""
+        clients = self.get_platform_clients()
+        if client_name not in clients:
+            return None
+        
+        if self.system == "Windows":
+            # RDP sempre instalado no Windows
+            if client_name == "RDP":
+                return shutil.which("mstsc") or "mstsc"
+            if client_name == "MobaXterm":
+                found = shutil.which("MobaXterm") or shutil.which("mobaxterm")
+                if found or not walk:
+                    return found
+                for path in self.search_roots():
+                    if not path or not os.path.isdir(path):
+                        continue
+                    for root, dirs, files in os.walk(path):
+                        if "MobaXterm.exe" in files:
+                            return os.path.join(root, "MobaXterm.exe")
+                return None
+        elif client_name == "Microsoft Remote Desktop" and self.system == "Darwin":
+            for app in ("/Applications/Microsoft Remote Desktop.app",
+                        os.path.expanduser("~/Applications/Microsoft Remote Desktop.app")):
+                if os.path.exists(app):
+                    return app
+            return None
+        
+        return shutil.which(clients[client_name]["command"].split()[0])
     
     def get_clients_by_type(self, connection_type: str) -> Dict:
         """Retorna os clientes disponíveis para um tipo de conexão específico"""
@@ -110,69 +467,14 @@ class SSHClient:
         return all_clients
     
     def is_client_installed(self, client_name: str) -> bool:
-        """Verifica se o cliente já está instalado"""
-        clients = self.get_platform_clients()
-        if client_name not in clients:
-            return False
-        
-        # Verifica se o comando está disponível no PATH
-        try:
-            if platform.system() == "Windows":
-                # Verificação especial para MobaXterm
-                if client_name == "MobaXterm":
-                    # Verifica nos locais comuns de instalação
-                    common_paths = [
-                        os.path.join(os.environ.get("ProgramFiles", ""), ""),
-                        os.path.join(os.environ.get("ProgramFiles(x86)", ""), ""),
-                        os.path.join(os.environ.get("LOCALAPPDATA", ""), "Programs"),
-                        self.install_dir
-                    ]
-                    
-                    for path in common_paths:
-                        if not path:
-                            continue
-                        for root, dirs, files in os.walk(path):
-                            if "MobaXterm.exe" in files:
-                                return True
-                    return False
-                
-                # Verificação especial para RDP (sempre instalado no Windows)
-                if client_name == "RDP":
-                    return True
-                
-                result = subprocess.run(
-                    f"where {clients[client_name]['command']}", 
-                    shell=True, 
-                    stdout=subprocess.PIPE, 
-                    stderr=subprocess.PIPE
-                )
-                return result.returncode == 0
-            else:
-                # Verificação especial para Microsoft Remote Desktop no Mac
-                if client_name == "Microsoft Remote Desktop" and platform.system() == "Darwin":
-                    result = subprocess.run(
-                        "ls /Applications/Microsoft\\ Remote\\ Desktop.app 2>/dev/null || ls ~/Applications/Microsoft\\ Remote\\ Desktop.app 2>/dev/null",
-                        shell=True,
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.PIPE
-                    )
-                    return result.returncode == 0
-                
-                result = subprocess.run(
-                    f"which {clients[client_name]['command'].split()[0]}", 
-                    shell=True, 
-                    stdout=subprocess.PIPE, 
-                    stderr=subprocess.PIPE
-                )
-                return result.returncode == 0
-        except Exception:
+        """Verifica se o cliente já está instalado (consulta o cache de descoberta)"""
+        if client_name not in self.get_platform_clients():
             return False
+        return self.discovery.get(client_name) is not None
     
     def get_client_icon(self, client_name: str) -> str:
         """Retorna o caminho para o ícone do cliente"""
-        clients = self.get_platform_clients()
-        icon_name = clients.get(client_name, {}).get("icon", "terminal.png")
-        return os.path.join(ICON_PATH, icon_name)
+        return self.icon_paths.get(client_name) or os.path.join(ICON_PATH, "terminal.png")
     
     def install_client(self, client_name: str, progress_callback=None) -> bool:
         """Instala o cliente especificado"""
@@ -186,7 +488,10 @@ class SSHClient:
             return True
         
         if "install" in clients[client_name]:
-            return clients[client_name]["install"](progress_callback)
+            installed = clients[client_name]["install"](progress_callback)
+            # O PATH e as pastas de instalação mudaram: redescobre o cliente
+            self.discovery.refresh(client_name)
+            return installed
         else:
             raise Exception(f"Método de instalação não definido para {client_name}")
     
@@ -225,17 +530,14 @@ class SSHClient:
     def install_putty(self, progress_callback=None) -> bool:
         """Instala o PuTTY"""
         try:
-            url = self.clients["Windows"]["PuTTY"]["download_url"]
             exe_path = os.path.join(self.install_dir, "putty.exe")
             
             if progress_callback:
                 progress_callback("Baixando PuTTY...")
             
-            # Download do PuTTY
-            response = requests.get(url, stream=True)
-            with open(exe_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            # Download do PuTTY (cache local, retomada e verificação SHA-256)
+            downloaded = self.download_client("Windows", "PuTTY", progress_callback)
+            shutil.copy(downloaded, exe_path)
             
             # Adiciona ao PATH do usuário
             self._add_to_path(self.install_dir)
@@ -285,18 +587,13 @@ class SSHClient:
                         return True
             
             # Se não encontrou, procede com a instalação
-            url = self.clients["Windows"]["MobaXterm"]["download_url"]
-            zip_path = os.path.join(self.install_dir, "MobaXterm.zip")
             extract_dir = os.path.join(self.install_dir, "MobaXterm")
             
             if progress_callback:
                 progress_callback("Baixando MobaXterm...")
             
-            # Download do MobaXterm
-            response = requests.get(url, stream=True, verify=False)  # Desativa verificação SSL
-            with open(zip_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            # Download do MobaXterm (cache local, retomada e verificação do certificado TLS)
+            zip_path = self.download_client("Windows", "MobaXterm", progress_callback)
             
             if progress_callback:
                 progress_callback("Extraindo MobaXterm...")
@@ -322,6 +619,46 @@ class SSHClient:
         except Exception as e:
             raise Exception(f"Falha ao instalar MobaXterm: {str(e)}")
     
+    def download_client(self, system: str, client_name: str, progress_callback=None) -> str:
+        """Baixa o instalador de um cliente para o cache local e retorna o caminho"""
+        client = self.clients[system][client_name]
+        expected_sha256 = client.get("sha256")
+        if not expected_sha256 and client.get("sha256_url"):
+            try:
+                expected_sha256 = self.downloads.fetch_sha256(client["sha256_url"], client["sha256_name"])
+            except requests.RequestException as e:
+                print(f"Não foi possível obter o checksum de {client_name}: {str(e)}")
+        return self.downloads.download(
+            client["download_url"],
+            client["download_file"],
+            expected_sha256,
+            progress_callback
+        )
+    
+    def downloadable_clients(self) -> List[Tuple[str, str]]:
+        """(sistema, cliente) de todos os clientes com instalador baixável"""
+        return [
+            (system, name)
+            for system, clients in self.clients.items()
+            for name, client in clients.items()
+            if client.get("download_file")
+        ]
+    
+    def prefetch_clients(self, progress_callback=None) -> Dict[str, str]:
+        """Baixa em paralelo os instaladores de todos os clientes (kit para uso offline)"""
+        results: Dict[str, str] = {}
+        
+        def fetch(item: Tuple[str, str]) -> None:
+            system, name = item
+            try:
+                results[name] = self.download_client(system, name, progress_callback)
+            except Exception as e:
+                results[name] = f"Erro: {str(e)}"
+        
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_PREFETCH_WORKERS) as pool:
+            list(pool.map(fetch, self.downloadable_clients()))
+        return results
+    
     def install_rdp_windows(self, progress_callback=None) -> bool:
         """Verifica o RDP no Windows (já vem instalado por padrão)"""
         if progress_callback:
@@ -438,7 +775,8 @@ class SSHClient:
 
 class SSHSavedHost:
     def __init__(self, name: str, host: str, username: str, password: str, port: str, client: str, 
-                 group: str = DEFAULT_GROUP, connection_type: str = ConnectionType.SSH):
+                 group: str = DEFAULT_GROUP, connection_type: str = ConnectionType.SSH,
+                 tags: Optional[List[str]] = None):
         self.name = name
         self.host = host
         self.username = username
@@ -447,6 +785,252 @@ class SSHSavedHost:
         self.client = client
         self.group = group
         self.connection_type = connection_type
+        self.tags = tags or []
+
+class HostRepository:
+    """Hosts salvos indexados por nome, grupo, endereço e tag
+
+    A busca usa um índice de n-gramas (até SEARCH_NGRAM caracteres) mantido a cada
+    inclusão/remoção, então não percorre todos os hosts. As gravações são agrupadas:
+    cada alteração agenda um salvamento atômico (os.replace) após CONFIG_SAVE_DELAY.
+    """
+    
+    def __init__(self, config_file: str = CONFIG_FILE):
+        self.config_file = config_file
+        self.lock = threading.RLock()
+        self.by_name: Dict[str, SSHSavedHost] = {}
+        self.by_group: Dict[str, Dict[str, SSHSavedHost]] = {}
+        self.by_address: Dict[str, set] = {}
+        self.by_tag: Dict[str, set] = {}
+        self.ngrams: Dict[str, set] = {}
+        self.order: Dict[str, int] = {}
+        self.groups: List[str] = []  # mantida ordenada com bisect
+        self.sequence = 0
+        self.save_timer: Optional[threading.Timer] = None
+        self.batch_depth = 0
+        self.dirty = False
+    
+    def __len__(self) -> int:
+        return len(self.by_name)
+    
+    def __iter__(self):
+        with self.lock:
+            return iter(list(self.by_name.values()))
+    
+    @staticmethod
+    def _search_fields(host: SSHSavedHost) -> List[str]:
+        return [host.name, host.host, host.username, host.group] + list(host.tags)
+    
+    @staticmethod
+    def _grams(text: str) -> set:
+        text = text.lower()
+        grams = set()
+        for size in range(1, SEARCH_NGRAM + 1):
+            for index in range(len(text) - size + 1):
+                grams.add(text[index:index + size])
+        return grams
+    
+    def _index(self, host: SSHSavedHost) -> None:
+        self.by_name[host.name] = host
+        self.sequence += 1
+        self.order[host.name] = self.sequence
+        if host.group not in self.by_group:
+            self.by_group[host.group] = {}
+            bisect.insort(self.groups, host.group)
+        self.by_group[host.group][host.name] = host
+        self.by_address.setdefault(host.host.lower(), set()).add(host.name)
+        for tag in host.tags:
+            self.by_tag.setdefault(tag.lower(), set()).add(host.name)
+        for field in self._search_fields(host):
+            for gram in self._grams(field or ""):
+                self.ngrams.setdefault(gram, set()).add(host.name)
+    
+    def _unindex(self, host: SSHSavedHost) -> None:
+        self.by_name.pop(host.name, None)
+        self.order.pop(host.name, None)
+        members = self.by_group.get(host.group)
+        if members is not None:
+            members.pop(host.name, None)
+            if not members:
+                del self.by_group[host.group]
+                index = bisect.bisect_left(self.groups, host.group)
+                if index < len(self.groups) and self.groups[index] == host.group:
+                    del self.groups[index]
+        
+        def discard(index: Dict[str, set], key: str) -> None:
+            names = index.get(key)
+            if names is not None:
+                names.discard(host.name)
+                if not names:
+                    del index[key]
+        
+        discard(self.by_address, host.host.lower())
+        for tag in host.tags:
+            discard(self.by_tag, tag.lower())
+        for field in self._search_fields(host):
+            for gram in self._grams(field or ""):
+                discard(self.ngrams, gram)
+    
+    def _sorted(self, names) -> List[SSHSavedHost]:
+        return [self.by_name[name] for name in sorted(names, key=self.order.__getitem__)]
+    
+    def all(self) -> List[SSHSavedHost]:
+        with self.lock:
+            return list(self.by_name.values())
+    
+    def get(self, name: str) -> Optional[SSHSavedHost]:
+        return self.by_name.get(name)
+    
+    def put(self, host: SSHSavedHost) -> None:
+        """Inclui ou substitui (pelo nome) um host"""
+        with self.lock:
+            previous = self.by_name.get(host.name)
+            if previous is not None:
+                self._unindex(previous)
+            self._index(host)
+        self._changed()
+    
+    def remove(self, name: str) -> Optional[SSHSavedHost]:
+        with self.lock:
+            host = self.by_name.get(name)
+            if host is not None:
+                self._unindex(host)
+        if host is not None:
+            self._changed()
+        return host
+    
+    def update(self, saved_host: SSHSavedHost, **changes) -> None:
+        """Altera campos de um host já salvo, mantendo os índices consistentes"""
+        with self.lock:
+            self._unindex(saved_host)
+            for field, value in changes.items():
+                setattr(saved_host, field, value)
+            self._index(saved_host)
+        self._changed()
+    
+    def get_groups(self) -> List[str]:
+        with self.lock:
+            return list(self.groups) or [DEFAULT_GROUP]
+    
+    def by_group_name(self, group: str) -> List[SSHSavedHost]:
+        with self.lock:
+            return list(self.by_group.get(group, {}).values())
+    
+    def by_address_value(self, address: str) -> List[SSHSavedHost]:
+        with self.lock:
+            return self._sorted(self.by_address.get(address.lower(), ()))
+    
+    def by_tag_name(self, tag: str) -> List[SSHSavedHost]:
+        with self.lock:
+            return self._sorted(self.by_tag.get(tag.lower(), ()))
+    
+    def search(self, query: str) -> List[SSHSavedHost]:
+        """Hosts cujo nome, endereço, usuário, grupo ou tag contém a consulta"""
+        query = query.strip().lower()
+        if not query:
+            return self.all()
+        with self.lock:
+            if len(query) <= SEARCH_NGRAM:
+                return self._sorted(self.ngrams.get(query, ()))
+            grams = [query[i:i + SEARCH_NGRAM] for i in range(len(query) - SEARCH_NGRAM + 1)]
+            candidate_sets = sorted((self.ngrams.get(gram, set()) for gram in grams), key=len)
+            candidates = set(candidate_sets[0])
+            for names in candidate_sets[1:]:
+                candidates &= names
+                if not candidates:
+                    break
+            # Os n-gramas podem vir de campos diferentes: confirma a substring
+            matches = [
+                name for name in candidates
+                if any(query in (field or "").lower() for field in self._search_fields(self.by_name[name]))
+            ]
+            return self._sorted(matches)
+    
+    # Persistência
+    
+    def load(self) -> None:
+        if not os.path.exists(self.config_file):
+            return
+        with open(self.config_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        with self.lock:
+            for host in data.get("hosts", []):
+                self._index(SSHSavedHost(
+                    name=host["name"],
+                    host=host["host"],
+                    username=host["username"],
+                    password=host["password"],
+                    port=host["port"],
+                    client=host["client"],
+                    group=host.get("group", DEFAULT_GROUP),
+                    connection_type=host.get("connection_type", ConnectionType.SSH),
+                    tags=host.get("tags", [])
+                ))
+    
+    def _changed(self) -> None:
+        with self.lock:
+            self.dirty = True
+            if self.batch_depth:
+                return
+            if self.save_timer is not None:
+                self.save_timer.cancel()
+            # Timer não-daemon: o processo aguarda a última gravação antes de encerrar
+            self.save_timer = threading.Timer(CONFIG_SAVE_DELAY, self.flush)
+            self.save_timer.start()
+    
+    def batch(self):
+        """Agrupa várias alterações em uma única gravação: with repository.batch(): ..."""
+        repository = self
+        
+        class _Batch:
+            def __enter__(self):
+                with repository.lock:
+                    repository.batch_depth += 1
+                return repository
+            
+            def __exit__(self, *exc):
+                with repository.lock:
+                    repository.batch_depth -= 1
+                    pending = repository.batch_depth == 0 and repository.dirty
+                if pending:
+                    repository._changed()
+                return False
+        
+        return _Batch()
+    
+    def flush(self) -> None:
+        """Grava os hosts imediatamente (arquivo temporário + os.replace)"""
+        with self.lock:
+            if self.save_timer is not None:
+                self.save_timer.cancel()
+                self.save_timer = None
+            if not self.dirty:
+                return
+            data = {
+                "hosts": [
+                    {
+                        "name": host.name,
+                        "host": host.host,
+                        "username": host.username,
+                        "password": host.password,
+                        "port": host.port,
+                        "client": host.client,
+                        "group": host.group,
+                        "connection_type": host.connection_type,
+                        "tags": host.tags
+                    }
+                    for host in self.by_name.values()
+                ]
+            }
+            self.dirty = False
+        try:
+            temp_file = f"{self.config_file}.tmp"
+            with open(temp_file, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(temp_file, self.config_file)
+        except Exception as e:
+            self.dirty = True
+            print(f"Erro ao salvar configuração: {str(e)}")
 
 class Script:
     def __init__(self, name: str, content: str, description: str = "", platform: str = "all"):
@@ -458,56 +1042,28 @@ class Script:
 class SSHManager:
     def __init__(self):
         self.ssh_client = SSHClient()
-        self.saved_hosts: List[SSHSavedHost] = []
+        self.connection_pool = SSHConnectionPool()
+        self.prober = ReachabilityProber()
+        self.transfers = TransferManager(pool=self.connection_pool)
+        self.hosts = HostRepository()
         self.scripts: List[Script] = []
         self.load_config()
         self.load_scripts()
     
+    @property
+    def saved_hosts(self) -> List[SSHSavedHost]:
+        return self.hosts.all()
+    
     def load_config(self) -> None:
         """Carrega a configuração salva do arquivo JSON"""
         try:
-            if os.path.exists(CONFIG_FILE):
-                with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    self.saved_hosts = [
-                        SSHSavedHost(
-                            name=host["name"],
-                            host=host["host"],
-                            username=host["username"],
-                            password=host["password"],
-                            port=host["port"],
-                            client=host["client"],
-                            group=host.get("group", DEFAULT_GROUP),
-                            connection_type=host.get("connection_type", ConnectionType.SSH)
-                        )
-                        for host in data.get("hosts", [])
-                    ]
+            self.hosts.load()
         except Exception as e:
             print(f"Erro ao carregar configuração: {str(e)}")
     
     def save_config(self) -> None:
         """Salva a configuração atual no arquivo JSON"""
-        try:
-            data = {
-                "hosts": [
-                    {
-                        "name": host.name,
-                        "host": host.host,
-                        "username": host.username,
-                        "password": host.password,
-                        "port": host.port,
-                        "client": host.client,
-                        "group": host.group,
-                        "connection_type": host.connection_type
-                    }
-                    for host in self.saved_hosts
-                ]
-            }
-            
-            with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            print(f"Erro ao salvar configuração: {str(e)}")
+        self.hosts.flush()
     
     def load_scripts(self) -> None:
         """Carrega os scripts salvos do arquivo JSON"""
@@ -602,63 +1158,1108 @@ class SSHManager:
         return [s for s in self.scripts if s.platform == "all" or s.platform.lower() == platform_name.lower()]
     
     def add_host(self, host: SSHSavedHost) -> None:
-        """Adiciona um novo host à lista"""
-        self.saved_hosts.append(host)
-        self.save_config()
+        """Adiciona um novo host (ou substitui o host com o mesmo nome)"""
+        self.hosts.put(host)
     
     def remove_host(self, host_name: str) -> None:
         """Remove um host da lista"""
-        self.saved_hosts = [h for h in self.saved_hosts if h.name != host_name]
-        self.save_config()
+        self.hosts.remove(host_name)
     
     def get_groups(self) -> List[str]:
         """Retorna a lista de grupos únicos"""
-        groups = {host.group for host in self.saved_hosts}
-        if not groups:
-            groups = {DEFAULT_GROUP}
-        return sorted(groups)
+        return self.hosts.get_groups()
     
     def get_hosts_by_group(self, group: str) -> List[SSHSavedHost]:
         """Retorna os hosts de um grupo específico"""
-        return [host for host in self.saved_hosts if host.group == group]
+        return self.hosts.by_group_name(group)
+    
+    def get_hosts_by_tag(self, tag: str) -> List[SSHSavedHost]:
+        """Retorna os hosts marcados com uma tag"""
+        return self.hosts.by_tag_name(tag)
     
     def search_hosts(self, query: str) -> List[SSHSavedHost]:
-        """Pesquisa hosts pelo nome, endereço ou usuário"""
-        query = query.lower()
-        return [
-            host for host in self.saved_hosts 
-            if query in host.name.lower() or 
-               query in host.host.lower() or 
-               query in host.username.lower() or
-               query in host.group.lower()
-        ]
+        """Pesquisa hosts pelo nome, endereço, usuário, grupo ou tag"""
+        return self.hosts.search(query)
     
     def get_host(self, host_name: str) -> Optional[SSHSavedHost]:
         """Retorna um host específico pelo nome"""
-        for host in self.saved_hosts:
-            if host.name == host_name:
-                return host
-        return None
+        return self.hosts.get(host_name)
     
     def add_group(self, group_name: str) -> None:
         """Adiciona um novo grupo"""
         # Grupos são criados implicitamente ao adicionar hosts
         # Esta função é mantida para compatibilidade
-        self.save_config()
+        pass
     
     def rename_group(self, old_name: str, new_name: str) -> None:
         """Renomeia um grupo"""
-        for host in self.saved_hosts:
-            if host.group == old_name:
-                host.group = new_name
-        self.save_config()
+        with self.hosts.batch():
+            for host in self.hosts.by_group_name(old_name):
+                self.hosts.update(host, group=new_name)
     
     def remove_group(self, group_name: str) -> None:
         """Remove um grupo (move hosts para o grupo padrão)"""
-        for host in self.saved_hosts:
-            if host.group == group_name:
-                host.group = DEFAULT_GROUP
-        self.save_config()
+        with self.hosts.batch():
+            for host in self.hosts.by_group_name(group_name):
+                self.hosts.update(host, group=DEFAULT_GROUP)
+    
+    def import_hosts(self, entries: List[Dict], username: str = "", port: str = "22",
+                     client: str = "OpenSSH", connection_type: str = ConnectionType.SSH) -> Tuple[int, int]:
+        """Importa vários servidores ({"nome", "ip", "tags"}) em uma única gravação
+
+        Hosts já cadastrados (mesmo nome) têm endereço e tags atualizados, preservando
+        usuário, senha e cliente. Retorna (novos, atualizados).
+        """
+        added = updated = 0
+        imported: Dict[str, str] = {}
+        with self.hosts.batch():
+            for entry in entries:
+                name = entry.get("nome") or entry.get("name")
+                address = entry.get("ip") or entry.get("host")
+                if not name or not address:
+                    continue
+                # Mesmo nome com outro IP na própria lista: mantém os dois servidores
+                if imported.get(name, address) != address:
+                    name = f"{name} ({address})"
+                imported[name] = address
+                tags = [tag.strip() for tag in str(entry.get("tags") or "").split(",") if tag.strip()]
+                level = re.search(r"PACS_(N\d)", name)
+                if level and level.group(1) not in tags:
+                    tags.append(level.group(1))
+                existing = self.hosts.get(name)
+                if existing is not None:
+                    self.hosts.update(existing, host=address, tags=sorted(set(existing.tags) | set(tags)))
+                    updated += 1
+                    continue
+                self.hosts.put(SSHSavedHost(
+                    name=name,
+                    host=address,
+                    username=username,
+                    password="",
+                    port=port,
+                    client=client,
+                    group=server_group(name),
+                    connection_type=connection_type,
+                    tags=tags
+                ))
+                added += 1
+        return added, updated
+
+class AcceptNewHostKeyPolicy:
+    """Política do paramiko equivalente a StrictHostKeyChecking=accept-new do OpenSSH
+
+    Só é chamada para hosts ausentes do known_hosts: a chave é aceita e gravada no
+    arquivo. Uma chave diferente da conhecida é recusada pelo próprio paramiko
+    (BadHostKeyException) antes de a senha ser enviada.
+    """
+    
+    lock = threading.Lock()  # clientes de várias threads podem gravar ao mesmo tempo
+    
+    def missing_host_key(self, client, hostname, key):
+        client.get_host_keys().add(hostname, key.get_name(), key)
+        line = f"{hostname} {key.get_name()} {key.get_base64()}\n"
+        with self.lock:
+            try:
+                os.makedirs(os.path.dirname(KNOWN_HOSTS_FILE), mode=0o700, exist_ok=True)
+                with open(KNOWN_HOSTS_FILE, "a", encoding="utf-8") as f:
+                    f.write(line)
+            except OSError as e:
+                print(f"Erro ao gravar {KNOWN_HOSTS_FILE}: {e}")
+
+
+def new_paramiko_client() -> "paramiko.SSHClient":
+    """Cliente paramiko que confere e atualiza o ~/.ssh/known_hosts usado pelo OpenSSH"""
+    client = paramiko.SSHClient()
+    if os.path.exists(KNOWN_HOSTS_FILE):
+        client.load_system_host_keys(KNOWN_HOSTS_FILE)
+    client.set_missing_host_key_policy(AcceptNewHostKeyPolicy())
+    return client
+
+
+class SSHConnectionPool:
+    """Conexões SSH mestre reutilizáveis por host salvo
+
+    Com o OpenSSH (POSIX), cada host ganha um socket ControlMaster com ControlPersist:
+    a primeira conexão faz o handshake e as seguintes (terminal, scripts, lote) reutilizam
+    o canal já autenticado. Para hosts com senha, mantém sessões paramiko abertas.
+    Conexões sem uso por SSH_POOL_IDLE_SECONDS são encerradas.
+    """
+    
+    def __init__(self, idle_seconds: int = SSH_POOL_IDLE_SECONDS, max_masters: int = SSH_POOL_MAX_MASTERS):
+        self.idle_seconds = idle_seconds
+        self.max_masters = max_masters
+        self.enabled = platform.system() != "Windows"  # OpenSSH do Windows não suporta ControlMaster
+        self.last_used: Dict[str, float] = {}
+        self.sessions: Dict[str, Tuple["paramiko.SSHClient", float]] = {}
+        self.lock = threading.Lock()
+        if self.enabled:
+            try:
+                os.makedirs(SSH_POOL_DIR, mode=0o700, exist_ok=True)
+            except OSError as e:
+                print(f"Erro ao criar diretório de conexões SSH: {str(e)}")
+                self.enabled = False
+    
+    @staticmethod
+    def host_key(host: SSHSavedHost) -> str:
+        return f"{host.username}@{host.host}:{host.port or 22}"
+    
+    def control_path(self, host: SSHSavedHost) -> str:
+        digest = hashlib.sha1(self.host_key(host).encode("utf-8")).hexdigest()[:16]
+        return os.path.join(SSH_POOL_DIR, digest)
+    
+    def options(self, host: SSHSavedHost) -> List[str]:
+        """Opções do ssh para criar ou reutilizar a conexão mestre do host"""
+        if not self.enabled:
+            return []
+        with self.lock:
+            self.last_used[self.host_key(host)] = time.time()
+        self.evict_idle()
+        return [
+            "-o", "ControlMaster=auto",
+            "-o", f"ControlPath={self.control_path(host)}",
+            "-o", f"ControlPersist={self.idle_seconds}",
+        ]
+    
+    def _control(self, host_key: str, operation: str) -> bool:
+        """Executa ssh -O <operation> no socket mestre de um host"""
+        user_host, _, port = host_key.rpartition(":")
+        path = os.path.join(SSH_POOL_DIR, hashlib.sha1(host_key.encode("utf-8")).hexdigest()[:16])
+        if not os.path.exists(path):
+            return False
+        try:
+            completed = subprocess.run(
+                ["ssh", "-o", f"ControlPath={path}", "-p", port, "-O", operation, user_host],
+                capture_output=True,
+                timeout=5
+            )
+            return completed.returncode == 0
+        except (OSError, subprocess.TimeoutExpired):
+            return False
+    
+    def is_alive(self, host: SSHSavedHost) -> bool:
+        return self.enabled and self._control(self.host_key(host), "check")
+    
+    def close(self, host: SSHSavedHost) -> None:
+        """Encerra a conexão mestre e a sessão paramiko de um host"""
+        key = self.host_key(host)
+        with self.lock:
+            self.last_used.pop(key, None)
+            session = self.sessions.pop(key, None)
+        if session is not None:
+            session[0].close()
+        if self.enabled:
+            self._control(key, "exit")
+    
+    def close_all(self) -> None:
+        with self.lock:
+            keys = set(self.last_used) | set(self.sessions)
+            sessions = [client for client, _ in self.sessions.values()]
+            self.last_used.clear()
+            self.sessions.clear()
+        for client in sessions:
+            client.close()
+        if self.enabled:
+            for key in keys:
+                self._control(key, "exit")
+    
+    def evict_idle(self) -> None:
+        """Encerra conexões ociosas e as menos usadas acima do limite"""
+        now = time.time()
+        with self.lock:
+            ordered = sorted(self.last_used.items(), key=lambda item: item[1], reverse=True)
+            expired = [key for index, (key, used) in enumerate(ordered)
+                       if now - used > self.idle_seconds or index >= self.max_masters]
+            for key in expired:
+                del self.last_used[key]
+            stale_sessions = [key for key, (_, used) in self.sessions.items() if now - used > self.idle_seconds]
+            closing = [self.sessions.pop(key)[0] for key in stale_sessions]
+        for client in closing:
+            client.close()
+        if self.enabled and expired:
+            # ssh -O exit pode levar alguns milissegundos por host; não bloqueia quem pediu as opções
+            threading.Thread(target=lambda: [self._control(key, "exit") for key in expired], daemon=True).start()
+    
+    def paramiko_session(self, host: SSHSavedHost, timeout: float = BATCH_CONNECT_TIMEOUT) -> "paramiko.SSHClient":
+        """Sessão paramiko autenticada do host, reaproveitada enquanto estiver ativa"""
+        key = self.host_key(host)
+        with self.lock:
+            cached = self.sessions.get(key)
+        if cached is not None:
+            client = cached[0]
+            transport = client.get_transport()
+            if transport is not None and transport.is_active():
+                with self.lock:
+                    self.sessions[key] = (client, time.time())
+                return client
+            client.close()
+        
+        client = new_paramiko_client()
+        client.connect(
+            host.host,
+            port=int(host.port or 22),
+            username=host.username,
+            password=host.password,
+            timeout=timeout,
+            banner_timeout=timeout,
+            auth_timeout=timeout,
+        )
+        with self.lock:
+            previous = self.sessions.get(key)
+            if previous is not None and previous[0] is not client:
+                # Outra thread conectou ao mesmo host ao mesmo tempo: mantém a primeira
+                client.close()
+                self.sessions[key] = (previous[0], time.time())
+                return previous[0]
+            self.sessions[key] = (client, time.time())
+        return client
+    
+    def discard_session(self, host: SSHSavedHost) -> None:
+        with self.lock:
+            session = self.sessions.pop(self.host_key(host), None)
+        if session is not None:
+            session[0].close()
+    
+    def active_count(self) -> int:
+        with self.lock:
+            return len(self.last_used) + len(self.sessions)
+
+class ReachabilityProber:
+    """Testa em paralelo se a porta SSH/RDP dos hosts aceita conexões
+
+    Os resultados ficam em cache por PROBE_TTL; hosts já em verificação não são
+    testados de novo. on_result(host, status) é chamado da thread de verificação,
+    ou imediatamente quando o cache ainda é válido.
+    """
+    
+    def __init__(self, timeout: float = PROBE_TIMEOUT, ttl: float = PROBE_TTL,
+                 max_workers: int = PROBE_CONCURRENCY):
+        self.timeout = timeout
+        self.ttl = ttl
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="probe")
+        self.cache: Dict[Tuple[str, int], Dict] = {}
+        self.pending: Dict[Tuple[str, int], List[Tuple[SSHSavedHost, Callable]]] = {}
+        self.lock = threading.Lock()
+    
+    @staticmethod
+    def target(host: SSHSavedHost) -> Tuple[str, int]:
+        try:
+            port = int(host.port)
+        except (TypeError, ValueError):
+            port = 22
+        if host.connection_type == ConnectionType.RDP and port == 22:
+            # O formulário sugere 22 por padrão; para RDP o serviço está na 3389
+            port = RDP_DEFAULT_PORT
+        return host.host.strip(), port
+    
+    def cached(self, host: SSHSavedHost) -> Optional[Dict]:
+        with self.lock:
+            status = self.cache.get(self.target(host))
+        if status is not None and time.time() - status["checked_at"] < self.ttl:
+            return status
+        return None
+    
+    def probe(self, hosts: List[SSHSavedHost], on_result: Callable[[SSHSavedHost, Dict], None]) -> None:
+        """Agenda a verificação dos hosts sem bloquear quem chamou"""
+        for host in hosts:
+            status = self.cached(host)
+            if status is not None:
+                on_result(host, status)
+                continue
+            key = self.target(host)
+            with self.lock:
+                waiting = self.pending.get(key)
+                if waiting is not None:
+                    waiting.append((host, on_result))
+                    continue
+                self.pending[key] = [(host, on_result)]
+            self.pool.submit(self._check, key)
+    
+    def invalidate(self, host: Optional[SSHSavedHost] = None) -> None:
+        with self.lock:
+            if host is None:
+                self.cache.clear()
+            else:
+                self.cache.pop(self.target(host), None)
+    
+    def _check(self, key: Tuple[str, int]) -> None:
+        address, port = key
+        started = time.perf_counter()
+        status = {"reachable": False, "latency_ms": None, "error": None, "checked_at": 0.0}
+        try:
+            with socket.create_connection((address, port), timeout=self.timeout):
+                status["reachable"] = True
+                status["latency_ms"] = (time.perf_counter() - started) * 1000
+        except socket.timeout:
+            status["error"] = "Tempo esgotado"
+        except OSError as e:
+            status["error"] = e.strerror or str(e)
+        status["checked_at"] = time.time()
+        
+        with self.lock:
+            self.cache[key] = status
+            waiting = self.pending.pop(key, [])
+        for host, on_result in waiting:
+            try:
+                on_result(host, status)
+            except Exception as e:
+                print(f"Erro ao exibir disponibilidade de {host.name}: {str(e)}")
+    
+    def shutdown(self) -> None:
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+class BatchResult:
+    """Resultado da execução de um script em um host"""
+    
+    def __init__(self, host: SSHSavedHost):
+        self.host = host
+        self.status = "pending"
+        self.exit_code: Optional[int] = None
+        self.stdout = ""
+        self.stderr = ""
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+    
+    @property
+    def duration(self) -> float:
+        if not self.started_at:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+    
+    @property
+    def is_done(self) -> bool:
+        return self.status not in ("pending", "running")
+
+class BatchExecutor:
+    """Executa um script em vários hosts SSH em paralelo, sem interface interativa
+
+    Usa o cliente OpenSSH em BatchMode (autenticação por chave/agente). Hosts com senha
+    salva usam paramiko quando ele está instalado. on_progress(result) é chamado a cada
+    mudança de estado de um host, a partir das threads de execução.
+    """
+    
+    def __init__(self, max_concurrency: int = BATCH_MAX_CONCURRENCY, timeout: float = BATCH_DEFAULT_TIMEOUT,
+                 on_progress: Optional[Callable[[BatchResult], None]] = None,
+                 pool: Optional[SSHConnectionPool] = None):
+        self.pool = pool
+        self.max_concurrency = max(1, min(int(max_concurrency), BATCH_MAX_CONCURRENCY_LIMIT))
+        self.timeout = timeout
+        self.on_progress = on_progress
+        self.results: List[BatchResult] = []
+        self.cancelled = False
+        self.lock = threading.Lock()
+        self.processes: Dict[int, subprocess.Popen] = {}
+    
+    def run(self, hosts: List[SSHSavedHost], script: Script, on_complete: Optional[Callable[[], None]] = None) -> List[BatchResult]:
+        """Inicia a execução em segundo plano e retorna a lista de resultados (atualizada em tempo real)"""
+        self.results = [BatchResult(host) for host in hosts]
+        self.cancelled = False
+        
+        def worker():
+            with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+                for result in self.results:
+                    pool.submit(self._run_host, result, script)
+            if on_complete:
+                on_complete()
+        
+        threading.Thread(target=worker, daemon=True).start()
+        return self.results
+    
+    def cancel(self) -> None:
+        """Cancela os hosts pendentes e encerra os comandos em andamento"""
+        self.cancelled = True
+        with self.lock:
+            processes = list(self.processes.values())
+        for process in processes:
+            try:
+                process.kill()
+            except OSError:
+                pass
+    
+    def counts(self) -> Dict[str, int]:
+        counts = {status: 0 for status in BATCH_STATUS_LABELS}
+        for result in self.results:
+            counts[result.status] += 1
+        return counts
+    
+    def _notify(self, result: BatchResult) -> None:
+        if self.on_progress:
+            try:
+                self.on_progress(result)
+            except Exception as e:
+                print(f"Erro ao atualizar progresso do lote: {str(e)}")
+    
+    def _run_host(self, result: BatchResult, script: Script) -> None:
+        if self.cancelled:
+            result.status = "cancelled"
+            self._notify(result)
+            return
+        result.status = "running"
+        result.started_at = time.time()
+        self._notify(result)
+        try:
+            if result.host.password and paramiko is not None:
+                self._run_paramiko(result, script)
+            else:
+                self._run_openssh(result, script)
+        except Exception as e:
+            result.status = "error"
+            result.stderr = str(e)
+        result.finished_at = time.time()
+        if self.cancelled and result.status in ("failed", "error", "timeout"):
+            result.status = "cancelled"
+        self._notify(result)
+    
+    def build_ssh_command(self, host: SSHSavedHost) -> List[str]:
+        """Comando OpenSSH não interativo para o host"""
+        return [
+            "ssh",
+            "-o", "BatchMode=yes",
+            "-o", f"ConnectTimeout={BATCH_CONNECT_TIMEOUT}",
+            "-o", "StrictHostKeyChecking=accept-new",
+            "-p", str(host.port or 22),
+        ] + (self.pool.options(host) if self.pool else []) + [
+            f"{host.username}@{host.host}" if host.username else host.host,
+        ]
+    
+    def _run_openssh(self, result: BatchResult, script: Script) -> None:
+        # O conteúdo vai pela entrada padrão para o shell remoto, sem problemas de aspas
+        command = self.build_ssh_command(result.host) + ["sh", "-s"]
+        if script.platform == "windows":
+            command = self.build_ssh_command(result.host) + [script.content]
+        process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+        )
+        with self.lock:
+            self.processes[id(result)] = process
+        try:
+            stdout, stderr = process.communicate(
+                input=None if script.platform == "windows" else script.content,
+                timeout=self.timeout,
+            )
+        except subprocess.TimeoutExpired:
+            process.kill()
+            try:
+                stdout, stderr = process.communicate(timeout=BATCH_CONNECT_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                stdout, stderr = "", ""
+            result.status = "timeout"
+        finally:
+            with self.lock:
+                self.processes.pop(id(result), None)
+        
+        result.stdout = stdout[-BATCH_OUTPUT_LIMIT:]
+        result.stderr = stderr[-BATCH_OUTPUT_LIMIT:]
+        result.exit_code = process.returncode
+        if result.status == "timeout":
+            return
+        # O OpenSSH retorna 255 quando a conexão ou a autenticação falham
+        if process.returncode == 255:
+            result.status = "error"
+            if result.host.password and paramiko is None:
+                result.stderr += "\nHost com senha: instale o paramiko ou configure uma chave SSH."
+        else:
+            result.status = "success" if process.returncode == 0 else "failed"
+    
+    def _run_paramiko(self, result: BatchResult, script: Script) -> None:
+        host = result.host
+        try:
+            if self.pool is not None:
+                client = self.pool.paramiko_session(host)
+            else:
+                client = new_paramiko_client()
+                client.connect(
+                    host.host,
+                    port=int(host.port or 22),
+                    username=host.username,
+                    password=host.password,
+                    timeout=BATCH_CONNECT_TIMEOUT,
+                    banner_timeout=BATCH_CONNECT_TIMEOUT,
+                    auth_timeout=BATCH_CONNECT_TIMEOUT,
+                )
+        except (paramiko.SSHException, OSError) as e:
+            result.status = "error"
+            result.stderr = str(e)
+            if self.pool is not None:
+                self.pool.discard_session(host)
+            return
+        
+        try:
+            command = script.content if script.platform == "windows" else "sh -s"
+            stdin, stdout, stderr = client.exec_command(command, timeout=self.timeout)
+            if script.platform != "windows":
+                stdin.write(script.content)
+                stdin.channel.shutdown_write()
+            channel = stdout.channel
+            deadline = time.time() + self.timeout
+            out_chunks, err_chunks = [], []
+            while True:
+                if channel.recv_ready():
+                    out_chunks.append(channel.recv(32768))
+                elif channel.recv_stderr_ready():
+                    err_chunks.append(channel.recv_stderr(32768))
+                elif channel.exit_status_ready():
+                    break
+                elif self.cancelled or time.time() > deadline:
+                    result.status = "cancelled" if self.cancelled else "timeout"
+                    break
+                else:
+                    time.sleep(0.05)
+            # Lê o que sobrou após o término do comando
+            while channel.recv_ready():
+                out_chunks.append(channel.recv(32768))
+            while channel.recv_stderr_ready():
+                err_chunks.append(channel.recv_stderr(32768))
+            result.stdout = b"".join(out_chunks).decode("utf-8", "replace")[-BATCH_OUTPUT_LIMIT:]
+            result.stderr = b"".join(err_chunks).decode("utf-8", "replace")[-BATCH_OUTPUT_LIMIT:]
+            if result.status == "running":
+                result.exit_code = channel.recv_exit_status()
+                result.status = "success" if result.exit_code == 0 else "failed"
+            else:
+                channel.close()
+        except (paramiko.SSHException, OSError) as e:
+            result.status = "error"
+            result.stderr = str(e)
+            if self.pool is not None:
+                self.pool.discard_session(host)
+        finally:
+            if self.pool is None:
+                client.close()
+
+class TokenBucket:
+    """Limite de banda compartilhado entre transferências (bytes por segundo; 0 = sem limite)
+
+    Cada bloco consome fichas; quando o saldo fica negativo, a thread espera o tempo
+    necessário para repô-lo. Várias transferências simultâneas dividem a mesma taxa.
+    """
+    
+    def __init__(self, rate: float = 0):
+        self.rate = max(0.0, float(rate))
+        self.tokens = 0.0
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def set_rate(self, rate: float) -> None:
+        with self.lock:
+            self.rate = max(0.0, float(rate))
+            self.tokens = 0.0
+            self.updated = time.monotonic()
+    
+    def consume(self, amount: int, cancelled: Callable[[], bool] = lambda: False) -> None:
+        with self.lock:
+            if self.rate <= 0:
+                return
+            now = time.monotonic()
+            # Rajada máxima de um segundo de banda após um período ocioso
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= amount
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        deadline = time.monotonic() + wait
+        while not cancelled():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(remaining, 0.2))
+
+class TransferTask:
+    """Envio ou download de um arquivo para um host"""
+    
+    def __init__(self, host: SSHSavedHost, direction: str, local_path: str, remote_path: str):
+        self.host = host
+        self.direction = direction  # "upload" ou "download"
+        self.local_path = local_path
+        self.remote_path = remote_path
+        self.status = "pending"
+        self.size = 0
+        self.transferred = 0
+        self.resumed_from = 0
+        self.sha256: Optional[str] = None
+        self.verified = False  # True quando a soma SHA-256 remota conferiu
+        self.error = ""
+        self.attempts = 0
+        self.cancel_requested = False
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.last_notify = 0.0
+    
+    @property
+    def duration(self) -> float:
+        if not self.started_at:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+    
+    @property
+    def rate(self) -> float:
+        """Bytes por segundo transferidos nesta execução (sem contar o trecho retomado)"""
+        duration = self.duration
+        return (self.transferred - self.resumed_from) / duration if duration > 0 else 0.0
+    
+    @property
+    def progress(self) -> float:
+        if self.size <= 0:
+            return 1.0 if self.status == "success" else 0.0
+        return min(1.0, self.transferred / self.size)
+    
+    @property
+    def is_done(self) -> bool:
+        return self.status not in ("pending", "running", "verifying")
+
+class TransferManager:
+    """Fila de envios e downloads SFTP para hosts salvos
+
+    Cada arquivo é gravado primeiro com o sufixo TRANSFER_PART_SUFFIX e só é renomeado
+    após a conferência do tamanho e da soma SHA-256 (sha256sum no host remoto); uma
+    transferência interrompida é retomada do ponto em que parou na próxima tentativa.
+    Com paramiko, usa o canal SFTP da sessão reutilizável do host, com escrita em
+    pipeline e leitura antecipada, e o limite de banda é um TokenBucket compartilhado.
+    Sem paramiko, usa o cliente sftp do OpenSSH em modo batch (put/reput, get/reget) sobre
+    a conexão mestre do host; nesse caso o limite é dividido entre os fluxos simultâneos.
+    on_progress(task) é chamado a partir das threads de transferência.
+    """
+    
+    def __init__(self, max_streams: int = TRANSFER_MAX_STREAMS, bandwidth_limit: float = 0,
+                 on_progress: Optional[Callable[[TransferTask], None]] = None,
+                 pool: Optional[SSHConnectionPool] = None):
+        self.pool = pool
+        self.on_progress = on_progress
+        self.max_streams = max(1, min(int(max_streams), TRANSFER_MAX_STREAMS_LIMIT))
+        self.executor = ThreadPoolExecutor(max_workers=self.max_streams, thread_name_prefix="sftp")
+        self.bucket = TokenBucket(bandwidth_limit)
+        self.tasks: List[TransferTask] = []
+        self.lock = threading.Lock()
+        self.processes: Dict[int, subprocess.Popen] = {}
+    
+    def set_max_streams(self, max_streams: int) -> None:
+        """Altera o número de transferências simultâneas (vale para os próximos arquivos da fila)"""
+        max_streams = max(1, min(int(max_streams), TRANSFER_MAX_STREAMS_LIMIT))
+        if max_streams == self.max_streams:
+            return
+        previous = self.executor
+        self.max_streams = max_streams
+        self.executor = ThreadPoolExecutor(max_workers=max_streams, thread_name_prefix="sftp")
+        previous.shutdown(wait=False)
+    
+    def set_bandwidth_limit(self, bytes_per_second: float) -> None:
+        self.bucket.set_rate(bytes_per_second)
+    
+    @staticmethod
+    def remote_target(remote_path: str, file_name: str) -> str:
+        """Caminho remoto final; um caminho terminado em / recebe o nome do arquivo local"""
+        return remote_path + file_name if remote_path.endswith("/") else remote_path
+    
+    def upload(self, hosts: List[SSHSavedHost], local_path: str, remote_path: str) -> List[TransferTask]:
+        """Envia o mesmo arquivo para vários hosts (um item da fila por host)"""
+        target = self.remote_target(remote_path, os.path.basename(local_path))
+        return self._enqueue([TransferTask(host, "upload", local_path, target) for host in hosts])
+    
+    def download(self, hosts: List[SSHSavedHost], remote_path: str, local_dir: str) -> List[TransferTask]:
+        """Baixa o mesmo arquivo de vários hosts; com mais de um host, cada um ganha sua subpasta"""
+        file_name = remote_path.replace("\\", "/").rstrip("/").rsplit("/", 1)[-1]
+        tasks = []
+        for host in hosts:
+            folder = os.path.join(local_dir, host.name) if len(hosts) > 1 else local_dir
+            tasks.append(TransferTask(host, "download", os.path.join(folder, file_name), remote_path))
+        return self._enqueue(tasks)
+    
+    def _enqueue(self, tasks: List[TransferTask]) -> List[TransferTask]:
+        with self.lock:
+            self.tasks.extend(tasks)
+        for task in tasks:
+            self.executor.submit(self._run_task, task)
+        return tasks
+    
+    def cancel(self, task: Optional[TransferTask] = None) -> None:
+        """Cancela uma transferência (ou todas as não concluídas)"""
+        with self.lock:
+            targets = [task] if task is not None else [t for t in self.tasks if not t.is_done]
+            processes = [self.processes[id(t)] for t in targets if id(t) in self.processes]
+        for target in targets:
+            target.cancel_requested = True
+        for process in processes:
+            try:
+                process.kill()
+            except OSError:
+                pass
+    
+    def clear_finished(self) -> None:
+        with self.lock:
+            self.tasks = [task for task in self.tasks if not task.is_done]
+    
+    def counts(self) -> Dict[str, int]:
+        counts = {status: 0 for status in TRANSFER_STATUS_LABELS}
+        with self.lock:
+            for task in self.tasks:
+                counts[task.status] += 1
+        return counts
+    
+    def shutdown(self) -> None:
+        self.cancel()
+        self.executor.shutdown(wait=False)
+    
+    def _notify(self, task: TransferTask, force: bool = True) -> None:
+        now = time.time()
+        if not force and now - task.last_notify < TRANSFER_PROGRESS_INTERVAL:
+            return
+        task.last_notify = now
+        if self.on_progress:
+            try:
+                self.on_progress(task)
+            except Exception as e:
+                print(f"Erro ao atualizar progresso da transferência: {str(e)}")
+    
+    def _run_task(self, task: TransferTask) -> None:
+        if task.cancel_requested:
+            task.status = "cancelled"
+            self._notify(task)
+            return
+        task.status = "running"
+        task.started_at = time.time()
+        self._notify(task)
+        use_paramiko = paramiko is not None
+        while True:
+            task.attempts += 1
+            task.error = ""
+            try:
+                if use_paramiko:
+                    self._transfer_paramiko(task)
+                else:
+                    self._transfer_openssh(task)
+                break
+            except Exception as e:
+                task.error = str(e) or e.__class__.__name__
+                if use_paramiko and self.pool is not None:
+                    self.pool.discard_session(task.host)
+                # Conteúdo divergente não melhora com nova tentativa; falhas de rede sim (retomando)
+                if task.status == "failed" or task.cancel_requested or task.attempts > TRANSFER_RETRIES:
+                    if task.status != "failed":
+                        task.status = "error"
+                    break
+                task.status = "running"
+                time.sleep(min(2 ** task.attempts, 10))
+        if task.cancel_requested and task.status != "success":
+            task.status = "cancelled"
+        task.finished_at = time.time()
+        self._notify(task)
+    
+    def _finish(self, task: TransferTask, remote_sha256: Optional[str], remote_size: int,
+                discard_part: Callable[[], None]) -> None:
+        """Confere tamanho e soma SHA-256 antes de liberar o arquivo final"""
+        if remote_size == task.size and (remote_sha256 is None or remote_sha256 == task.sha256):
+            task.verified = remote_sha256 is not None
+            return
+        task.status = "failed"
+        # O arquivo parcial não serve para retomar: a próxima tentativa começa do zero
+        try:
+            discard_part()
+        except (IOError, OSError):
+            pass
+        if remote_size != task.size:
+            raise IOError(f"Tamanho divergente: {remote_size} bytes no host, {task.size} bytes locais")
+        raise IOError("Soma SHA-256 divergente após a transferência")
+    
+    @staticmethod
+    def _hash_prefix(path: str, length: int, digest) -> None:
+        """Inclui no hash o trecho já transferido em uma tentativa anterior"""
+        with open(path, "rb") as source:
+            remaining = length
+            while remaining > 0:
+                chunk = source.read(min(TRANSFER_CHUNK_SIZE * 32, remaining))
+                if not chunk:
+                    break
+                digest.update(chunk)
+                remaining -= len(chunk)
+    
+    def _copy(self, task: TransferTask, source, target, digest) -> bool:
+        """Copia blocos respeitando o limite de banda; retorna False se foi cancelada"""
+        cancelled = lambda: task.cancel_requested
+        while True:
+            if task.cancel_requested:
+                return False
+            chunk = source.read(TRANSFER_CHUNK_SIZE)
+            if not chunk:
+                return True
+            self.bucket.consume(len(chunk), cancelled)
+            target.write(chunk)
+            digest.update(chunk)
+            task.transferred += len(chunk)
+            self._notify(task, force=False)
+    
+    # --- paramiko ---
+    
+    def _paramiko_client(self, host: SSHSavedHost) -> "paramiko.SSHClient":
+        if self.pool is not None:
+            return self.pool.paramiko_session(host)
+        client = new_paramiko_client()
+        client.connect(
+            host.host,
+            port=int(host.port or 22),
+            username=host.username,
+            password=host.password or None,
+            timeout=BATCH_CONNECT_TIMEOUT,
+            banner_timeout=BATCH_CONNECT_TIMEOUT,
+            auth_timeout=BATCH_CONNECT_TIMEOUT,
+        )
+        return client
+    
+    @staticmethod
+    def _paramiko_sha256(client: "paramiko.SSHClient", path: str) -> Optional[str]:
+        """Soma SHA-256 calculada no próprio host; None se sha256sum não estiver disponível"""
+        try:
+            _, stdout, _ = client.exec_command(f"sha256sum -- {shlex.quote(path)}", timeout=TRANSFER_VERIFY_TIMEOUT)
+            output = stdout.read().decode("utf-8", "replace")
+            if stdout.channel.recv_exit_status() != 0:
+                return None
+        except (paramiko.SSHException, OSError):
+            return None
+        value = output.split(" ", 1)[0].strip().lower()
+        return value if len(value) == 64 else None
+    
+    def _transfer_paramiko(self, task: TransferTask) -> None:
+        client = self._paramiko_client(task.host)
+        sftp = client.open_sftp()
+        sftp.get_channel().settimeout(TRANSFER_TIMEOUT)
+        try:
+            if task.direction == "upload":
+                self._upload_paramiko(task, client, sftp)
+            else:
+                self._download_paramiko(task, client, sftp)
+        finally:
+            sftp.close()
+            if self.pool is None:
+                client.close()
+    
+    def _upload_paramiko(self, task: TransferTask, client, sftp) -> None:
+        task.size = os.path.getsize(task.local_path)
+        part_path = task.remote_path + TRANSFER_PART_SUFFIX
+        try:
+            offset = sftp.stat(part_path).st_size
+        except IOError:
+            offset = 0
+        if offset > task.size:
+            offset = 0
+        
+        digest = hashlib.sha256()
+        self._hash_prefix(task.local_path, offset, digest)
+        task.transferred = task.resumed_from = offset
+        with open(task.local_path, "rb") as source, sftp.open(part_path, "r+b" if offset else "wb") as target:
+            source.seek(offset)
+            target.seek(offset)
+            # Envia os blocos sem esperar a confirmação de cada escrita
+            target.set_pipelined(True)
+            if not self._copy(task, source, target, digest):
+                return
+        task.sha256 = digest.hexdigest()
+        
+        task.status = "verifying"
+        self._notify(task)
+        self._finish(task, self._paramiko_sha256(client, part_path), sftp.stat(part_path).st_size,
+                     lambda: sftp.remove(part_path))
+        try:
+            sftp.posix_rename(part_path, task.remote_path)
+        except IOError:
+            # Servidor sem a extensão posix-rename: rename simples não sobrescreve
+            try:
+                sftp.remove(task.remote_path)
+            except IOError:
+                pass
+            sftp.rename(part_path, task.remote_path)
+        task.status = "success"
+    
+    def _download_paramiko(self, task: TransferTask, client, sftp) -> None:
+        task.size = sftp.stat(task.remote_path).st_size
+        os.makedirs(os.path.dirname(os.path.abspath(task.local_path)), exist_ok=True)
+        part_path = task.local_path + TRANSFER_PART_SUFFIX
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        if offset > task.size:
+            offset = 0
+        
+        digest = hashlib.sha256()
+        self._hash_prefix(part_path, offset, digest)
+        task.transferred = task.resumed_from = offset
+        with sftp.open(task.remote_path, "rb") as source, open(part_path, "ab" if offset else "wb") as target:
+            source.seek(offset)
+            # Pede os blocos restantes em paralelo em vez de um de cada vez
+            source.prefetch(task.size)
+            if not self._copy(task, source, target, digest):
+                return
+        task.sha256 = digest.hexdigest()
+        
+        task.status = "verifying"
+        self._notify(task)
+        self._finish(task, self._paramiko_sha256(client, task.remote_path), os.path.getsize(part_path),
+                     lambda: os.remove(part_path))
+        os.replace(part_path, task.local_path)
+        task.status = "success"
+    
+    # --- OpenSSH ---
+    
+    def _openssh_options(self, host: SSHSavedHost) -> List[str]:
+        return [
+            "-o", "BatchMode=yes",
+            "-o", f"ConnectTimeout={BATCH_CONNECT_TIMEOUT}",
+            "-o", "StrictHostKeyChecking=accept-new",
+            # Conexão sem resposta por ~TRANSFER_TIMEOUT segundos é considerada perdida
+            "-o", f"ServerAliveInterval={max(1, TRANSFER_TIMEOUT // 3)}",
+            "-o", "ServerAliveCountMax=3",
+        ] + (self.pool.options(host) if self.pool else [])
+    
+    @staticmethod
+    def _destination(host: SSHSavedHost) -> str:
+        return f"{host.username}@{host.host}" if host.username else host.host
+    
+    @staticmethod
+    def _sftp_quote(path: str) -> str:
+        return '"' + path.replace("\\", "\\\\").replace('"', '\\"') + '"'
+    
+    def _sftp_batch(self, task: TransferTask, commands: List[str], poll: Optional[Callable[[], None]] = None) -> str:
+        """Executa comandos do sftp em modo batch e retorna a saída; erro se algum comando falhar"""
+        command = ["sftp", "-b", "-", "-P", str(task.host.port or 22)] + self._openssh_options(task.host)
+        if self.bucket.rate > 0:
+            # -l é por processo e em Kbit/s: divide a banda entre os fluxos simultâneos
+            command += ["-l", str(max(1, int(self.bucket.rate * 8 / 1024 / self.max_streams)))]
+        command.append(self._destination(task.host))
+        process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+        )
+        with self.lock:
+            self.processes[id(task)] = process
+        try:
+            process.stdin.write("\n".join(commands) + "\n")
+            process.stdin.close()
+            output: List[str] = []
+            reader = threading.Thread(target=lambda: output.append(process.stdout.read()), daemon=True)
+            reader.start()
+            while True:
+                try:
+                    process.wait(timeout=TRANSFER_PROGRESS_INTERVAL)
+                    break
+                except subprocess.TimeoutExpired:
+                    if poll is not None:
+                        poll()
+            reader.join()
+            stderr = process.stderr.read()
+        finally:
+            with self.lock:
+                self.processes.pop(id(task), None)
+        if task.cancel_requested:
+            return ""
+        if process.returncode != 0:
+            message = stderr.strip().splitlines()
+            if process.returncode == 255 and task.host.password:
+                message.append("Host com senha: instale o paramiko ou configure uma chave SSH.")
+            raise IOError("\n".join(message) or f"sftp terminou com código {process.returncode}")
+        return "".join(output)
+    
+    def _openssh_size(self, task: TransferTask, path: str) -> Optional[int]:
+        """Tamanho de um arquivo remoto (None se não existir)"""
+        try:
+            output = self._sftp_batch(task, [f"ls -ln {self._sftp_quote(path)}"])
+        except IOError:
+            return None
+        for line in output.splitlines():
+            fields = line.split()
+            if line.startswith("-") and len(fields) >= 5 and fields[4].isdigit():
+                return int(fields[4])
+        return None
+    
+    def _openssh_sha256(self, task: TransferTask, path: str) -> Optional[str]:
+        command = ["ssh", "-p", str(task.host.port or 22)] + self._openssh_options(task.host) + [
+            self._destination(task.host), f"sha256sum -- {shlex.quote(path)}"
+        ]
+        try:
+            completed = subprocess.run(command, capture_output=True, text=True, timeout=TRANSFER_VERIFY_TIMEOUT)
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        value = completed.stdout.split(" ", 1)[0].strip().lower()
+        return value if completed.returncode == 0 and len(value) == 64 else None
+    
+    def _transfer_openssh(self, task: TransferTask) -> None:
+        if task.direction == "upload":
+            self._upload_openssh(task)
+        else:
+            self._download_openssh(task)
+    
+    def _upload_openssh(self, task: TransferTask) -> None:
+        task.size = os.path.getsize(task.local_path)
+        part_path = task.remote_path + TRANSFER_PART_SUFFIX
+        offset = self._openssh_size(task, part_path) or 0
+        if offset > task.size:
+            offset = 0
+        task.transferred = task.resumed_from = offset
+        verb = "reput" if offset else "put"
+        self._sftp_batch(task, [f"{verb} {self._sftp_quote(task.local_path)} {self._sftp_quote(part_path)}"])
+        if task.cancel_requested:
+            return
+        task.transferred = task.size
+        task.sha256 = DownloadManager.file_sha256(task.local_path)
+        
+        task.status = "verifying"
+        self._notify(task)
+        self._finish(task, self._openssh_sha256(task, part_path), self._openssh_size(task, part_path) or 0,
+                     lambda: self._sftp_batch(task, [f"rm {self._sftp_quote(part_path)}"]))
+        # O sftp do OpenSSH usa posix-rename quando o servidor suporta (substitui o destino)
+        self._sftp_batch(task, [f"rename {self._sftp_quote(part_path)} {self._sftp_quote(task.remote_path)}"])
+        task.status = "success"
+    
+    def _download_openssh(self, task: TransferTask) -> None:
+        size = self._openssh_size(task, task.remote_path)
+        if size is None:
+            raise IOError(f"Arquivo remoto não encontrado: {task.remote_path}")
+        task.size = size
+        os.makedirs(os.path.dirname(os.path.abspath(task.local_path)), exist_ok=True)
+        part_path = task.local_path + TRANSFER_PART_SUFFIX
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        if offset > task.size:
+            os.remove(part_path)
+            offset = 0
+        task.transferred = task.resumed_from = offset
+        
+        def poll():
+            if os.path.exists(part_path):
+                task.transferred = os.path.getsize(part_path)
+                self._notify(task, force=False)
+        
+        verb = "reget" if offset else "get"
+        self._sftp_batch(task, [f"{verb} {self._sftp_quote(task.remote_path)} {self._sftp_quote(part_path)}"], poll)
+        if task.cancel_requested:
+            return
+        task.transferred = os.path.getsize(part_path)
+        task.sha256 = DownloadManager.file_sha256(part_path)
+        
+        task.status = "verifying"
+        self._notify(task)
+        self._finish(task, self._openssh_sha256(task, task.remote_path), task.transferred,
+                     lambda: os.remove(part_path))
+        os.replace(part_path, task.local_path)
+        task.status = "success"
+
+def server_group(server_name: str) -> str:
+    """Grupo de um servidor da lista SERVIDORES: "PACS <UF>" (HAP-<UF>-...) ou o ambiente (PRD, DEV)"""
+    parts = server_name.split("-")
+    if parts[0] == "HAP" and len(parts) > 1:
+        return f"PACS {parts[1]}"
+    return parts[0]
+
+def load_pacs_servers() -> List[Dict]:
+    """Lista SERVIDORES do módulo servidores.py, ao lado deste arquivo"""
+    spec = importlib.util.spec_from_file_location(
+        "servidores", os.path.join(os.path.dirname(os.path.abspath(__file__)), "servidores.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.SERVIDORES
 
 def main(page: ft.Page):
     # Configuração da página
@@ -734,6 +2335,7 @@ def main(page: ft.Page):
     username = create_input_field("Usuário")
     password = create_input_field("Senha", password=True)
     port = create_input_field("Porta", "22")
+    tags_field = create_input_field("Tags (separadas por vírgula)")
     
     # Dropdown para tipo de conexão
     connection_type_dropdown = ft.Dropdown(
@@ -853,9 +2455,19 @@ def main(page: ft.Page):
         text_size=14,
         content_padding=10,
         expand=True,
-        on_change=lambda e: search_hosts(e.control.value)
+        on_change=lambda e: schedule_search(e.control.value)
     )
     
+    # Pesquisa com atraso: digitar rápido gera uma única atualização da grade
+    search_timer: Dict[str, Optional[threading.Timer]] = {"timer": None}
+    
+    def schedule_search(query: str):
+        if search_timer["timer"] is not None:
+            search_timer["timer"].cancel()
+        search_timer["timer"] = threading.Timer(SEARCH_DEBOUNCE_SECONDS, lambda: search_hosts(query))
+        search_timer["timer"].daemon = True
+        search_timer["timer"].start()
+    
     # Dropdown para filtrar por grupo
     filter_group_dropdown = ft.Dropdown(
         label="Filtrar por grupo",
@@ -909,127 +2521,228 @@ def main(page: ft.Page):
         else:
             hosts_to_show = ssh_manager.get_hosts_by_group(group)
         
-        # Se houver uma pesquisa ativa, filtra ainda mais
+        # Se houver uma pesquisa ativa, filtra ainda mais (pelo índice de busca)
         if search_field.value:
-            hosts_to_show = [h for h in hosts_to_show if 
-                            search_field.value.lower() in h.name.lower() or 
-                            search_field.value.lower() in h.host.lower() or 
-                            search_field.value.lower() in h.username.lower()]
+            hosts_to_show = ssh_manager.search_hosts(search_field.value)
+            if group != "Todos os grupos":
+                hosts_to_show = [h for h in hosts_to_show if h.group == group]
         
         update_host_grid(hosts_to_show)
     
+    def reachability_badge_content(status: Optional[Dict]) -> Tuple[str, str, str]:
+        """Texto, cor e dica do selo de disponibilidade"""
+        if status is None:
+            return "...", ft.Colors.GREY_600, "Verificando porta..."
+        if status["reachable"]:
+            return "Online", ft.Colors.GREEN_700, f"Porta respondeu em {status['latency_ms']:.0f} ms"
+        return "Offline", ft.Colors.RED_700, f"Sem resposta: {status['error']}"
+    
+    def on_reachability(host: SSHSavedHost, status: Dict):
+        cached = host_cards.get(host.name)
+        if cached is None:
+            return
+        badge = cached[2]
+        text, color, tooltip = reachability_badge_content(status)
+        badge.content.value = text
+        badge.bgcolor = color
+        badge.tooltip = tooltip
+        try:
+            badge.update()
+        except Exception:
+            # O card não está na grade no momento (filtro alterado antes da resposta)
+            pass
+    
+    # Cards reaproveitados entre atualizações da grade: nome -> (assinatura, card, selo)
+    host_cards: Dict[str, Tuple[Tuple, ft.Card, ft.Container]] = {}
+    # Hosts do filtro atual e quantos deles estão renderizados (o restante entra ao rolar)
+    grid_state = {"hosts": [], "rendered": 0}
+    # A pesquisa com atraso roda na thread do Timer; os handlers da interface, na thread de eventos
+    grid_lock = threading.RLock()
+    
+    def host_signature(host: SSHSavedHost) -> Tuple:
+        return (id(host), host.name, host.host, host.username, host.port, host.client,
+                host.group, host.connection_type, tuple(host.tags))
+    
+    def build_host_card(host: SSHSavedHost) -> Tuple[ft.Card, ft.Container]:
+        # Verifica se o cliente existe na plataforma atual
+        client_exists = host.client in ssh_manager.ssh_client.get_platform_clients()
+        icon_path = ssh_manager.ssh_client.get_client_icon(host.client) if client_exists else None
+        
+        # Ícone baseado no tipo de conexão
+        connection_icon = ft.Icons.TERMINAL
+        if host.connection_type == ConnectionType.RDP:
+            connection_icon = ft.Icons.DESKTOP_WINDOWS
+        
+        # Selo de disponibilidade (preenchido pela verificação em segundo plano)
+        badge_text, badge_color, badge_tooltip = reachability_badge_content(
+            ssh_manager.prober.cached(host)
+        )
+        reachability_badge = ft.Container(
+            content=ft.Text(badge_text, size=11, color=ft.Colors.WHITE),
+            bgcolor=badge_color,
+            tooltip=badge_tooltip,
+            border_radius=10,
+            padding=ft.padding.only(left=8, right=8, top=2, bottom=2)
+        )
+        
+        # Cria um card para o host
+        host_card = ft.Card(
+            content=ft.Container(
+                content=ft.Column([
+                    ft.Row([
+                        ft.Icon(connection_icon, color=accent_color, size=20),
+                        ft.Text(host.name, weight=ft.FontWeight.BOLD, size=16, expand=True),
+                        reachability_badge,
+                        ft.Container(
+                            content=ft.Text(host.group, size=12),
+                            bgcolor=primary_color,
+                            border_radius=15,
+                            padding=ft.padding.only(left=10, right=10, top=5, bottom=5)
+                        )
+                    ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+                    ft.Divider(height=1, color=ft.Colors.GREY_700),
+                    ft.Container(height=10),
+                    ft.Row([
+                        ft.Image(
+                            src=icon_path,
+                            width=40,
+                            height=40,
+                            fit=ft.ImageFit.CONTAIN,
+                            error_content=ft.Icon(ft.Icons.COMPUTER)
+                        ),
+                        ft.Column([
+                            ft.Text(f"Host: {host.host}", size=14),
+                            ft.Text(f"Usuário: {host.username}", size=14),
+                            ft.Text(f"Porta: {host.port}", size=14),
+                            ft.Text(f"Cliente: {host.client}", size=14),
+                            ft.Text(f"Tags: {', '.join(host.tags)}", size=12, color=ft.Colors.GREY_400,
+                                    visible=bool(host.tags))
+                        ], spacing=2, expand=True)
+                    ], alignment=ft.MainAxisAlignment.START),
+                    ft.Container(height=10),
+                    ft.Row([
+                        ft.ElevatedButton(
+                            "Conectar",
+                            icon=ft.Icons.CONNECT_WITHOUT_CONTACT,
+                            style=ft.ButtonStyle(
+                                bgcolor=accent_color,
+                                color=ft.Colors.WHITE,
+                                shape=ft.RoundedRectangleBorder(radius=10)
+                            ),
+                            on_click=lambda e, h=host: connect_to_host(h)
+                        ),
+                        ft.PopupMenuButton(
+                            icon=ft.Icons.MORE_VERT,
+                            tooltip="Mais opções",
+                            items=[
+                                ft.PopupMenuItem(
+                                    text="Editar",
+                                    icon=ft.Icons.EDIT,
+                                    on_click=lambda e, h=host: edit_host(h)
+                                ),
+                                ft.PopupMenuItem(
+                                    text="Excluir",
+                                    icon=ft.Icons.DELETE,
+                                    on_click=lambda e, h=host: delete_host(h)
+                                ),
+                                ft.PopupMenuItem(
+                                    text="Conectar com script",
+                                    icon=ft.Icons.CODE,
+                                    on_click=lambda e, h=host: show_script_selection(h)
+                                ),
+                                ft.PopupMenuItem(
+                                    text="Encerrar conexão reutilizável",
+                                    icon=ft.Icons.LINK_OFF,
+                                    on_click=lambda e, h=host: close_pooled_connection(h)
+                                )
+                            ]
+                        )
+                    ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN)
+                ], spacing=5),
+                padding=15,
+                border_radius=10,
+                bgcolor=card_color,
+            ),
+            elevation=5,
+            margin=5,
+        )
+        
+        return host_card, reachability_badge
+    
+    def host_card_for(host: SSHSavedHost) -> ft.Card:
+        """Card do host, reaproveitado enquanto os dados do host não mudarem"""
+        signature = host_signature(host)
+        cached = host_cards.get(host.name)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        card, badge = build_host_card(host)
+        host_cards[host.name] = (signature, card, badge)
+        return card
+    
+    empty_grid_message = ft.Container(
+        content=ft.Column([
+            ft.Icon(ft.Icons.SEARCH_OFF, size=50, color=ft.Colors.GREY_500),
+            ft.Text("Nenhum host encontrado", size=16, color=ft.Colors.GREY_500),
+            ft.Text("Adicione um novo host ou altere os filtros de pesquisa", 
+                   size=14, color=ft.Colors.GREY_500)
+        ], alignment=ft.MainAxisAlignment.CENTER, horizontal_alignment=ft.CrossAxisAlignment.CENTER),
+        alignment=ft.alignment.center,
+        expand=True
+    )
+    
+    def render_host_window(count: int):
+        """Exibe os primeiros count hosts do filtro atual, reaproveitando os cards existentes"""
+        with grid_lock:
+            hosts = grid_state["hosts"]
+            count = min(count, len(hosts))
+            previous = grid_state["rendered"]
+            visible = hosts[:count]
+            controls = [host_card_for(host) for host in visible] or [empty_grid_message]
+            
+            # Só reatribui a lista se algo mudou; o Flet envia apenas os cards novos ou removidos
+            if [id(c) for c in controls] != [id(c) for c in host_grid.controls]:
+                host_grid.controls = controls
+                page.update()
+            grid_state["rendered"] = count
+        
+        # Verifica as portas depois de exibir a grade; os selos são atualizados à medida que respondem
+        newly_visible = visible if count <= previous else visible[previous:]
+        ssh_manager.prober.probe(
+            [h for h in newly_visible if ssh_manager.prober.cached(h) is None],
+            on_reachability
+        )
+    
+    def on_grid_scroll(e: ft.OnScrollEvent):
+        # Perto do fim da lista: renderiza a próxima página de cards
+        if e.max_scroll_extent and e.pixels >= e.max_scroll_extent - HOST_GRID_LOAD_MARGIN:
+            with grid_lock:
+                if grid_state["rendered"] < len(grid_state["hosts"]):
+                    render_host_window(grid_state["rendered"] + HOST_GRID_PAGE_SIZE)
+    
+    host_grid.on_scroll = on_grid_scroll
+    host_grid.on_scroll_interval = 100
+    
     # Atualiza a grade de hosts
     def update_host_grid(hosts_to_show=None):
-        host_grid.controls.clear()
-        
         if hosts_to_show is None:
             if filter_group_dropdown.value == "Todos os grupos":
                 hosts_to_show = ssh_manager.saved_hosts
             else:
                 hosts_to_show = ssh_manager.get_hosts_by_group(filter_group_dropdown.value)
         
-        for host in hosts_to_show:
-            # Verifica se o cliente existe na plataforma atual
-            client_exists = host.client in ssh_manager.ssh_client.get_platform_clients()
-            icon_path = ssh_manager.ssh_client.get_client_icon(host.client) if client_exists else None
-            
-            # Ícone baseado no tipo de conexão
-            connection_icon = ft.Icons.TERMINAL
-            if host.connection_type == ConnectionType.RDP:
-                connection_icon = ft.Icons.DESKTOP_WINDOWS
-            
-            # Cria um card para o host
-            host_card = ft.Card(
-                content=ft.Container(
-                    content=ft.Column([
-                        ft.Row([
-                            ft.Icon(connection_icon, color=accent_color, size=20),
-                            ft.Text(host.name, weight=ft.FontWeight.BOLD, size=16, expand=True),
-                            ft.Container(
-                                content=ft.Text(host.group, size=12),
-                                bgcolor=primary_color,
-                                border_radius=15,
-                                padding=ft.padding.only(left=10, right=10, top=5, bottom=5)
-                            )
-                        ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
-                        ft.Divider(height=1, color=ft.Colors.GREY_700),
-                        ft.Container(height=10),
-                        ft.Row([
-                            ft.Image(
-                                src=icon_path,
-                                width=40,
-                                height=40,
-                                fit=ft.ImageFit.CONTAIN,
-                                error_content=ft.Icon(ft.Icons.COMPUTER)
-                            ),
-                            ft.Column([
-                                ft.Text(f"Host: {host.host}", size=14),
-                                ft.Text(f"Usuário: {host.username}", size=14),
-                                ft.Text(f"Porta: {host.port}", size=14),
-                                ft.Text(f"Cliente: {host.client}", size=14)
-                            ], spacing=2, expand=True)
-                        ], alignment=ft.MainAxisAlignment.START),
-                        ft.Container(height=10),
-                        ft.Row([
-                            ft.ElevatedButton(
-                                "Conectar",
-                                icon=ft.Icons.CONNECT_WITHOUT_CONTACT,
-                                style=ft.ButtonStyle(
-                                    bgcolor=accent_color,
-                                    color=ft.Colors.WHITE,
-                                    shape=ft.RoundedRectangleBorder(radius=10)
-                                ),
-                                on_click=lambda e, h=host: connect_to_host(h)
-                            ),
-                            ft.PopupMenuButton(
-                                icon=ft.Icons.MORE_VERT,
-                                tooltip="Mais opções",
-                                items=[
-                                    ft.PopupMenuItem(
-                                        text="Editar",
-                                        icon=ft.Icons.EDIT,
-                                        on_click=lambda e, h=host: edit_host(h)
-                                    ),
-                                    ft.PopupMenuItem(
-                                        text="Excluir",
-                                        icon=ft.Icons.DELETE,
-                                        on_click=lambda e, h=host: delete_host(h)
-                                    ),
-                                    ft.PopupMenuItem(
-                                        text="Conectar com script",
-                                        icon=ft.Icons.CODE,
-                                        on_click=lambda e, h=host: show_script_selection(h)
-                                    )
-                                ]
-                            )
-                        ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN)
-                    ], spacing=5),
-                    padding=15,
-                    border_radius=10,
-                    bgcolor=card_color,
-                ),
-                elevation=5,
-                margin=5,
-            )
+        with grid_lock:
+            # Descarta cards de hosts removidos
+            for name in [name for name in host_cards if ssh_manager.get_host(name) is None]:
+                del host_cards[name]
             
-            host_grid.controls.append(host_card)
-        
-        # Mensagem se não houver hosts
-        if not host_grid.controls:
-            host_grid.controls.append(
-                ft.Container(
-                    content=ft.Column([
-                        ft.Icon(ft.Icons.SEARCH_OFF, size=50, color=ft.Colors.GREY_500),
-                        ft.Text("Nenhum host encontrado", size=16, color=ft.Colors.GREY_500),
-                        ft.Text("Adicione um novo host ou altere os filtros de pesquisa", 
-                               size=14, color=ft.Colors.GREY_500)
-                    ], alignment=ft.MainAxisAlignment.CENTER, horizontal_alignment=ft.CrossAxisAlignment.CENTER),
-                    alignment=ft.alignment.center,
-                    expand=True
-                )
-            )
-        
-        page.update()
+            grid_state["hosts"] = list(hosts_to_show)
+            grid_state["rendered"] = 0
+            render_host_window(HOST_GRID_PAGE_SIZE)
+    
+    # Encerra a conexão mestre mantida para o host
+    def close_pooled_connection(host: SSHSavedHost):
+        ssh_manager.connection_pool.close(host)
+        show_info(f"Conexão reutilizável com {host.name} encerrada")
     
     # Seleciona um host
     def select_host(host: SSHSavedHost):
@@ -1040,6 +2753,7 @@ def main(page: ft.Page):
         username.value = host.username
         password.value = host.password
         port.value = host.port
+        tags_field.value = ", ".join(host.tags)
         connection_type_dropdown.value = host.connection_type
         update_client_dropdown(host.connection_type)
         
@@ -1188,7 +2902,8 @@ def main(page: ft.Page):
                     with open(script_file, "w") as f:
                         f.write("#!/bin/bash\n")
                         f.write(f"echo 'Conectando a {host.name}...'\n")
-                        f.write(f"ssh {host.username}@{host.host} -p {host.port}\n")
+                        ssh_options = shlex.join(ssh_manager.connection_pool.options(host))
+                        f.write(f"ssh {ssh_options} {host.username}@{host.host} -p {host.port}\n")
                         f.write(f"echo 'Executando script: {script.name}'\n")
                         f.write(f"{script.content}\n")
                         f.write("read -p 'Pressione Enter para continuar...'\n")
@@ -1274,7 +2989,10 @@ def main(page: ft.Page):
                     
                     subprocess.Popen(command, shell=True)
                 else:
-                    command = ["ssh", f"{host.username}@{host.host}", "-p", host.port]
+                    # Reutiliza a conexão mestre do host, se houver (sem novo handshake)
+                    command = ["ssh"] + ssh_manager.connection_pool.options(host) + [
+                        f"{host.username}@{host.host}", "-p", host.port
+                    ]
                     subprocess.Popen(command)
             else:
                 # Conexão RDP
@@ -1317,23 +3035,8 @@ def main(page: ft.Page):
             show_error(f"Erro ao conectar: {str(e)}")
     
     def find_mobaxterm() -> Optional[str]:
-        """Encontra o caminho completo do MobaXterm no sistema"""
-        search_paths = [
-            os.path.join(os.environ.get("ProgramFiles", ""), ""),
-            os.path.join(os.environ.get("ProgramFiles(x86)", ""), ""),
-            os.path.join(os.environ.get("LOCALAPPDATA", ""), "Programs"),
-            ssh_manager.ssh_client.install_dir
-        ]
-        
-        for path in search_paths:
-            if not path:
-                continue
-                
-            for root, dirs, files in os.walk(path):
-                if "MobaXterm.exe" in files:
-                    return os.path.join(root, "MobaXterm.exe")
-        
-        return None
+        """Encontra o caminho completo do MobaXterm no sistema (cache de descoberta)"""
+        return ssh_manager.ssh_client.discovery.get("MobaXterm")
     
     # Instala um cliente SSH/RDP
     def install_client(client_name: str, on_success=None):
@@ -1399,7 +3102,8 @@ def main(page: ft.Page):
             port=port.value,
             client=client_dropdown.value,
             group=new_group,
-            connection_type=connection_type_dropdown.value
+            connection_type=connection_type_dropdown.value,
+            tags=[tag.strip() for tag in (tags_field.value or "").split(",") if tag.strip()]
         )
         
         # Verifica se já existe um host com esse nome
@@ -1409,6 +3113,7 @@ def main(page: ft.Page):
             ssh_manager.remove_host(host.name)
         
         ssh_manager.add_host(host)
+        ssh_manager.prober.invalidate(host)
         update_groups()
         update_host_grid()
         
@@ -1443,6 +3148,9 @@ def main(page: ft.Page):
                 ft.Column([group_dropdown], col={"sm": 12, "md": 6, "lg": 6}, expand=True),
                 ft.Column([client_dropdown], col={"sm": 12, "md": 6, "lg": 6}, expand=True),
             ]),
+            ft.ResponsiveRow([
+                ft.Column([tags_field], col={"sm": 12, "md": 12, "lg": 12}, expand=True),
+            ]),
             ft.Row([
                 ft.TextButton(
                     "Adicionar Novo Grupo",
@@ -2081,6 +3789,516 @@ def main(page: ft.Page):
         scripts_dialog.open = True
         page.update()
     
+    # Executa um script em vários hosts SSH ao mesmo tempo
+    def show_batch_dialog(e=None):
+        ssh_hosts = [h for h in ssh_manager.saved_hosts if h.connection_type == ConnectionType.SSH]
+        executor: Optional[BatchExecutor] = None
+        rows: Dict[int, ft.DataRow] = {}
+        
+        batch_script_dropdown = ft.Dropdown(
+            label="Script",
+            options=[ft.dropdown.Option(script.name) for script in ssh_manager.scripts],
+            value=ssh_manager.scripts[0].name if ssh_manager.scripts else None,
+            border_color=secondary_color,
+            focused_border_color=accent_color,
+            text_size=14,
+            content_padding=10,
+            expand=True
+        )
+        concurrency_field = ft.TextField(
+            label="Simultâneos",
+            value=str(BATCH_MAX_CONCURRENCY),
+            width=120,
+            keyboard_type=ft.KeyboardType.NUMBER,
+            border_color=secondary_color,
+            text_size=14,
+            content_padding=10
+        )
+        timeout_field = ft.TextField(
+            label="Tempo limite (s)",
+            value=str(BATCH_DEFAULT_TIMEOUT),
+            width=140,
+            keyboard_type=ft.KeyboardType.NUMBER,
+            border_color=secondary_color,
+            text_size=14,
+            content_padding=10
+        )
+        host_checkboxes = [
+            ft.Checkbox(label=f"{h.name} ({h.group})", value=True, data=h)
+            for h in ssh_hosts
+        ]
+        
+        def toggle_all(e):
+            for checkbox in host_checkboxes:
+                checkbox.value = e.control.value
+            page.update()
+        
+        progress_bar = ft.ProgressBar(value=0, visible=False, color=ft.Colors.BLUE_400)
+        progress_text = ft.Text("", size=12)
+        output_view = ft.Text("", size=12, selectable=True, font_family="monospace")
+        output_container = ft.Container(
+            content=ft.Column([output_view], scroll=ft.ScrollMode.AUTO),
+            bgcolor=ft.Colors.GREY_900,
+            border_radius=5,
+            padding=10,
+            height=150,
+            visible=False
+        )
+        results_table = ft.DataTable(
+            columns=[
+                ft.DataColumn(ft.Text("Host")),
+                ft.DataColumn(ft.Text("Status")),
+                ft.DataColumn(ft.Text("Código"), numeric=True),
+                ft.DataColumn(ft.Text("Tempo"), numeric=True),
+                ft.DataColumn(ft.Text("Saída")),
+            ],
+            rows=[]
+        )
+        status_colors = {
+            "running": ft.Colors.BLUE_300,
+            "success": ft.Colors.GREEN_400,
+            "failed": ft.Colors.RED_400,
+            "timeout": ft.Colors.ORANGE_400,
+            "error": ft.Colors.RED_400,
+            "cancelled": ft.Colors.GREY_500,
+        }
+        
+        def show_output(result: BatchResult):
+            text = result.stdout
+            if result.stderr:
+                text += ("\n" if text else "") + f"[stderr]\n{result.stderr}"
+            output_view.value = f"{result.host.name}:\n{text or '(sem saída)'}"
+            output_container.visible = True
+            page.update()
+        
+        def result_cells(result: BatchResult) -> List[ft.DataCell]:
+            first_line = (result.stdout or result.stderr).strip().splitlines()
+            return [
+                ft.DataCell(ft.Text(result.host.name)),
+                ft.DataCell(ft.Text(
+                    BATCH_STATUS_LABELS[result.status],
+                    color=status_colors.get(result.status)
+                )),
+                ft.DataCell(ft.Text("" if result.exit_code is None else str(result.exit_code))),
+                ft.DataCell(ft.Text(f"{result.duration:.1f}s" if result.started_at else "")),
+                ft.DataCell(
+                    ft.Text(first_line[0][:60] if first_line else "", size=12),
+                    on_tap=lambda e, r=result: show_output(r)
+                ),
+            ]
+        
+        def on_progress(result: BatchResult):
+            row = rows.get(id(result))
+            if row is not None:
+                row.cells = result_cells(result)
+            counts = executor.counts()
+            done = sum(1 for r in executor.results if r.is_done)
+            progress_bar.value = done / len(executor.results)
+            progress_text.value = (
+                f"{done}/{len(executor.results)} concluídos | "
+                f"{counts['success']} sucesso | {counts['failed']} falharam | "
+                f"{counts['error'] + counts['timeout']} sem resposta"
+            )
+            page.update()
+        
+        def on_complete():
+            run_button.disabled = False
+            cancel_button.disabled = True
+            page.update()
+        
+        def start_batch(e):
+            nonlocal executor
+            script = next((s for s in ssh_manager.scripts if s.name == batch_script_dropdown.value), None)
+            selected = [checkbox.data for checkbox in host_checkboxes if checkbox.value]
+            if script is None:
+                show_error("Selecione um script")
+                return
+            if not selected:
+                show_error("Selecione ao menos um host")
+                return
+            try:
+                concurrency = int(concurrency_field.value)
+                timeout = float(timeout_field.value)
+                if concurrency <= 0 or timeout <= 0:
+                    raise ValueError
+            except (TypeError, ValueError):
+                show_error("Informe números positivos para simultâneos e tempo limite")
+                return
+            
+            executor = BatchExecutor(
+                max_concurrency=concurrency,
+                timeout=timeout,
+                on_progress=on_progress,
+                pool=ssh_manager.connection_pool
+            )
+            results = executor.run(selected, script, on_complete=on_complete)
+            rows.clear()
+            results_table.rows = []
+            for result in results:
+                row = ft.DataRow(cells=result_cells(result))
+                rows[id(result)] = row
+                results_table.rows.append(row)
+            output_container.visible = False
+            progress_bar.value = 0
+            progress_bar.visible = True
+            progress_text.value = f"0/{len(results)} concluídos"
+            run_button.disabled = True
+            cancel_button.disabled = False
+            page.update()
+        
+        def cancel_batch(e):
+            if executor is not None:
+                executor.cancel()
+        
+        def close_batch(e):
+            cancel_batch(e)
+            batch_dialog.open = False
+            page.update()
+        
+        run_button = ft.ElevatedButton("Executar", icon=ft.Icons.PLAY_ARROW, on_click=start_batch)
+        cancel_button = ft.TextButton("Cancelar execução", icon=ft.Icons.STOP, disabled=True, on_click=cancel_batch)
+        
+        batch_dialog = ft.AlertDialog(
+            modal=True,
+            title=ft.Text("Executar script em lote"),
+            content=ft.Column([
+                ft.Row([batch_script_dropdown, concurrency_field, timeout_field]),
+                ft.Checkbox(label="Selecionar todos", value=True, on_change=toggle_all),
+                ft.Container(
+                    content=ft.Column(host_checkboxes or [
+                        ft.Text("Nenhum host SSH cadastrado", color=ft.Colors.GREY_500)
+                    ], scroll=ft.ScrollMode.AUTO, spacing=0),
+                    height=150
+                ),
+                ft.Text(
+                    "Usa o OpenSSH sem interação (chave SSH ou agente)"
+                    + ("; hosts com senha usam paramiko." if paramiko else ". Instale o paramiko para hosts com senha."),
+                    size=12,
+                    color=ft.Colors.GREY_400
+                ),
+                progress_bar,
+                progress_text,
+                ft.Column([results_table], scroll=ft.ScrollMode.AUTO, height=220),
+                output_container,
+            ], spacing=10, scroll=ft.ScrollMode.AUTO, width=750),
+            actions=[
+                cancel_button,
+                run_button,
+                ft.TextButton("Fechar", on_click=close_batch)
+            ],
+            actions_alignment=ft.MainAxisAlignment.END
+        )
+        
+        page.dialog = batch_dialog
+        batch_dialog.open = True
+        page.update()
+    
+    # Envia ou baixa arquivos de vários hosts SSH (SFTP)
+    def show_transfer_dialog(e=None):
+        transfers = ssh_manager.transfers
+        ssh_hosts = [h for h in ssh_manager.saved_hosts if h.connection_type == ConnectionType.SSH]
+        rows: Dict[int, ft.DataRow] = {}
+        
+        direction_dropdown = ft.Dropdown(
+            label="Operação",
+            options=[
+                ft.dropdown.Option("upload", "Enviar para os hosts"),
+                ft.dropdown.Option("download", "Baixar dos hosts"),
+            ],
+            value="upload",
+            border_color=secondary_color,
+            focused_border_color=accent_color,
+            text_size=14,
+            content_padding=10,
+            width=220
+        )
+        local_field = ft.TextField(
+            label="Arquivo local (envio) ou pasta de destino (download)",
+            border_color=secondary_color,
+            text_size=14,
+            content_padding=10,
+            expand=True
+        )
+        remote_field = ft.TextField(
+            label="Caminho remoto (terminado em / para usar o nome do arquivo local)",
+            border_color=secondary_color,
+            text_size=14,
+            content_padding=10,
+            expand=True
+        )
+        streams_field = ft.TextField(
+            label="Simultâneos",
+            value=str(transfers.max_streams),
+            width=120,
+            keyboard_type=ft.KeyboardType.NUMBER,
+            border_color=secondary_color,
+            text_size=14,
+            content_padding=10
+        )
+        bandwidth_field = ft.TextField(
+            label="Limite (KB/s, 0 = livre)",
+            value=str(int(transfers.bucket.rate / 1024)),
+            width=180,
+            keyboard_type=ft.KeyboardType.NUMBER,
+            border_color=secondary_color,
+            text_size=14,
+            content_padding=10
+        )
+        host_checkboxes = [
+            ft.Checkbox(label=f"{h.name} ({h.group})", value=False, data=h)
+            for h in ssh_hosts
+        ]
+        
+        def toggle_all(e):
+            for checkbox in host_checkboxes:
+                checkbox.value = e.control.value
+            page.update()
+        
+        summary_text = ft.Text("", size=12)
+        transfers_table = ft.DataTable(
+            columns=[
+                ft.DataColumn(ft.Text("Host")),
+                ft.DataColumn(ft.Text("Arquivo")),
+                ft.DataColumn(ft.Text("Status")),
+                ft.DataColumn(ft.Text("Progresso")),
+                ft.DataColumn(ft.Text("Velocidade"), numeric=True),
+            ],
+            rows=[]
+        )
+        status_colors = {
+            "running": ft.Colors.BLUE_300,
+            "verifying": ft.Colors.BLUE_300,
+            "success": ft.Colors.GREEN_400,
+            "failed": ft.Colors.RED_400,
+            "error": ft.Colors.RED_400,
+            "cancelled": ft.Colors.GREY_500,
+        }
+        
+        def format_size(size: float) -> str:
+            for unit in ("B", "KB", "MB", "GB"):
+                if size < 1024 or unit == "GB":
+                    return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+                size /= 1024
+        
+        def task_cells(task: TransferTask) -> List[ft.DataCell]:
+            status = TRANSFER_STATUS_LABELS[task.status]
+            if task.status == "success" and not task.verified:
+                status += " (somente tamanho)"
+            path = task.local_path if task.direction == "download" else task.remote_path
+            arrow = "↑" if task.direction == "upload" else "↓"
+            return [
+                ft.DataCell(ft.Text(task.host.name)),
+                ft.DataCell(ft.Text(f"{arrow} {os.path.basename(path)}", tooltip=path)),
+                ft.DataCell(ft.Text(status, color=status_colors.get(task.status), tooltip=task.error or None)),
+                ft.DataCell(ft.Row([
+                    ft.ProgressBar(value=task.progress, width=100, color=ft.Colors.BLUE_400),
+                    ft.Text(f"{format_size(task.transferred)} / {format_size(task.size)}", size=12),
+                ])),
+                ft.DataCell(ft.Text(f"{format_size(task.rate)}/s" if task.status == "running" else "")),
+            ]
+        
+        def refresh_summary():
+            counts = transfers.counts()
+            active = counts["pending"] + counts["running"] + counts["verifying"]
+            summary_text.value = (
+                f"{active} em andamento | {counts['success']} concluídos | "
+                f"{counts['failed'] + counts['error']} com falha"
+            )
+        
+        def rebuild_rows():
+            rows.clear()
+            transfers_table.rows = []
+            for task in list(transfers.tasks):
+                row = ft.DataRow(cells=task_cells(task))
+                rows[id(task)] = row
+                transfers_table.rows.append(row)
+            refresh_summary()
+        
+        def on_progress(task: TransferTask):
+            row = rows.get(id(task))
+            if row is None:
+                return
+            row.cells = task_cells(task)
+            refresh_summary()
+            page.update()
+        
+        def apply_settings() -> bool:
+            try:
+                streams = int(streams_field.value)
+                limit = float(bandwidth_field.value or 0)
+                if streams <= 0 or limit < 0:
+                    raise ValueError
+            except (TypeError, ValueError):
+                show_error("Informe números válidos para simultâneos e limite de banda")
+                return False
+            transfers.set_max_streams(streams)
+            transfers.set_bandwidth_limit(limit * 1024)
+            return True
+        
+        def start_transfer(e):
+            selected = [checkbox.data for checkbox in host_checkboxes if checkbox.value]
+            local_path = (local_field.value or "").strip()
+            remote_path = (remote_field.value or "").strip()
+            if not selected:
+                show_error("Selecione ao menos um host")
+                return
+            if not local_path or not remote_path:
+                show_error("Informe o caminho local e o caminho remoto")
+                return
+            if direction_dropdown.value == "upload" and not os.path.isfile(local_path):
+                show_error(f"Arquivo local não encontrado: {local_path}")
+                return
+            if not apply_settings():
+                return
+            
+            if direction_dropdown.value == "upload":
+                transfers.upload(selected, local_path, remote_path)
+            else:
+                transfers.download(selected, remote_path, local_path)
+            rebuild_rows()
+            page.update()
+        
+        def cancel_transfers(e):
+            transfers.cancel()
+        
+        def clear_finished(e):
+            transfers.clear_finished()
+            rebuild_rows()
+            page.update()
+        
+        def close_transfers(e):
+            # As transferências continuam em segundo plano; só deixa de atualizar esta janela
+            transfers.on_progress = None
+            transfer_dialog.open = False
+            page.update()
+        
+        transfers.on_progress = on_progress
+        rebuild_rows()
+        
+        transfer_dialog = ft.AlertDialog(
+            modal=True,
+            title=ft.Text("Transferir arquivos (SFTP)"),
+            content=ft.Column([
+                ft.Row([direction_dropdown, streams_field, bandwidth_field]),
+                ft.Row([local_field]),
+                ft.Row([remote_field]),
+                ft.Checkbox(label="Selecionar todos", value=False, on_change=toggle_all),
+                ft.Container(
+                    content=ft.Column(host_checkboxes or [
+                        ft.Text("Nenhum host SSH cadastrado", color=ft.Colors.GREY_500)
+                    ], scroll=ft.ScrollMode.AUTO, spacing=0),
+                    height=130
+                ),
+                ft.Text(
+                    "Arquivos interrompidos são retomados e conferidos por SHA-256 (sha256sum no host). "
+                    + ("Hosts com senha usam paramiko." if paramiko else "Sem paramiko: usa o sftp do OpenSSH (chave SSH ou agente)."),
+                    size=12,
+                    color=ft.Colors.GREY_400
+                ),
+                summary_text,
+                ft.Column([transfers_table], scroll=ft.ScrollMode.AUTO, height=240),
+            ], spacing=10, scroll=ft.ScrollMode.AUTO, width=800),
+            actions=[
+                ft.TextButton("Limpar concluídos", icon=ft.Icons.CLEAR_ALL, on_click=clear_finished),
+                ft.TextButton("Cancelar todos", icon=ft.Icons.STOP, on_click=cancel_transfers),
+                ft.ElevatedButton("Iniciar", icon=ft.Icons.SWAP_VERT, on_click=start_transfer),
+                ft.TextButton("Fechar", on_click=close_transfers)
+            ],
+            actions_alignment=ft.MainAxisAlignment.END
+        )
+        
+        page.dialog = transfer_dialog
+        transfer_dialog.open = True
+        page.update()
+    
+    # Baixa os instaladores de todos os clientes para uso offline
+    def show_prefetch_dialog(e=None):
+        progress_lines: Dict[str, str] = {}
+        progress_text = ft.Text("Iniciando downloads...", size=12, selectable=True)
+        progress_ring = ft.ProgressRing(width=20, height=20)
+        
+        def on_progress(message: str):
+            # Uma linha por arquivo: "Baixando putty.exe: ..." substitui a anterior
+            key = message.split(":")[0]
+            progress_lines[key] = message
+            progress_text.value = "\n".join(progress_lines.values())
+            page.update()
+        
+        def worker():
+            results = ssh_manager.ssh_client.prefetch_clients(on_progress)
+            progress_ring.visible = False
+            progress_text.value = "\n".join(
+                f"{name}: {result if result.startswith('Erro') else 'pronto em ' + result}"
+                for name, result in results.items()
+            ) or "Nenhum cliente com instalador para baixar"
+            page.update()
+        
+        prefetch_dialog = ft.AlertDialog(
+            modal=True,
+            title=ft.Row([ft.Text("Kit offline de clientes"), progress_ring], spacing=10),
+            content=ft.Column([
+                ft.Text(
+                    f"Instaladores salvos em {ssh_manager.ssh_client.downloads.cache_dir} "
+                    "e reaproveitados nas próximas instalações.",
+                    size=14
+                ),
+                progress_text
+            ], tight=True, spacing=10, width=550),
+            actions=[
+                ft.TextButton("Fechar", on_click=lambda e: setattr(prefetch_dialog, "open", False) or page.update())
+            ],
+            actions_alignment=ft.MainAxisAlignment.END
+        )
+        page.dialog = prefetch_dialog
+        prefetch_dialog.open = True
+        page.update()
+        threading.Thread(target=worker, daemon=True).start()
+    
+    # Importa os servidores PACS (servidores.py) como hosts salvos
+    def show_import_servers_dialog(e=None):
+        import_username = create_input_field("Usuário padrão")
+        import_port = create_input_field("Porta", "22")
+        
+        def do_import(e):
+            try:
+                servers = load_pacs_servers()
+            except Exception as ex:
+                show_error(f"Erro ao ler servidores.py: {str(ex)}")
+                return
+            ssh_clients = ssh_manager.ssh_client.get_clients_by_type(ConnectionType.SSH)
+            added, updated = ssh_manager.import_hosts(
+                servers,
+                username=import_username.value or "",
+                port=import_port.value or "22",
+                client=next(iter(ssh_clients), "OpenSSH")
+            )
+            import_dialog.open = False
+            update_groups()
+            update_host_grid()
+            show_success(f"{added} hosts importados, {updated} atualizados")
+        
+        import_dialog = ft.AlertDialog(
+            modal=True,
+            title=ft.Text("Importar servidores PACS"),
+            content=ft.Column([
+                ft.Text(
+                    "Cria um host para cada servidor da lista PACS, agrupado por estado (PACS <UF>) "
+                    "e marcado com o nível (N1/N2/N3). Hosts já cadastrados têm IP e tags atualizados.",
+                    size=14
+                ),
+                import_username,
+                import_port
+            ], tight=True, spacing=10, width=450),
+            actions=[
+                ft.TextButton("Cancelar", on_click=lambda e: setattr(import_dialog, "open", False)),
+                ft.TextButton("Importar", on_click=do_import)
+            ],
+            actions_alignment=ft.MainAxisAlignment.END
+        )
+        page.dialog = import_dialog
+        import_dialog.open = True
+        page.update()
+    
     # Limpa os campos
     def clear_fields():
         host_name.value = ""
@@ -2088,6 +4306,7 @@ def main(page: ft.Page):
         username.value = ""
         password.value = ""
         port.value = "22"
+        tags_field.value = ""
         connection_type_dropdown.value = ConnectionType.SSH
         update_client_dropdown(ConnectionType.SSH)
         client_dropdown.value = client_dropdown.options[0].text if client_dropdown.options else ""
@@ -2152,6 +4371,9 @@ def main(page: ft.Page):
                 ft.Column([group_dropdown], col={"sm": 12, "md": 6, "lg": 6}, expand=True),
                 ft.Column([client_dropdown], col={"sm": 12, "md": 6, "lg": 6}, expand=True),
             ]),
+            ft.ResponsiveRow([
+                ft.Column([tags_field], col={"sm": 12, "md": 12, "lg": 12}, expand=True),
+            ]),
             ft.Row([
                 ft.TextButton(
                     "Adicionar Novo Grupo",
@@ -2213,12 +4435,53 @@ def main(page: ft.Page):
         on_click=manage_scripts
     )
     
+    # Botão para executar scripts em lote
+    batch_button = ft.ElevatedButton(
+        "Executar em Lote",
+        icon=ft.Icons.PLAYLIST_PLAY,
+        style=ft.ButtonStyle(
+            bgcolor=primary_color,
+            color=ft.Colors.WHITE,
+            padding=15,
+            shape=ft.RoundedRectangleBorder(radius=10)
+        ),
+        on_click=show_batch_dialog
+    )
+    
+    # Botão para transferir arquivos entre esta máquina e os hosts
+    transfer_button = ft.IconButton(
+        icon=ft.Icons.SWAP_VERT,
+        tooltip="Transferir arquivos (SFTP)",
+        icon_color=ft.Colors.WHITE,
+        on_click=show_transfer_dialog
+    )
+    
+    # Botão para importar os servidores PACS
+    import_servers_button = ft.IconButton(
+        icon=ft.Icons.CLOUD_DOWNLOAD,
+        tooltip="Importar servidores PACS",
+        icon_color=ft.Colors.WHITE,
+        on_click=show_import_servers_dialog
+    )
+    
+    # Botão para baixar os instaladores dos clientes (kit offline)
+    prefetch_button = ft.IconButton(
+        icon=ft.Icons.DOWNLOAD_FOR_OFFLINE,
+        tooltip="Baixar instaladores dos clientes para uso offline",
+        icon_color=ft.Colors.WHITE,
+        on_click=show_prefetch_dialog
+    )
+    
     # Barra de ferramentas
     toolbar = ft.Container(
         content=ft.Row([
             add_host_button,
             manage_groups_button,
             manage_scripts_button,
+            batch_button,
+            transfer_button,
+            import_servers_button,
+            prefetch_button,
             ft.VerticalDivider(width=20, color=ft.Colors.TRANSPARENT),
             ft.Column([
                 search_field,
@@ -2,28 +2,1646 @@ import flet as ft
 import subprocess
 import os
 import threading
-import glob
 import time
 import platform
 import psutil
 import shutil
+import itertools
+import queue
+import sqlite3
+import gzip
+import mmap
+import re
+import struct
+import bisect
+import json
+import signal
+import socket
+import selectors
+import runpy
+import importlib
+import tempfile
+import traceback
+import argparse
+import atexit
+import sys
+import heapq
+import datetime
+from collections import deque, OrderedDict
+
+try:
+    import resource
+except ImportError:
+    # Windows: limites aplicados apenas pelo monitoramento do processo
+    resource = None
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    # Sem watchdog, o cache é validado pelo mtime das pastas
+    Observer = None
+    FileSystemEventHandler = object
+
+# Limites do pipeline de saída
+OUTPUT_BUFFER_LINES = 20000  # linhas mantidas em memória por execução
+OUTPUT_VISIBLE_LINES = 500  # linhas exibidas na tela (o restante via "Carregar mais")
+OUTPUT_FLUSH_INTERVAL = 0.25  # segundos entre atualizações da saída na interface
+
+# Fila de execuções
+DEFAULT_MAX_WORKERS = 2  # scripts executados em paralelo
+MAX_WORKERS_LIMIT = 8
+JOB_MONITOR_INTERVAL = 1.0  # segundos entre amostras de CPU/memória de cada execução (padrão)
+JOB_MONITOR_INTERVALS = [0.5, 1.0, 2.0, 5.0]
+JOB_SAMPLES_LIMIT = 600  # amostras de recursos mantidas por execução (gráfico)
+FINISHED_JOBS_LIMIT = 50  # execuções concluídas mantidas na lista
+JOB_PRIORITIES = {"Alta": 1, "Normal": 5, "Baixa": 9}
+JOB_STATUS_LABELS = {
+    "queued": "Na fila",
+    "running": "Executando",
+    "succeeded": "Sucesso",
+    "failed": "Erro",
+    "cancelled": "Cancelado",
+}
+
+# Histórico persistente de execuções
+HISTORY_DB_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "external_program_history.db")
+STATS_SAMPLE_SIZE = 100  # execuções mais recentes consideradas nas estatísticas por script
+TREND_WINDOW = 10  # execuções comparadas (recentes x anteriores) no cálculo da tendência
+
+# Logs completos das execuções (blocos gzip independentes + índice de linhas)
+LOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "external_program_logs")
+LOG_BLOCK_LINES = 1000  # linhas por bloco comprimido
+LOG_BLOCK_BYTES = 256 * 1024  # tamanho máximo (não comprimido) de um bloco
+LOG_INDEX_RECORD = struct.Struct("<QIQI")  # offset, tamanho comprimido, primeira linha, qtd. de linhas
+LOG_RETENTION_DAYS = 30
+LOG_VIEWER_PAGE_LINES = 200
+LOG_SEARCH_MAX_RESULTS = 500
+
+# Modo restrito (limites de recursos)
+CGROUP_ROOT = "/sys/fs/cgroup"
+CGROUP_GROUP = "ogs-panel"
+LIMIT_KILL_GRACE_SECONDS = 5  # tempo entre terminate() e kill() ao exceder um limite
+MINIMAL_ENV_KEYS = [
+    "PATH", "HOME", "USERPROFILE", "LANG", "LC_ALL", "TEMP", "TMP", "TMPDIR",
+    "SYSTEMROOT", "COMSPEC", "PATHEXT", "WINDIR", "PYTHONIOENCODING", "PACS_ASSETS_PATH",
+]
+# Aplica os limites em um interpretador novo (com uma única thread) e faz exec do comando;
+# preexec_fn não é seguro aqui, pois o painel tem várias threads ativas durante o fork
+LIMITS_SHIM = """
+import json, os, resource, sys
+config = json.loads(sys.argv[1])
+if config.get("cgroup"):
+    try:
+        with open(os.path.join(config["cgroup"], "cgroup.procs"), "w") as f:
+            f.write(str(os.getpid()))
+    except OSError:
+        pass
+for name, soft, hard in config["rlimits"]:
+    resource.setrlimit(getattr(resource, name), (soft, hard))
+if config.get("nice"):
+    os.nice(config["nice"])
+os.execvp(sys.argv[2], sys.argv[2:])
+"""
+LIMIT_REASONS = {
+    "cpu": "tempo de CPU",
+    "memory": "memória",
+    "wall": "tempo máximo",
+}
+
+# Interpretador pré-carregado (servidor de fork, somente POSIX)
+WARM_PRELOAD_MODULES = ["flet", "psutil", "requests"]
+WARM_SERVER_START_TIMEOUT = 30  # segundos para o servidor importar os módulos e ficar pronto
+WARM_HEADER = struct.Struct("<I")  # tamanho da requisição JSON enviada junto com os descritores
+
+# Agendamento de execuções recorrentes
+SCHEDULES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "external_program_schedules.json")
+SCHEDULE_KINDS = {
+    "interval": "Intervalo (minutos)",
+    "daily": "Diário (HH:MM)",
+    "cron": "Cron (min hora dia mês semana)",
+}
+MISSED_RUN_POLICIES = {
+    "skip": "Ignorar execuções perdidas",
+    "run_once": "Executar uma vez ao iniciar",
+}
+SCHEDULE_MISSED_GRACE_SECONDS = 60  # atraso tolerado antes de considerar uma execução perdida
+SCHEDULER_MAX_SLEEP = 60  # revalida o relógio periodicamente (ajustes de hora, suspensão)
+CRON_FIELDS = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 6)]  # minuto, hora, dia, mês, dia da semana
+
+# Navegador de scripts
+DIRECTORY_REVALIDATE_SECONDS = 5  # intervalo mínimo entre verificações de mtime da mesma pasta
+INDEX_SKIP_DIRS = {"__pycache__", ".git", ".venv", "venv", "node_modules", os.path.basename(LOG_DIR)}
+SCRIPT_SEARCH_LIMIT = 50
+
+
+class OutputBuffer:
+    """Buffer circular de linhas de saída, alimentado pelas threads leitoras dos pipes"""
+    
+    def __init__(self, max_lines=OUTPUT_BUFFER_LINES):
+        self.lines = deque(maxlen=max_lines)
+        self.lock = threading.Lock()
+        self.total_lines = 0
+        self.total_bytes = 0
+        self.version = 0
+        self.log = None
+    
+    def attach_log(self, log):
+        """Passa a gravar as linhas também em um RunLog, começando pelas já recebidas"""
+        with self.lock:
+            for line in self.lines:
+                log.write_line(line)
+            self.log = log
+    
+    def append(self, line):
+        line = line.rstrip("\r\n")
+        with self.lock:
+            self.lines.append(line)
+            self.total_lines += 1
+            self.total_bytes += len(line) + 1
+            self.version += 1
+            if self.log is not None:
+                self.log.write_line(line)
+    
+    def clear(self):
+        with self.lock:
+            self.lines.clear()
+            self.total_lines = 0
+            self.version += 1
+    
+    def tail(self, count):
+        """Retorna as últimas `count` linhas e quantas linhas em memória ficaram de fora"""
+        with self.lock:
+            available = len(self.lines)
+            start = max(available - count, 0)
+            lines = [self.lines[i] for i in range(start, available)]
+            return lines, available - len(lines)
+    
+    def text(self):
+        with self.lock:
+            return "\n".join(self.lines)
+
+
+def pump_stream(stream, buffer, prefix=""):
+    """Lê um pipe até o fim, linha a linha, acrescentando ao buffer
+
+    Cada pipe tem sua própria thread: assim um pipe cheio nunca bloqueia a leitura do
+    outro (o que acontecia ao alternar readline entre stdout e stderr).
+    """
+    try:
+        for line in iter(stream.readline, ""):
+            buffer.append(prefix + line)
+    except (ValueError, OSError) as e:
+        buffer.append(f"Erro ao ler saída: {str(e)}")
+    finally:
+        try:
+            stream.close()
+        except OSError:
+            pass
+
+
+class RunLog:
+    """Log de uma execução, comprimido em blocos gzip independentes e indexado por linha
+
+    O arquivo de dados é uma sequência de membros gzip (legível com zcat); o arquivo
+    .idx guarda, para cada bloco, o offset, o tamanho e o intervalo de linhas. A leitura
+    usa mmap e descomprime só os blocos da página pedida. Enquanto a execução está em
+    andamento, as linhas do bloco ainda não gravado ficam em memória e também são lidas.
+    """
+    
+    def __init__(self, path, writable=False):
+        self.path = path
+        self.index_path = path + ".idx"
+        self.lock = threading.Lock()  # estado do gravador
+        self.read_lock = threading.Lock()  # mapeamento e cache de blocos
+        self.writable = writable
+        self.pending = []
+        self.pending_bytes = 0
+        self.flushed_lines = 0
+        self.offset = 0
+        self.data_file = None
+        self.index_file = None
+        self.index = []  # (offset, tamanho, primeira linha, qtd. de linhas)
+        self.index_first_lines = []
+        self.mapped = None
+        self.mapped_size = 0
+        self.block_cache = OrderedDict()
+        if writable:
+            self.data_file = open(path, "ab")
+            self.index_file = open(self.index_path, "ab")
+        else:
+            self._load_index()
+    
+    @classmethod
+    def create(cls, directory, name):
+        """Cria um log novo para gravação"""
+        os.makedirs(directory, exist_ok=True)
+        safe_name = re.sub(r"[^\w.-]+", "_", name)
+        return cls(os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}_{safe_name}.log.gz"), writable=True)
+    
+    @classmethod
+    def open(cls, path):
+        """Abre um log existente somente para leitura"""
+        return cls(path)
+    
+    @staticmethod
+    def cleanup(directory, max_age_days=LOG_RETENTION_DAYS):
+        """Remove logs mais antigos que o período de retenção"""
+        if not os.path.isdir(directory):
+            return
+        limit = time.time() - max_age_days * 86400
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file() and entry.stat().st_mtime < limit:
+                        os.remove(entry.path)
+                except OSError:
+                    pass
+    
+    @property
+    def line_count(self):
+        with self.lock:
+            return self.flushed_lines + len(self.pending)
+    
+    def write_line(self, line):
+        with self.lock:
+            self.pending.append(line)
+            self.pending_bytes += len(line) + 1
+            if len(self.pending) >= LOG_BLOCK_LINES or self.pending_bytes >= LOG_BLOCK_BYTES:
+                self._flush_block()
+    
+    def _flush_block(self):
+        if not self.pending or self.data_file is None:
+            return
+        data = gzip.compress(("\n".join(self.pending) + "\n").encode("utf-8", "replace"), compresslevel=6)
+        self.data_file.write(data)
+        self.data_file.flush()
+        record = (self.offset, len(data), self.flushed_lines, len(self.pending))
+        self.index_file.write(LOG_INDEX_RECORD.pack(*record))
+        self.index_file.flush()
+        self.index.append(record)
+        self.index_first_lines.append(record[2])
+        self.offset += len(data)
+        self.flushed_lines += len(self.pending)
+        self.pending = []
+        self.pending_bytes = 0
+    
+    def close(self):
+        """Grava o bloco pendente e fecha os arquivos de gravação"""
+        with self.lock:
+            self._flush_block()
+            for f in (self.data_file, self.index_file):
+                if f is not None:
+                    f.close()
+            self.data_file = None
+            self.index_file = None
+            self.writable = False
+    
+    def _load_index(self):
+        self.index = []
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "rb") as f:
+                data = f.read()
+            usable = len(data) - len(data) % LOG_INDEX_RECORD.size
+            self.index = [record for record in LOG_INDEX_RECORD.iter_unpack(data[:usable])]
+        self.index_first_lines = [record[2] for record in self.index]
+        if self.index:
+            last = self.index[-1]
+            self.flushed_lines = last[2] + last[3]
+            self.offset = last[0] + last[1]
+    
+    def _map(self, size_needed):
+        """Mapeia o arquivo de dados, remapeando se ele cresceu"""
+        if self.mapped is not None and self.mapped_size >= size_needed:
+            return self.mapped
+        if self.mapped is not None:
+            self.mapped.close()
+        with open(self.path, "rb") as f:
+            self.mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.mapped_size = len(self.mapped)
+        return self.mapped
+    
+    def _block_lines(self, block_number, record):
+        lines = self.block_cache.get(block_number)
+        if lines is not None:
+            self.block_cache.move_to_end(block_number)
+            return lines
+        offset, size, _, _ = record
+        mapped = self._map(offset + size)
+        lines = gzip.decompress(mapped[offset:offset + size]).decode("utf-8", "replace").split("\n")[:-1]
+        self.block_cache[block_number] = lines
+        if len(self.block_cache) > 8:
+            self.block_cache.popitem(last=False)
+        return lines
+    
+    def _snapshot(self):
+        """Copia o estado do gravador, para ler sem bloquear a gravação"""
+        with self.lock:
+            return list(self.index), list(self.index_first_lines), self.flushed_lines, list(self.pending)
+    
+    def read_lines(self, start, count):
+        """Lê `count` linhas a partir da linha `start` (base 0)"""
+        index, first_lines, flushed_lines, pending = self._snapshot()
+        result = []
+        line = max(start, 0)
+        end = line + count
+        with self.read_lock:
+            block_number = bisect.bisect_right(first_lines, line) - 1
+            while line < end and 0 <= block_number < len(index):
+                first_line = index[block_number][2]
+                chunk = self._block_lines(block_number, index[block_number])[line - first_line:end - first_line]
+                result.extend(chunk)
+                line += len(chunk)
+                block_number += 1
+        if line < end and line >= flushed_lines:
+            result.extend(pending[line - flushed_lines:end - flushed_lines])
+        return result
+    
+    def search(self, pattern, max_results=LOG_SEARCH_MAX_RESULTS, ignore_case=True):
+        """Busca por expressão regular; retorna (linha, [(início, fim), ...], texto) por linha encontrada"""
+        regex = re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+        index, _, flushed_lines, pending = self._snapshot()
+        results = []
+        sources = [(record[2], block_number) for block_number, record in enumerate(index)]
+        sources.append((flushed_lines, None))
+        for first_line, block_number in sources:
+            if block_number is None:
+                lines = pending
+            else:
+                with self.read_lock:
+                    lines = self._block_lines(block_number, index[block_number])
+            for i, text in enumerate(lines):
+                matches = [(m.start(), m.end()) for m in regex.finditer(text)]
+                if matches:
+                    results.append((first_line + i, matches, text))
+                    if len(results) >= max_results:
+                        return results
+        return results
+    
+    def release(self):
+        """Libera o mapeamento de memória (leitura)"""
+        with self.read_lock:
+            if self.mapped is not None:
+                self.mapped.close()
+                self.mapped = None
+                self.mapped_size = 0
+            self.block_cache.clear()
+
+
+class DirectoryCache:
+    """Cache de listagens de pastas (subpastas e scripts .py), invalidado pelo mtime
+
+    O mtime de uma pasta muda quando entradas são criadas, removidas ou renomeadas,
+    então uma listagem só é refeita quando a pasta mudou. Cada pasta é verificada no
+    máximo uma vez a cada DIRECTORY_REVALIDATE_SECONDS (ou imediatamente, se o
+    watcher avisar de alguma mudança), para não sobrecarregar pastas de rede.
+    """
+    
+    def __init__(self, revalidate_seconds=DIRECTORY_REVALIDATE_SECONDS):
+        self.revalidate_seconds = revalidate_seconds
+        self.lock = threading.Lock()
+        self.entries = {}  # pasta -> (mtime, verificado em, subpastas, scripts)
+        self.version = 0
+        self.observer = None
+    
+    def listing(self, path):
+        """Retorna (subpastas, scripts .py) da pasta, ordenados por nome"""
+        path = os.path.normpath(path)
+        now = time.time()
+        with self.lock:
+            cached = self.entries.get(path)
+        if cached and now - cached[1] < self.revalidate_seconds:
+            return cached[2], cached[3]
+        
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            self.invalidate(path)
+            return [], []
+        if cached and cached[0] == mtime:
+            with self.lock:
+                self.entries[path] = (mtime, now, cached[2], cached[3])
+            return cached[2], cached[3]
+        
+        directories, scripts = [], []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir():
+                            directories.append(entry.name)
+                        elif entry.name.endswith(".py") and entry.is_file():
+                            scripts.append(entry.name)
+                    except OSError:
+                        continue
+        except OSError:
+            return [], []
+        directories.sort(key=str.lower)
+        scripts.sort(key=str.lower)
+        with self.lock:
+            self.entries[path] = (mtime, now, directories, scripts)
+            self.version += 1
+        return directories, scripts
+    
+    def invalidate(self, path=None):
+        """Descarta uma pasta do cache (ou todo o cache)"""
+        with self.lock:
+            if path is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(os.path.normpath(path), None)
+            self.version += 1
+    
+    def expire(self):
+        """Força a verificação de mtime no próximo acesso, sem descartar as listagens"""
+        with self.lock:
+            self.entries = {path: (entry[0], 0, entry[2], entry[3]) for path, entry in self.entries.items()}
+    
+    def watch(self, root):
+        """Invalida o cache a partir de eventos do sistema de arquivos (requer watchdog)"""
+        if Observer is None or self.observer is not None:
+            return False
+        cache = self
+        
+        class InvalidateHandler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                for attr in ("src_path", "dest_path"):
+                    changed = getattr(event, attr, None)
+                    if changed:
+                        cache.invalidate(os.path.dirname(changed))
+                        if event.is_directory:
+                            cache.invalidate(changed)
+        
+        try:
+            self.observer = Observer()
+            self.observer.daemon = True
+            self.observer.schedule(InvalidateHandler(), root, recursive=True)
+            self.observer.start()
+            self.revalidate_seconds = 3600  # eventos do watcher substituem a verificação periódica
+        except OSError as e:
+            print(f"Erro ao observar a pasta {root}: {e}")
+            self.observer = None
+            return False
+        return True
+
+
+def _fuzzy_score(query, text):
+    """Pontua `text` se todos os caracteres de `query` aparecem em ordem; None caso contrário
+
+    Sequências contínuas, início de palavra/segmento e acertos no nome do arquivo valem mais.
+    """
+    text_lower = text.lower()
+    name_start = max(text_lower.rfind("/"), text_lower.rfind("\\")) + 1
+    score = 0
+    position = 0
+    previous = -2
+    for char in query:
+        found = text_lower.find(char, position)
+        if found < 0:
+            return None
+        score += 1
+        if found == previous + 1:
+            score += 5  # caracteres consecutivos
+        if found == 0 or text_lower[found - 1] in "/\\_-. ":
+            score += 3  # início de palavra ou segmento
+        if found >= name_start:
+            score += 2  # dentro do nome do arquivo
+        previous = found
+        position = found + 1
+    if query in text_lower[name_start:]:
+        score += 10 * len(query)
+    return score - len(text) * 0.01
+
+
+class ScriptIndex:
+    """Índice recursivo dos scripts .py sob uma pasta, com busca aproximada"""
+    
+    def __init__(self, cache, root):
+        self.cache = cache
+        self.root = os.path.normpath(root)
+        self.files = []  # caminhos relativos à raiz
+        self.built_version = -1
+        self.built_at = 0
+    
+    def refresh(self):
+        """Reconstrói o índice; pastas sem mudanças vêm do cache de listagens"""
+        if self.built_version == self.cache.version and time.time() - self.built_at < self.cache.revalidate_seconds:
+            return self.files
+        files = []
+        stack = [""]
+        while stack:
+            relative = stack.pop()
+            directories, scripts = self.cache.listing(os.path.join(self.root, relative))
+            files.extend(os.path.join(relative, name) for name in scripts)
+            stack.extend(
+                os.path.join(relative, name) for name in reversed(directories)
+                if name not in INDEX_SKIP_DIRS and not name.startswith(".")
+            )
+        self.files = files
+        self.built_version = self.cache.version
+        self.built_at = time.time()
+        return files
+    
+    def search(self, query, limit=SCRIPT_SEARCH_LIMIT):
+        """Retorna os caminhos relativos mais próximos da busca"""
+        query = query.strip().lower().replace("\\", "/")
+        if not query:
+            return []
+        scored = []
+        for relative in self.refresh():
+            score = _fuzzy_score(query, relative.replace("\\", "/"))
+            if score is not None:
+                scored.append((score, relative))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [relative for _, relative in scored[:limit]]
+
+
+def _percentile(sorted_values, percent):
+    """Percentil pelo método do posto mais próximo"""
+    if not sorted_values:
+        return None
+    rank = max(int(round(percent / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+class RunHistoryStore:
+    """Histórico de execuções em SQLite, com estatísticas por script"""
+    
+    COLUMNS = {
+        "script": "TEXT NOT NULL",
+        "name": "TEXT",
+        "started_at": "REAL",
+        "finished_at": "REAL",
+        "duration": "REAL",
+        "status": "TEXT",
+        "return_code": "INTEGER",
+        "peak_cpu_percent": "REAL",
+        "peak_memory_mb": "REAL",
+        "peak_uss_mb": "REAL",
+        "peak_pss_mb": "REAL",
+        "peak_threads": "INTEGER",
+        "peak_processes": "INTEGER",
+        "io_read_bytes": "INTEGER",
+        "io_write_bytes": "INTEGER",
+        "cpu_time": "REAL",
+        "output_lines": "INTEGER",
+        "output_bytes": "INTEGER",
+        "output_path": "TEXT",
+        "limits": "TEXT",
+        "limit_exceeded": "TEXT",
+        "trigger": "TEXT",
+    }
+    
+    def __init__(self, db_path=HISTORY_DB_FILE):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self._init_db()
+    
+    def _connect(self):
+        connection = sqlite3.connect(self.db_path, timeout=10)
+        connection.row_factory = sqlite3.Row
+        return connection
+    
+    def _init_db(self):
+        """Cria a tabela e acrescenta colunas novas em bancos existentes"""
+        with self.lock, self._connect() as connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS runs (id INTEGER PRIMARY KEY AUTOINCREMENT)")
+            existing = {row["name"] for row in connection.execute("PRAGMA table_info(runs)")}
+            for column, column_type in self.COLUMNS.items():
+                if column not in existing:
+                    connection.execute(f"ALTER TABLE runs ADD COLUMN {column} {column_type.replace(' NOT NULL', '')}")
+            connection.execute("CREATE INDEX IF NOT EXISTS idx_runs_script ON runs (script, started_at)")
+            connection.execute("CREATE INDEX IF NOT EXISTS idx_runs_started ON runs (started_at)")
+    
+    def record(self, **values):
+        """Grava uma execução concluída e retorna o id"""
+        values = {k: v for k, v in values.items() if k in self.COLUMNS}
+        columns = ", ".join(values)
+        placeholders = ", ".join("?" for _ in values)
+        with self.lock, self._connect() as connection:
+            cursor = connection.execute(f"INSERT INTO runs ({columns}) VALUES ({placeholders})", list(values.values()))
+            return cursor.lastrowid
+    
+    def recent(self, limit=50, script=None):
+        """Execuções mais recentes (de um script ou de todos)"""
+        query = "SELECT * FROM runs"
+        params = []
+        if script:
+            query += " WHERE script = ?"
+            params.append(script)
+        query += " ORDER BY started_at DESC LIMIT ?"
+        params.append(limit)
+        with self.lock, self._connect() as connection:
+            return [dict(row) for row in connection.execute(query, params)]
+    
+    def script_stats(self):
+        """Estatísticas por script: execuções, taxa de falhas, p50/p95 e tendência do tempo"""
+        with self.lock, self._connect() as connection:
+            totals = connection.execute(
+                "SELECT script, name, COUNT(*) AS runs, "
+                "SUM(CASE WHEN status = 'failed' THEN 1 ELSE 0 END) AS failures, "
+                "MAX(started_at) AS last_run, MAX(peak_memory_mb) AS peak_memory_mb, "
+                "MAX(peak_processes) AS peak_processes FROM runs GROUP BY script ORDER BY last_run DESC"
+            ).fetchall()
+            stats = []
+            for total in totals:
+                durations = [
+                    row["duration"] for row in connection.execute(
+                        "SELECT duration FROM runs WHERE script = ? AND status = 'succeeded' "
+                        "ORDER BY started_at DESC LIMIT ?",
+                        (total["script"], STATS_SAMPLE_SIZE),
+                    )
+                ]
+                stats.append({
+                    "script": total["script"],
+                    "name": total["name"],
+                    "runs": total["runs"],
+                    "failures": total["failures"],
+                    "failure_rate": total["failures"] / total["runs"] * 100 if total["runs"] else 0,
+                    "last_run": total["last_run"],
+                    "peak_memory_mb": total["peak_memory_mb"],
+                    "peak_processes": total["peak_processes"],
+                    "p50": _percentile(sorted(durations), 50),
+                    "p95": _percentile(sorted(durations), 95),
+                    "trend": self._trend(durations),
+                })
+            return stats
+    
+    def _trend(self, durations):
+        """Variação (%) da mediana das execuções recentes em relação às anteriores"""
+        recent = sorted(durations[:TREND_WINDOW])
+        previous = sorted(durations[TREND_WINDOW:TREND_WINDOW * 2])
+        if len(recent) < 3 or len(previous) < 3:
+            return None
+        baseline = _percentile(previous, 50)
+        if not baseline:
+            return None
+        return (_percentile(recent, 50) - baseline) / baseline * 100
+
+
+class ExecutionLimits:
+    """Limites de recursos de uma execução no modo restrito
+
+    Em POSIX os limites de CPU, memória (RLIMIT_AS) e arquivos abertos são aplicados
+    com setrlimit por um interpretador intermediário (LIMITS_SHIM) antes do exec do
+    script, junto com nice e, se disponível, a inclusão em um cgroup v2 com memory.max
+    valendo para toda a árvore de processos. No Windows não há setrlimit: memória, CPU e tempo
+    são verificados pelo monitoramento e o processo é encerrado ao exceder.
+    """
+    
+    def __init__(self, cpu_seconds=None, memory_mb=None, open_files=None, wall_seconds=None,
+                 nice=10, idle_io=True, use_cgroup=False, minimal_env=False):
+        self.cpu_seconds = cpu_seconds
+        self.memory_mb = memory_mb
+        self.open_files = open_files
+        self.wall_seconds = wall_seconds
+        self.nice = nice
+        self.idle_io = idle_io
+        self.use_cgroup = use_cgroup
+        self.minimal_env = minimal_env
+    
+    def to_dict(self):
+        return {key: value for key, value in vars(self).items() if value not in (None, False)}
+    
+    def describe(self):
+        parts = []
+        if self.cpu_seconds:
+            parts.append(f"CPU {self.cpu_seconds}s")
+        if self.memory_mb:
+            parts.append(f"memória {self.memory_mb} MB")
+        if self.open_files:
+            parts.append(f"{self.open_files} arquivos")
+        if self.wall_seconds:
+            parts.append(f"tempo máx. {self.wall_seconds}s")
+        if self.nice:
+            parts.append(f"nice {self.nice}")
+        if self.idle_io:
+            parts.append("E/S ociosa")
+        if self.use_cgroup:
+            parts.append("cgroup v2")
+        if self.minimal_env:
+            parts.append("ambiente mínimo")
+        return ", ".join(parts) or "sem limites"
+    
+    def build_env(self, env):
+        """Ambiente do processo filho (completo ou apenas as variáveis essenciais)"""
+        env = dict(env if env is not None else os.environ)
+        if self.minimal_env:
+            env = {key: env[key] for key in MINIMAL_ENV_KEYS if key in env}
+        return env
+    
+    def create_cgroup(self, job_id):
+        """Cria um cgroup v2 para o job; retorna o caminho ou None se indisponível"""
+        if not self.use_cgroup or not os.path.exists(os.path.join(CGROUP_ROOT, "cgroup.controllers")):
+            return None
+        group = os.path.join(CGROUP_ROOT, CGROUP_GROUP)
+        path = os.path.join(group, f"job-{job_id}-{os.getpid()}")
+        try:
+            os.makedirs(group, exist_ok=True)
+            if self.memory_mb:
+                # O controlador precisa estar habilitado em cada nível acima do cgroup do job
+                for parent in (CGROUP_ROOT, group):
+                    with open(os.path.join(parent, "cgroup.subtree_control"), "w") as f:
+                        f.write("+memory")
+            os.mkdir(path)
+        except OSError:
+            return None
+        try:
+            if self.memory_mb:
+                with open(os.path.join(path, "memory.max"), "w") as f:
+                    f.write(str(int(self.memory_mb * 1024 * 1024)))
+            return path
+        except OSError:
+            self.remove_cgroup(path)
+            return None
+    
+    def rlimits(self):
+        """Limites do setrlimit como (nome do recurso, soft, hard)"""
+        limits = []
+        if self.cpu_seconds:
+            limits.append(("RLIMIT_CPU", int(self.cpu_seconds), int(self.cpu_seconds) + 5))
+        if self.memory_mb:
+            limit = int(self.memory_mb * 1024 * 1024)
+            limits.append(("RLIMIT_AS", limit, limit))
+        if self.open_files:
+            limits.append(("RLIMIT_NOFILE", int(self.open_files), int(self.open_files)))
+        return limits
+    
+    def wrap_command(self, command, cgroup_path=None):
+        """Prefixa o comando com o LIMITS_SHIM (POSIX); no Windows retorna o comando inalterado"""
+        if resource is None:
+            return command
+        config = {"rlimits": self.rlimits(), "nice": int(self.nice or 0), "cgroup": cgroup_path}
+        return [sys.executable, "-c", LIMITS_SHIM, json.dumps(config)] + list(command)
+    
+    def apply_to_current_process(self, cgroup_path=None):
+        """Aplica os limites no próprio processo (filho do servidor de fork, sem outras threads)"""
+        if resource is None:
+            return
+        if cgroup_path:
+            try:
+                with open(os.path.join(cgroup_path, "cgroup.procs"), "w") as f:
+                    f.write(str(os.getpid()))
+            except OSError:
+                pass
+        for name, soft, hard in self.rlimits():
+            resource.setrlimit(getattr(resource, name), (soft, hard))
+        if self.nice:
+            os.nice(int(self.nice))
+    
+    def apply_after_start(self, pid):
+        """Prioridades que não podem ser aplicadas antes do exec nesta plataforma"""
+        try:
+            process = psutil.Process(pid)
+            if self.nice and resource is None and hasattr(psutil, "BELOW_NORMAL_PRIORITY_CLASS"):
+                process.nice(psutil.BELOW_NORMAL_PRIORITY_CLASS)
+            if self.idle_io and hasattr(process, "ionice"):
+                if hasattr(psutil, "IOPRIO_CLASS_IDLE"):
+                    process.ionice(psutil.IOPRIO_CLASS_IDLE)
+                elif hasattr(psutil, "IOPRIO_VERYLOW"):
+                    process.ionice(psutil.IOPRIO_VERYLOW)
+        except (psutil.Error, OSError, ValueError):
+            pass
+    
+    def exceeded(self, job):
+        """Verifica os limites acompanhados pelo monitoramento; retorna o motivo ou None"""
+        if self.wall_seconds and job.duration > self.wall_seconds:
+            return "wall"
+        if resource is None:
+            if self.memory_mb and job.memory_mb > self.memory_mb:
+                return "memory"
+            if self.cpu_seconds and job.cpu_time > self.cpu_seconds:
+                return "cpu"
+        return None
+    
+    @staticmethod
+    def remove_cgroup(path):
+        if path:
+            try:
+                os.rmdir(path)
+            except OSError:
+                pass
+
+
+def _recv_exact(connection, size):
+    data = b""
+    while len(data) < size:
+        chunk = connection.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("conexão encerrada")
+        data += chunk
+    return data
+
+
+def _run_forked_script(request):
+    """Executa o script no processo filho do servidor de fork; nunca retorna"""
+    code = 0
+    try:
+        os.chdir(request["cwd"])
+        os.environ.clear()
+        os.environ.update(request["env"])
+        if request.get("limits"):
+            ExecutionLimits(**request["limits"]).apply_to_current_process(request.get("cgroup"))
+        sys.argv = [request["script"]]
+        sys.path[0] = os.path.dirname(request["script"])
+        runpy.run_path(request["script"], run_name="__main__")
+    except SystemExit as e:
+        if isinstance(e.code, int):
+            code = e.code
+        elif e.code is not None:
+            print(e.code, file=sys.stderr)
+            code = 1
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    finally:
+        for stream in (sys.stdout, sys.stderr):
+            try:
+                stream.flush()
+            except (OSError, ValueError):
+                pass
+    os._exit(code)
+
+
+def run_fork_server(socket_path, preload=WARM_PRELOAD_MODULES):
+    """Servidor de fork: importa os módulos pesados uma vez e cria um filho por execução
+
+    Cada requisição chega por um socket Unix com os descritores de stdout/stderr
+    (send_fds). O servidor responde com o PID do filho e, quando ele termina, com o
+    código de saída. O loop é de thread única, para que o fork seja seguro.
+    """
+    for name in preload:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+    
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    os.chmod(socket_path, 0o600)
+    server.listen(32)
+    
+    wakeup_read, wakeup_write = os.pipe()
+    os.set_blocking(wakeup_read, False)
+    os.set_blocking(wakeup_write, False)
+    signal.set_wakeup_fd(wakeup_write)
+    signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+    
+    selector = selectors.DefaultSelector()
+    selector.register(server, selectors.EVENT_READ, "accept")
+    selector.register(wakeup_read, selectors.EVENT_READ, "child")
+    children = {}  # pid -> conexão do cliente
+    parent_pid = os.getppid()
+    print("ready", flush=True)
+    
+    while os.getppid() == parent_pid:  # encerra junto com o painel
+        for key, _ in selector.select(timeout=1):
+            if key.data == "child":
+                try:
+                    os.read(wakeup_read, 512)
+                except BlockingIOError:
+                    pass
+                continue
+            
+            connection, _ = server.accept()
+            fds = []
+            try:
+                header, fds, _, _ = socket.recv_fds(connection, WARM_HEADER.size, 2)
+                if len(fds) != 2:
+                    raise ValueError("descritores de saída ausentes")
+                header += _recv_exact(connection, WARM_HEADER.size - len(header))
+                (size,) = WARM_HEADER.unpack(header)
+                request = json.loads(_recv_exact(connection, size))
+            except (OSError, ConnectionError, ValueError, struct.error):
+                for fd in fds:
+                    os.close(fd)
+                connection.close()
+                continue
+            
+            pid = os.fork()
+            if pid == 0:
+                # Filho: restaura sinais, larga o estado do servidor e assume os pipes do cliente
+                signal.set_wakeup_fd(-1)
+                signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                selector.close()
+                server.close()
+                connection.close()
+                os.close(wakeup_read)
+                os.close(wakeup_write)
+                devnull = os.open(os.devnull, os.O_RDONLY)
+                os.dup2(devnull, 0)
+                os.dup2(fds[0], 1)
+                os.dup2(fds[1], 2)
+                for fd in (devnull, *fds):
+                    os.close(fd)
+                sys.stdout = open(1, "w", buffering=1, encoding="utf-8", errors="replace", closefd=False)
+                sys.stderr = open(2, "w", buffering=1, encoding="utf-8", errors="replace", closefd=False)
+                _run_forked_script(request)
+            
+            for fd in fds:
+                os.close(fd)
+            children[pid] = connection
+            try:
+                connection.sendall((json.dumps({"pid": pid}) + "\n").encode())
+            except OSError:
+                pass
+        
+        # Recolhe os filhos encerrados e informa o código de saída
+        while children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            connection = children.pop(pid, None)
+            if connection is not None:
+                try:
+                    connection.sendall((json.dumps({"exit": os.waitstatus_to_exitcode(status)}) + "\n").encode())
+                except OSError:
+                    pass
+                connection.close()
+    
+    server.close()
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+
+class WarmProcess:
+    """Processo criado pelo servidor de fork, com a mesma interface usada do Popen"""
+    
+    def __init__(self, connection, pid, stdout, stderr):
+        self.pid = pid
+        self.stdout = stdout
+        self.stderr = stderr
+        self.returncode = None
+        self.connection = connection
+        self.exited = threading.Event()
+        threading.Thread(target=self._wait_exit, daemon=True).start()
+    
+    def _wait_exit(self):
+        try:
+            with self.connection.makefile("r") as replies:
+                for line in replies:
+                    message = json.loads(line)
+                    if "exit" in message:
+                        self.returncode = message["exit"]
+                        break
+        except (OSError, ValueError):
+            pass
+        finally:
+            if self.returncode is None:
+                self.returncode = -signal.SIGKILL  # servidor encerrado antes de informar a saída
+            self.connection.close()
+            self.exited.set()
+    
+    def poll(self):
+        return self.returncode
+    
+    def wait(self, timeout=None):
+        if not self.exited.wait(timeout):
+            raise subprocess.TimeoutExpired(f"pid {self.pid}", timeout)
+        return self.returncode
+    
+    def send_signal(self, signum):
+        if self.returncode is None:
+            try:
+                os.kill(self.pid, signum)
+            except ProcessLookupError:
+                pass
+    
+    def terminate(self):
+        self.send_signal(signal.SIGTERM)
+    
+    def kill(self):
+        self.send_signal(signal.SIGKILL)
+
+
+class WarmWorkerPool:
+    """Cliente do servidor de fork com interpretador pré-carregado (somente POSIX)"""
+    
+    def __init__(self, preload=WARM_PRELOAD_MODULES):
+        self.preload = preload
+        self.socket_dir = None  # diretório privado (0700) criado ao iniciar o servidor
+        self.socket_path = None
+        self.server = None
+        self.lock = threading.Lock()
+    
+    @staticmethod
+    def is_supported():
+        return hasattr(os, "fork") and hasattr(socket, "send_fds")
+    
+    def start(self):
+        """Inicia o servidor (se necessário) e aguarda os módulos serem importados"""
+        with self.lock:
+            if self.server is not None and self.server.poll() is None:
+                return
+            # Só o dono do diretório alcança o socket, sem janela entre o bind e o chmod
+            if self.socket_dir is None:
+                self.socket_dir = tempfile.mkdtemp(prefix="ogs-panel-forkserver-")
+                self.socket_path = os.path.join(self.socket_dir, "server.sock")
+                atexit.register(self.stop)
+            self.server = subprocess.Popen(
+                ["python", os.path.abspath(__file__), "--fork-server", self.socket_path,
+                 "--preload", ",".join(self.preload)],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                stdin=subprocess.DEVNULL,
+                text=True,
+            )
+            ready = threading.Event()
+            threading.Thread(
+                target=lambda: self.server.stdout.readline().strip() == "ready" and ready.set(),
+                daemon=True,
+            ).start()
+            if not ready.wait(WARM_SERVER_START_TIMEOUT):
+                self.server.kill()
+                self.server = None
+                raise RuntimeError("servidor de fork não respondeu")
+    
+    def spawn(self, script_path, cwd, env=None, limits=None, cgroup_path=None):
+        """Executa o script em um filho do servidor e retorna um WarmProcess"""
+        self.start()
+        stdout_read, stdout_write = os.pipe()
+        stderr_read, stderr_write = os.pipe()
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            connection.connect(self.socket_path)
+            payload = json.dumps({
+                "script": os.path.abspath(script_path),
+                "cwd": cwd,
+                "env": dict(env if env is not None else os.environ),
+                "limits": limits.to_dict() if limits is not None else None,
+                "cgroup": cgroup_path,
+            }).encode()
+            socket.send_fds(connection, [WARM_HEADER.pack(len(payload))], [stdout_write, stderr_write])
+            connection.sendall(payload)
+            reply = b""
+            while not reply.endswith(b"\n"):
+                chunk = connection.recv(1)
+                if not chunk:
+                    raise ConnectionError("servidor de fork encerrou a conexão")
+                reply += chunk
+            pid = json.loads(reply)["pid"]
+        except BaseException:
+            connection.close()
+            os.close(stdout_read)
+            os.close(stderr_read)
+            raise
+        finally:
+            os.close(stdout_write)
+            os.close(stderr_write)
+        
+        stdout = open(stdout_read, "r", encoding="utf-8", errors="replace")
+        stderr = open(stderr_read, "r", encoding="utf-8", errors="replace")
+        return WarmProcess(connection, pid, stdout, stderr)
+    
+    def stop(self):
+        with self.lock:
+            if self.server is not None and self.server.poll() is None:
+                self.server.terminate()
+            self.server = None
+            if self.socket_dir is not None:
+                shutil.rmtree(self.socket_dir, ignore_errors=True)
+            self.socket_dir = None
+            self.socket_path = None
+
+
+def run_startup_benchmark(runs=10, preload=WARM_PRELOAD_MODULES):
+    """Compara a latência de execução com interpretador novo e com o servidor de fork"""
+    script = os.path.join(tempfile.mkdtemp(prefix="ogs-bench-"), "bench_script.py")
+    with open(script, "w", encoding="utf-8") as f:
+        f.write("".join(f"import {name}\n" for name in preload) + "print('ok')\n")
+    
+    def summarize(samples):
+        samples = sorted(samples)
+        return sum(samples) / len(samples), _percentile(samples, 50), _percentile(samples, 95)
+    
+    cold = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(["python", script], cwd=os.path.dirname(script), capture_output=True, check=False)
+        cold.append(time.perf_counter() - start)
+    
+    pool = WarmWorkerPool(preload)
+    start = time.perf_counter()
+    pool.start()
+    server_start = time.perf_counter() - start
+    warm = []
+    try:
+        for _ in range(runs):
+            start = time.perf_counter()
+            process = pool.spawn(script, os.path.dirname(script))
+            process.stdout.read()
+            process.stderr.read()
+            process.wait()
+            process.stdout.close()
+            process.stderr.close()
+            warm.append(time.perf_counter() - start)
+    finally:
+        pool.stop()
+        shutil.rmtree(os.path.dirname(script), ignore_errors=True)
+    
+    cold_mean, cold_p50, cold_p95 = summarize(cold)
+    warm_mean, warm_p50, warm_p95 = summarize(warm)
+    print(f"Script de teste: importa {', '.join(preload)} ({runs} execuções)")
+    print(f"{'':<22}{'média':>10}{'p50':>10}{'p95':>10}")
+    print(f"{'Interpretador novo':<22}{cold_mean * 1000:>8.0f}ms{cold_p50 * 1000:>8.0f}ms{cold_p95 * 1000:>8.0f}ms")
+    print(f"{'Servidor de fork':<22}{warm_mean * 1000:>8.0f}ms{warm_p50 * 1000:>8.0f}ms{warm_p95 * 1000:>8.0f}ms")
+    print(f"Economia média por execução: {(cold_mean - warm_mean) * 1000:.0f}ms "
+          f"({(1 - warm_mean / cold_mean) * 100:.0f}%); início do servidor: {server_start * 1000:.0f}ms")
+    return {"cold": cold, "warm": warm, "server_start": server_start}
+
+
+class ProcessTreeSampler:
+    """Amostra um processo e todos os seus descendentes em uma única passada
+
+    Os objetos psutil.Process são reaproveitados entre amostras (necessário para o
+    cálculo de CPU). USS/PSS são lidos quando o sistema permite; E/S de processos que
+    já terminaram continua contando pelo último valor lido.
+    """
+    
+    def __init__(self, pid):
+        self.root_pid = pid
+        self.processes = {}
+        self.io_totals = {}  # pid -> (bytes lidos, bytes gravados)
+        self.cpu_times = {}  # pid -> tempo de CPU (usuário + sistema)
+        self.full_memory = True
+        self.last_io = None
+        self.last_time = None
+    
+    def _tree(self):
+        root = self.processes.get(self.root_pid) or psutil.Process(self.root_pid)
+        return [root] + root.children(recursive=True)
+    
+    def sample(self):
+        """Retorna os totais da árvore, ou None se o processo principal terminou"""
+        try:
+            tree = self._tree()
+        except psutil.Error:
+            return None
+        
+        cpu_percent = rss = uss = pss = 0.0
+        threads = count = 0
+        alive = set()
+        for proc in tree:
+            cached = self.processes.get(proc.pid)
+            first_sample = cached is None
+            if first_sample:
+                cached = self.processes[proc.pid] = proc
+            try:
+                with cached.oneshot():
+                    percent = cached.cpu_percent(interval=None)
+                    if not first_sample:
+                        cpu_percent += percent
+                    memory = None
+                    if self.full_memory:
+                        try:
+                            memory = cached.memory_full_info()
+                            uss += memory.uss
+                            pss += getattr(memory, "pss", 0)
+                        except (psutil.AccessDenied, AttributeError, NotImplementedError):
+                            self.full_memory = False
+                    if memory is None:
+                        memory = cached.memory_info()
+                    rss += memory.rss
+                    threads += cached.num_threads()
+                    times = cached.cpu_times()
+                    self.cpu_times[proc.pid] = times.user + times.system
+                    try:
+                        io = cached.io_counters()
+                        self.io_totals[proc.pid] = (io.read_bytes, io.write_bytes)
+                    except (psutil.AccessDenied, AttributeError, NotImplementedError):
+                        pass
+                alive.add(proc.pid)
+                count += 1
+            except psutil.Error:
+                continue
+        
+        for pid in [pid for pid in self.processes if pid not in alive]:
+            del self.processes[pid]
+        
+        now = time.time()
+        read_bytes = sum(read for read, _ in self.io_totals.values())
+        write_bytes = sum(write for _, write in self.io_totals.values())
+        io_rate = 0.0
+        if self.last_io is not None:
+            io_rate = max(read_bytes + write_bytes - self.last_io, 0) / max(now - self.last_time, 0.001)
+        self.last_io = read_bytes + write_bytes
+        self.last_time = now
+        
+        megabyte = 1024 * 1024
+        return {
+            "timestamp": now,
+            "cpu_percent": cpu_percent,
+            "rss_mb": rss / megabyte,
+            "uss_mb": uss / megabyte,
+            "pss_mb": pss / megabyte,
+            "threads": threads,
+            "processes": count,
+            "read_bytes": read_bytes,
+            "write_bytes": write_bytes,
+            "io_rate": io_rate,
+            "cpu_time": sum(self.cpu_times.values()),
+        }
+    
+    def signal_descendants(self, kill=False):
+        """Encerra os processos filhos (o principal é encerrado pelo chamador)"""
+        try:
+            children = self._tree()[1:]
+        except psutil.Error:
+            return
+        for child in children:
+            try:
+                child.kill() if kill else child.terminate()
+            except psutil.Error:
+                pass
+
+
+class Job:
+    """Uma execução de script: estado, saída e uso de recursos"""
+    
+    _ids = itertools.count(1)
+    
+    def __init__(self, script_path, name=None, priority=JOB_PRIORITIES["Normal"], env=None, limits=None, warm=False,
+                 trigger="manual", schedule_id=None):
+        self.id = next(Job._ids)
+        self.trigger = trigger
+        self.schedule_id = schedule_id
+        self.script_path = script_path
+        self.name = name or os.path.basename(script_path)
+        self.priority = priority
+        self.env = env
+        self.status = "queued"
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.return_code = None
+        self.process = None
+        self.cancel_requested = False
+        self.output = OutputBuffer()
+        self.log = None
+        self.limits = limits
+        self.limit_exceeded = None
+        self.warm = warm
+        # Uso de recursos somado sobre a árvore de processos (script e descendentes)
+        self.sampler = None
+        self.samples = deque(maxlen=JOB_SAMPLES_LIMIT)
+        self.cpu_percent = 0.0
+        self.memory_mb = 0.0
+        self.uss_mb = 0.0
+        self.pss_mb = 0.0
+        self.threads = 0
+        self.process_count = 0
+        self.io_rate = 0.0
+        self.io_read_bytes = 0
+        self.io_write_bytes = 0
+        self.cpu_time = 0.0
+        self.peak_cpu_percent = 0.0
+        self.peak_memory_mb = 0.0
+        self.peak_uss_mb = 0.0
+        self.peak_pss_mb = 0.0
+        self.peak_threads = 0
+        self.peak_processes = 0
+    
+    def record_sample(self, sample):
+        """Atualiza os valores atuais e os picos a partir de uma amostra da árvore"""
+        self.samples.append(sample)
+        self.cpu_percent = sample["cpu_percent"]
+        self.memory_mb = sample["rss_mb"]
+        self.uss_mb = sample["uss_mb"]
+        self.pss_mb = sample["pss_mb"]
+        self.threads = sample["threads"]
+        self.process_count = sample["processes"]
+        self.io_rate = sample["io_rate"]
+        self.io_read_bytes = sample["read_bytes"]
+        self.io_write_bytes = sample["write_bytes"]
+        self.cpu_time = sample["cpu_time"]
+        self.peak_cpu_percent = max(self.peak_cpu_percent, self.cpu_percent)
+        self.peak_memory_mb = max(self.peak_memory_mb, self.memory_mb)
+        self.peak_uss_mb = max(self.peak_uss_mb, self.uss_mb)
+        self.peak_pss_mb = max(self.peak_pss_mb, self.pss_mb)
+        self.peak_threads = max(self.peak_threads, self.threads)
+        self.peak_processes = max(self.peak_processes, self.process_count)
+    
+    @property
+    def is_active(self):
+        return self.status in ("queued", "running")
+    
+    @property
+    def duration(self):
+        if self.started_at is None:
+            return 0
+        return (self.finished_at or time.time()) - self.started_at
+
+
+class JobManager:
+    """Fila de execuções com prioridade, atendida por um grupo de workers
+
+    Cada worker executa um job por vez; a mesma thread aguarda o processo e amostra
+    CPU/memória enquanto espera, então um job em execução ocupa apenas o worker e as
+    duas threads leitoras dos pipes.
+    """
+    
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, on_finish=None):
+        self.queue = queue.PriorityQueue()
+        self.sequence = itertools.count()
+        self.jobs = OrderedDict()
+        self.lock = threading.Lock()
+        self.max_workers = max_workers
+        self.worker_count = 0
+        self.on_finish = on_finish
+        self.version = 0  # incrementado a cada mudança de estado, para a interface
+        self.warm_pool = WarmWorkerPool() if WarmWorkerPool.is_supported() else None
+        self.sample_interval = JOB_MONITOR_INTERVAL
+    
+    def submit(self, script_path, name=None, priority=JOB_PRIORITIES["Normal"], env=None, limits=None, warm=False,
+               trigger="manual", schedule_id=None):
+        """Enfileira a execução de um script e retorna o job"""
+        job = Job(
+            script_path, name=name, priority=priority, env=env, limits=limits, warm=warm,
+            trigger=trigger, schedule_id=schedule_id,
+        )
+        with self.lock:
+            self.jobs[job.id] = job
+            self._trim_finished()
+            self.version += 1
+        self.queue.put((priority, next(self.sequence), job))
+        self._ensure_workers()
+        return job
+    
+    def cancel(self, job_id):
+        """Remove um job da fila ou encerra o processo em execução"""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None or not job.is_active:
+                return False
+            job.cancel_requested = True
+            if job.status == "queued":
+                job.status = "cancelled"
+                job.finished_at = time.time()
+            self.version += 1
+        if job.process and job.process.poll() is None:
+            try:
+                if job.sampler is not None:
+                    job.sampler.signal_descendants(kill=False)
+                job.process.terminate()
+            except OSError:
+                pass
+        return True
+    
+    def set_sample_interval(self, interval):
+        """Altera o intervalo de amostragem de recursos das execuções"""
+        self.sample_interval = max(float(interval), 0.1)
+    
+    def set_max_workers(self, max_workers):
+        """Altera a quantidade de execuções simultâneas"""
+        with self.lock:
+            self.max_workers = max(1, min(int(max_workers), MAX_WORKERS_LIMIT))
+        self._ensure_workers()
+    
+    def list_jobs(self):
+        """Retorna os jobs, mais recentes primeiro"""
+        with self.lock:
+            return list(reversed(self.jobs.values()))
+    
+    def get_job(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+    
+    def counts(self):
+        with self.lock:
+            counts = {status: 0 for status in JOB_STATUS_LABELS}
+            for job in self.jobs.values():
+                counts[job.status] += 1
+            return counts
+    
+    def has_active_jobs(self):
+        with self.lock:
+            return any(job.is_active for job in self.jobs.values())
+    
+    def _trim_finished(self):
+        finished = [job_id for job_id, job in self.jobs.items() if not job.is_active]
+        for job_id in finished[:max(len(finished) - FINISHED_JOBS_LIMIT, 0)]:
+            del self.jobs[job_id]
+    
+    def _touch(self):
+        with self.lock:
+            self.version += 1
+    
+    def _ensure_workers(self):
+        with self.lock:
+            missing = min(self.max_workers - self.worker_count, self.queue.qsize())
+            self.worker_count += max(missing, 0)
+        for _ in range(max(missing, 0)):
+            threading.Thread(target=self._worker_loop, daemon=True).start()
+    
+    def _worker_loop(self):
+        while True:
+            try:
+                _, _, job = self.queue.get(timeout=5)
+            except queue.Empty:
+                job = None
+            
+            # Encerra o worker ocioso ou excedente (após reduzir max_workers)
+            with self.lock:
+                if self.worker_count > self.max_workers:
+                    self.worker_count -= 1
+                    if job is not None:
+                        self.queue.put((job.priority, next(self.sequence), job))
+                    return
+                if job is None:
+                    # submit() pode ter enfileirado depois do timeout sem criar worker,
+                    # pois este ainda era contado; nesse caso ele continua atendendo
+                    if self.queue.qsize():
+                        continue
+                    self.worker_count -= 1
+                    return
+            
+            self._execute(job)
+    
+    def _execute(self, job):
+        """Executa o job no worker atual, amostrando recursos até o término"""
+        with self.lock:
+            # Verifica e altera o status juntos: cancel() pode ter sido chamado após sair da fila
+            if job.status != "queued":
+                return
+            job.status = "running"
+            job.started_at = time.time()
+            self.version += 1
+        
+        # A saída completa também vai para disco (a memória guarda só as últimas linhas)
+        try:
+            job.log = RunLog.create(LOG_DIR, f"{job.id}_{job.name}")
+            job.output.attach_log(job.log)
+        except OSError as e:
+            print(f"Erro ao criar log da execução {job.id}: {e}")
+        job.output.append("Iniciando execução...")
+        
+        limits = job.limits
+        cgroup_path = None
+        command = ["python", job.script_path]
+        env = job.env
+        if limits is not None:
+            cgroup_path = limits.create_cgroup(job.id)
+            command = limits.wrap_command(command, cgroup_path)
+            env = limits.build_env(job.env)
+            cgroup_note = "" if not limits.use_cgroup else (" (cgroup v2 ativo)" if cgroup_path else " (cgroup v2 indisponível)")
+            job.output.append(f"Modo restrito: {limits.describe()}{cgroup_note}")
+        
+        if job.warm and self.warm_pool is not None:
+            try:
+                job.process = self.warm_pool.spawn(
+                    job.script_path,
+                    os.path.dirname(job.script_path),
+                    env=env,
+                    limits=limits,
+                    cgroup_path=cgroup_path,
+                )
+                job.output.append("Executando no interpretador pré-carregado")
+            except (OSError, RuntimeError, ConnectionError, ValueError) as e:
+                job.output.append(f"Interpretador pré-carregado indisponível ({e}); usando um novo processo")
+        
+        try:
+            if job.process is None:
+                job.process = subprocess.Popen(
+                    command,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    cwd=os.path.dirname(job.script_path),  # pasta do script como diretório de trabalho
+                    text=True,
+                    bufsize=1,
+                    universal_newlines=True,
+                    errors="replace",
+                    env=env,
+                )
+        except (OSError, subprocess.SubprocessError) as e:
+            job.output.append(f"Erro ao iniciar o programa: {str(e)}")
+            ExecutionLimits.remove_cgroup(cgroup_path)
+            self._finish(job, None)
+            return
+        
+        # Cancelado enquanto o processo era criado (cancel() ainda não tinha o que encerrar)
+        if job.cancel_requested:
+            try:
+                job.process.terminate()
+            except OSError:
+                pass
+        
+        if limits is not None:
+            limits.apply_after_start(job.process.pid)
+        
+        # Uma thread por pipe drena a saída para o buffer do job
+        readers = [
+            threading.Thread(target=pump_stream, args=(job.process.stdout, job.output), daemon=True),
+            threading.Thread(target=pump_stream, args=(job.process.stderr, job.output, "ERRO: "), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+        
+        job.sampler = ProcessTreeSampler(job.process.pid)
+        job.sampler.sample()  # inicia a medição de CPU
+        
+        kill_deadline = None
+        while True:
+            try:
+                job.process.wait(timeout=self.sample_interval)
+                break
+            except subprocess.TimeoutExpired:
+                pass
+            sample = job.sampler.sample()
+            if sample is not None:
+                job.record_sample(sample)
+            
+            # Limites verificados pelo monitoramento (tempo máximo e, sem setrlimit, CPU/memória)
+            if limits is not None and kill_deadline is None:
+                reason = limits.exceeded(job)
+                if reason:
+                    job.limit_exceeded = reason
+                    job.output.append(f"Limite excedido ({LIMIT_REASONS[reason]}): encerrando o processo")
+                    job.sampler.signal_descendants(kill=False)
+                    job.process.terminate()
+                    kill_deadline = time.time() + LIMIT_KILL_GRACE_SECONDS
+            elif kill_deadline is not None and time.time() > kill_deadline:
+                job.sampler.signal_descendants(kill=True)
+                job.process.kill()
+            self._touch()
+        
+        for reader in readers:
+            reader.join(timeout=5)
+        
+        if limits is not None:
+            ExecutionLimits.remove_cgroup(cgroup_path)
+            if job.limit_exceeded is None:
+                job.limit_exceeded = self._detect_rlimit_kill(job)
+        self._finish(job, job.process.returncode)
+    
+    def _detect_rlimit_kill(self, job):
+        """Identifica encerramentos causados pelos limites aplicados com setrlimit"""
+        return_code = job.process.returncode
+        if return_code == 0 or job.cancel_requested:
+            return None
+        if hasattr(signal, "SIGXCPU") and return_code in (-signal.SIGXCPU, -signal.SIGKILL) and job.limits.cpu_seconds:
+            return "cpu"
+        if job.limits.memory_mb:
+            lines, _ = job.output.tail(20)
+            if any("MemoryError" in line or "Cannot allocate memory" in line for line in lines):
+                return "memory"
+        return None
+    
+    def _finish(self, job, return_code):
+        if job.log is not None:
+            try:
+                job.log.close()
+            except OSError as e:
+                print(f"Erro ao fechar log da execução {job.id}: {e}")
+        with self.lock:
+            job.return_code = return_code
+            job.finished_at = time.time()
+            if job.cancel_requested:
+                job.status = "cancelled"
+            else:
+                job.status = "succeeded" if return_code == 0 else "failed"
+            job.process = None
+            self.version += 1
+        if self.on_finish:
+            try:
+                self.on_finish(job)
+            except Exception as e:
+                print(f"Erro ao finalizar execução {job.id}: {e}")
+
 
 class Module:
     def __init__(self):
         self.page = None
-        self.process = None
-        self.is_running = False
+        self.job_manager = JobManager(on_finish=self._handle_job_finished)
+        self.scheduler = JobScheduler(ScheduleStore(), self.job_manager, self._submit_scheduled)
+        self.scheduler.start()
+        self.schedules_dialog = None
+        self.rendered_schedules_version = -1
+        self.viewed_job = None
+        self.rendered_jobs_version = -1
         self.selected_module = None
         self.modules_list = []
         self.current_directory = None
         self.base_directory = None
-        self.process_start_time = None
+        self.history_store = RunHistoryStore()
+        self.directory_cache = DirectoryCache()
+        self.execution_limits = ExecutionLimits(cpu_seconds=600, memory_mb=1024, open_files=256, wall_seconds=3600)
+        self.script_index = None
+        self.log_viewer = None
+        RunLog.cleanup(LOG_DIR)
         self.execution_history = []
         self.max_history_items = 10
         self.output_text = None
         self.output_container = None
-        self.process_monitor_thread = None
-        self.should_monitor = False
+        self.output_visible_lines = OUTPUT_VISIBLE_LINES
+        self.rendered_output_version = -1
+        self.rendered_chart_key = None
+        self.resource_chart = None
+        self.ui_refresh_thread = None
         self.folder_browser = None
         self.breadcrumb_row = None
         self.current_path_parts = []
@@ -44,11 +1662,8 @@ class Module:
         self.current_directory = self.base_directory
         
         # Find all directories in the modules folder
-        directories = []
-        for item in os.listdir(self.base_directory):
-            full_path = os.path.join(self.base_directory, item)
-            if os.path.isdir(full_path):
-                directories.append(item)
+        directories, _ = self.directory_cache.listing(self.base_directory)
+        directories = list(directories)
         
         # Add the current directory as an option
         directories.insert(0, ".")
@@ -71,281 +1686,869 @@ class Module:
                 self.current_directory = directory if os.path.isabs(directory) else os.path.join(self.base_directory, directory)
     
         # Look for Python files in the current directory
-        module_files = glob.glob(os.path.join(self.current_directory, "*.py"))
+        _, module_files = self.directory_cache.listing(self.current_directory)
     
         # Filter out this module itself if we're in the base directory
         if self.current_directory == self.base_directory:
-            module_files = [f for f in module_files if os.path.basename(f) != os.path.basename(__file__)]
+            module_files = [f for f in module_files if f != os.path.basename(__file__)]
     
-        # Convert to module names for display
-        self.modules_list = [os.path.basename(f) for f in module_files]
+        self.modules_list = list(module_files)
     
         return self.modules_list
     
-    def _run_program(self):
-        try:
-            script_path = ""
-            
-            # If a specific module is selected, use that
-            if self.selected_module:
-                script_path = os.path.join(self.current_directory, self.selected_module)
-            else:
-                # Use the original path for backward compatibility
-                script_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "main-4iNxk42ZPyHPY4N4tvkHUpN76v5uXm.py")
-            
-            if not os.path.exists(script_path):
-                if self.page:
-                    self.status_text.value = f"Erro: Arquivo {script_path} não encontrado"
-                    self.status_text.color = ft.Colors.RED
-                    self.page.update()
-                return
-            
-            # Get working directory - use the directory of the script
-            working_directory = os.path.dirname(script_path)
-            
-            # Verifica se é o módulo pacs.py e ajusta o caminho das imagens
-            if self.selected_module and "pacs.py" in self.selected_module:
-                # Define variáveis de ambiente para o caminho das imagens
-                os.environ["PACS_ASSETS_PATH"] = os.path.abspath(os.path.join(os.path.dirname(script_path), "assets"))
-                
-                # Exibe informação sobre o caminho dos assets
-                if self.page and self.output_text:
-                    self.output_text.value += f"Configurando caminho de assets para: {os.environ['PACS_ASSETS_PATH']}\n"
-                    self.page.update()
-
-            # Executa o programa em um processo separado, usando a pasta do script como diretório de trabalho
-            self.process = subprocess.Popen(
-                ["python", script_path], 
-                stdout=subprocess.PIPE, 
-                stderr=subprocess.PIPE,
-                cwd=working_directory,  # Set working directory to the script's directory
-                text=True,
-                bufsize=1,
-                universal_newlines=True,
-                env=os.environ  # Passa as variáveis de ambiente para o processo filho
+    def _selected_script_path(self):
+        """Caminho do script selecionado (ou do programa externo padrão)"""
+        if self.selected_module:
+            return os.path.join(self.current_directory, self.selected_module)
+        # Use the original path for backward compatibility
+        return os.path.join(os.path.dirname(os.path.dirname(__file__)), "main-4iNxk42ZPyHPY4N4tvkHUpN76v5uXm.py")
+    
+    def _submit_script(self, script_path, schedule=None):
+        """Enfileira a execução de um script com a prioridade selecionada (ou a do agendamento)"""
+        env = dict(os.environ)  # Passa as variáveis de ambiente para o processo filho
+        
+        # Verifica se é o módulo pacs.py e ajusta o caminho das imagens
+        if os.path.basename(script_path) == "pacs.py":
+            env["PACS_ASSETS_PATH"] = os.path.abspath(os.path.join(os.path.dirname(script_path), "assets"))
+        
+        if schedule is not None:
+            job = self.job_manager.submit(
+                script_path,
+                name=schedule.name,
+                priority=schedule.priority,
+                env=env,
+                limits=self.execution_limits if schedule.restricted else None,
+                trigger="schedule",
+                schedule_id=schedule.id,
             )
+        else:
+            job = self.job_manager.submit(
+                script_path,
+                name=os.path.relpath(script_path, self.base_directory),
+                priority=JOB_PRIORITIES.get(self.priority_dropdown.value, JOB_PRIORITIES["Normal"]),
+                env=env,
+                limits=self.execution_limits if self.sandbox_checkbox.value else None,
+                warm=bool(self.warm_checkbox.value),
+            )
+        if "PACS_ASSETS_PATH" in env:
+            job.output.append(f"Configurando caminho de assets para: {env['PACS_ASSETS_PATH']}")
+        return job
+    
+    def _submit_scheduled(self, schedule):
+        """Chamado pelo agendador quando um agendamento vence"""
+        if not os.path.exists(schedule.script):
+            raise FileNotFoundError(f"Arquivo {schedule.script} não encontrado")
+        job = self._submit_script(schedule.script, schedule=schedule)
+        job.output.append(f"Execução agendada: {schedule.describe()}")
+        return job
+    
+    def _handle_job_finished(self, job):
+        """Registra o job concluído no histórico e informa o resultado"""
+        self._add_to_history(job)
+        
+        if not self.page or not self.ui_refresh_thread:
+            return
+        if job.status == "succeeded":
+            self.status_text.value = f"{job.name} concluído com sucesso (tempo: {self._format_time(job.duration)})"
+            self.status_text.color = ft.Colors.GREEN
+        elif job.status == "cancelled":
+            self.status_text.value = f"{job.name} interrompido"
+            self.status_text.color = ft.Colors.ORANGE
+        else:
+            self.status_text.value = f"Erro ao executar {job.name} (código: {job.return_code})"
+            self.status_text.color = ft.Colors.RED
+        self.page.update(self.status_text)
+    
+    def _start_ui_refresh(self):
+        """Inicia a thread que aplica saída e estado dos jobs na interface em intervalos fixos"""
+        if self.ui_refresh_thread is None or not self.ui_refresh_thread.is_alive():
+            self.ui_refresh_thread = threading.Thread(target=self._ui_refresh_loop, daemon=True)
+            self.ui_refresh_thread.start()
+    
+    def _ui_refresh_loop(self):
+        """Agrupa as mudanças e atualiza a interface no máximo a cada OUTPUT_FLUSH_INTERVAL"""
+        current_thread = threading.current_thread()
+        while self.page and self.ui_refresh_thread is current_thread:
+            time.sleep(OUTPUT_FLUSH_INTERVAL)
+            try:
+                self._flush_output()
+                self._update_jobs_display()
+                self._refresh_log_viewer()
+                self._refresh_schedules_dialog()
+            except Exception as e:
+                print(f"Erro ao atualizar execuções: {e}")
+    
+    def _flush_output(self, force=False):
+        """Exibe as últimas linhas da saída do job selecionado, se houver novidades"""
+        if not self.page or not self.output_text or self.viewed_job is None:
+            return
+        buffer = self.viewed_job.output
+        if not force and self.rendered_output_version == buffer.version:
+            return
+        self.rendered_output_version = buffer.version
+        lines, hidden = buffer.tail(self.output_visible_lines)
+        self.output_text.value = "\n".join(lines)
+        self.load_more_button.visible = hidden > 0
+        self.load_more_button.text = f"Carregar mais ({hidden} linhas anteriores)"
+        self.page.update(self.output_text, self.load_more_button)
+    
+    def _handle_load_more(self, e):
+        """Aumenta a quantidade de linhas exibidas"""
+        self.output_visible_lines += OUTPUT_VISIBLE_LINES
+        self._flush_output(force=True)
+    
+    def _view_job(self, job):
+        """Exibe a saída de um job na área de saída"""
+        self.viewed_job = job
+        self.output_visible_lines = OUTPUT_VISIBLE_LINES
+        self.output_title.value = f"Saída: {job.name} (#{job.id})"
+        self.output_container.visible = True
+        self.rendered_jobs_version = -1
+        self._flush_output(force=True)
+        self.page.update()
+    
+    def _update_jobs_display(self, force=False):
+        """Reconstrói a lista de execuções quando o estado dos jobs muda"""
+        if not hasattr(self, 'jobs_list') or not self.page:
+            return
+        version = self.job_manager.version
+        if not force and version == self.rendered_jobs_version:
+            return
+        self.rendered_jobs_version = version
+        
+        status_icons = {
+            "queued": (ft.Icons.SCHEDULE, ft.Colors.GREY),
+            "running": (ft.Icons.PLAY_CIRCLE, ft.Colors.BLUE),
+            "succeeded": (ft.Icons.CHECK_CIRCLE, ft.Colors.GREEN),
+            "failed": (ft.Icons.ERROR, ft.Colors.RED),
+            "cancelled": (ft.Icons.CANCEL, ft.Colors.ORANGE),
+        }
+        priority_names = {value: name for name, value in JOB_PRIORITIES.items()}
+        
+        controls = []
+        for job in self.job_manager.list_jobs():
+            icon, color = status_icons[job.status]
+            details = [JOB_STATUS_LABELS[job.status], f"Prioridade: {priority_names.get(job.priority, job.priority)}"]
+            if job.started_at:
+                details.append(f"Tempo: {self._format_time(job.duration)}")
+            if job.status == "running":
+                details.append(f"CPU: {job.cpu_percent:.1f}% | Memória: {job.memory_mb:.1f} MB")
+                details.append(f"Processos: {job.process_count} | Threads: {job.threads}")
+            elif job.peak_memory_mb:
+                details.append(f"Pico: CPU {job.peak_cpu_percent:.1f}% | {job.peak_memory_mb:.1f} MB")
+                details.append(f"Pico: {job.peak_processes} processos | {job.peak_threads} threads")
+            if job.io_read_bytes or job.io_write_bytes:
+                details.append(
+                    f"E/S: {self._format_bytes(job.io_read_bytes)} lidos | "
+                    f"{self._format_bytes(job.io_write_bytes)} gravados"
+                )
+            if job.limit_exceeded:
+                details.append(f"Limite excedido: {LIMIT_REASONS[job.limit_exceeded]}")
+            elif job.limits is not None:
+                details.append("Modo restrito")
             
-            self.process_start_time = time.time()
-            self.is_running = True
-            
-            # Start process monitoring
-            self.should_monitor = True
-            self.process_monitor_thread = threading.Thread(target=self._monitor_process, daemon=True)
-            self.process_monitor_thread.start()
-            
-            if self.page:
-                relative_path = os.path.relpath(script_path, self.base_directory)
-                self.status_text.value = f"Executando: {relative_path}..."
-                self.status_text.color = ft.Colors.GREEN
-                self.run_button.text = "Parar Programa"
-                self.run_button.icon = ft.Icons.STOP
-                self.output_text.value = "Iniciando execução...\n"
-                self.output_container.visible = True
-                self.page.update()
-            
-            # Read output in real-time
-            def read_output():
-                while self.is_running and self.process:
-                    try:
-                        # Read stdout line by line
-                        stdout_line = self.process.stdout.readline()
-                        if stdout_line:
-                            if self.page and self.output_text:
-                                self.output_text.value += f"{stdout_line}"
-                                self.page.update()
-                        
-                        # Read stderr line by line
-                        stderr_line = self.process.stderr.readline()
-                        if stderr_line:
-                            if self.page and self.output_text:
-                                self.output_text.value += f"ERRO: {stderr_line}"
-                                self.page.update()
-                        
-                        # If both are empty and process is not running, break
-                        if not stdout_line and not stderr_line and self.process.poll() is not None:
-                            break
-                            
-                    except Exception as e:
-                        if self.page and self.output_text:
-                            self.output_text.value += f"Erro ao ler saída: {str(e)}\n"
-                            self.page.update()
-                        break
-            
-            # Start reading output in a separate thread
-            output_thread = threading.Thread(target=read_output, daemon=True)
-            output_thread.start()
-            
-            # Aguarda o término do processo
-            self.process.wait()
-            
-            # Calculate execution time
-            execution_time = time.time() - self.process_start_time
-            
-            # Add to history
-            self._add_to_history(script_path, self.process.returncode, execution_time)
-            
-            if self.process.returncode == 0:
-                if self.page:
-                    self.status_text.value = f"Programa concluído com sucesso (tempo: {self._format_time(execution_time)})"
-                    self.status_text.color = ft.Colors.GREEN
-            else:
-                if self.page:
-                    self.status_text.value = f"Erro ao executar o programa (código: {self.process.returncode})"
-                    self.status_text.color = ft.Colors.RED
-            
-            self.is_running = False
-            self.should_monitor = False
-            
-            if self.page:
-                self.run_button.text = "Executar Programa"
-                self.run_button.icon = ft.Icons.PLAY_ARROW
-                self.page.update()
-                
-        except Exception as e:
-            if self.page:
-                self.status_text.value = f"Erro: {str(e)}"
-                self.status_text.color = ft.Colors.RED
-                self.run_button.text = "Executar Programa"
-                self.run_button.icon = ft.Icons.PLAY_ARROW
-                self.is_running = False
-                self.should_monitor = False
-                self.page.update()
+            controls.append(
+                ft.Container(
+                    content=ft.Row([
+                        ft.Icon(icon, color=color, size=18),
+                        ft.Column([
+                            ft.Text(f"#{job.id} {job.name}", weight=ft.FontWeight.BOLD, size=13),
+                            ft.Text(" | ".join(details), size=12, color=ft.Colors.GREY_700),
+                        ], spacing=0, expand=True),
+                        ft.IconButton(
+                            icon=ft.Icons.TERMINAL,
+                            tooltip="Ver saída",
+                            icon_size=18,
+                            on_click=lambda e, j=job: self._view_job(j),
+                        ),
+                        ft.IconButton(
+                            icon=ft.Icons.DESCRIPTION,
+                            tooltip="Ver log completo",
+                            icon_size=18,
+                            visible=job.log is not None,
+                            on_click=lambda e, j=job: self._show_log_viewer(j.log, j.name, live_job=j),
+                        ),
+                        ft.IconButton(
+                            icon=ft.Icons.STOP,
+                            tooltip="Cancelar",
+                            icon_size=18,
+                            icon_color=ft.Colors.RED,
+                            visible=job.is_active,
+                            on_click=lambda e, j=job: self.job_manager.cancel(j.id),
+                        ),
+                    ]),
+                    padding=5,
+                    border_radius=5,
+                    bgcolor=ft.Colors.BLUE_100 if job is self.viewed_job else None,
+                )
+            )
+        
+        if not controls:
+            controls.append(ft.Text("Nenhuma execução na fila", italic=True, color=ft.Colors.GREY_500))
+        self.jobs_list.controls = controls
+        
+        counts = self.job_manager.counts()
+        self.jobs_summary_text.value = (
+            f"{counts['running']} executando | {counts['queued']} na fila | "
+            f"{counts['succeeded']} concluídos | {counts['failed']} com erro"
+        )
+        
+        # Uso de recursos do job exibido
+        job = self.viewed_job
+        if job is not None and job.status == "running":
+            memory = f"Memória: {job.memory_mb:.1f} MB"
+            if job.uss_mb:
+                memory += f" (USS {job.uss_mb:.1f} MB"
+                memory += f", PSS {job.pss_mb:.1f} MB)" if job.pss_mb else ")"
+            self.resource_text.value = (
+                f"Tempo: {self._format_time(job.duration)} | "
+                f"CPU: {job.cpu_percent:.1f}% | {memory} | "
+                f"E/S: {self._format_bytes(job.io_rate)}/s"
+            )
+        else:
+            self.resource_text.value = ""
+        self._update_resource_chart()
+        self.page.update(self.jobs_list, self.jobs_summary_text, self.resource_text, self.resource_chart)
+    
+    def _update_resource_chart(self):
+        """Redesenha o gráfico de CPU/memória do job exibido quando há novas amostras"""
+        if self.resource_chart is None:
+            return
+        job = self.viewed_job
+        samples = list(job.samples) if job is not None else []
+        key = (job.id if job is not None else None, len(samples), samples[-1]["timestamp"] if samples else None)
+        if key == self.rendered_chart_key:
+            return
+        self.rendered_chart_key = key
+        
+        self.resource_chart.visible = len(samples) > 1
+        if not self.resource_chart.visible:
+            return
+        start = samples[0]["timestamp"]
+        self.resource_chart.data_series[0].data_points = [
+            ft.LineChartDataPoint(x=sample["timestamp"] - start, y=sample["cpu_percent"]) for sample in samples
+        ]
+        self.resource_chart.data_series[1].data_points = [
+            ft.LineChartDataPoint(x=sample["timestamp"] - start, y=sample["rss_mb"]) for sample in samples
+        ]
+        peak = max(max(sample["cpu_percent"], sample["rss_mb"]) for sample in samples)
+        self.resource_chart.max_y = max(peak * 1.1, 10)
+        self.resource_chart.max_x = max(samples[-1]["timestamp"] - start, 1)
+    
+    def _format_bytes(self, value):
+        """Formata uma quantidade de bytes em unidade legível"""
+        for unit in ("B", "KB", "MB", "GB"):
+            if value < 1024:
+                return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+            value /= 1024
+        return f"{value:.1f} TB"
+    
+    def _format_time(self, seconds):
+        """Format time in seconds to a readable string"""
+        minutes, seconds = divmod(int(seconds), 60)
+        hours, minutes = divmod(minutes, 60)
+        
+        if hours > 0:
+            return f"{hours}h {minutes}m {seconds}s"
+        elif minutes > 0:
+            return f"{minutes}m {seconds}s"
+        else:
+            return f"{seconds}s"
     
-    def _monitor_process(self):
-        """Monitor process resource usage"""
+    def _add_to_history(self, job):
+        """Grava a execução no histórico persistente"""
         try:
-            if not self.process or not self.is_running:
-                return
-                
-            process = psutil.Process(self.process.pid)
+            self.history_store.record(
+                script=os.path.abspath(job.script_path),
+                name=job.name,
+                started_at=job.started_at,
+                finished_at=job.finished_at,
+                duration=job.duration,
+                status=job.status,
+                return_code=job.return_code,
+                peak_cpu_percent=job.peak_cpu_percent,
+                peak_memory_mb=job.peak_memory_mb,
+                peak_uss_mb=job.peak_uss_mb,
+                peak_pss_mb=job.peak_pss_mb,
+                peak_threads=job.peak_threads,
+                peak_processes=job.peak_processes,
+                io_read_bytes=job.io_read_bytes,
+                io_write_bytes=job.io_write_bytes,
+                cpu_time=job.cpu_time,
+                output_lines=job.output.total_lines,
+                output_bytes=job.output.total_bytes,
+                output_path=job.log.path if job.log else None,
+                limits=json.dumps(job.limits.to_dict()) if job.limits else None,
+                limit_exceeded=job.limit_exceeded,
+                trigger=job.trigger,
+            )
+        except sqlite3.Error as e:
+            print(f"Erro ao gravar histórico de execução: {e}")
+        
+        # Update history display if available
+        if self.page and self.ui_refresh_thread and hasattr(self, 'history_list'):
+            self._update_history_display()
+    
+    def _load_history(self):
+        """Carrega as execuções mais recentes do histórico persistente"""
+        try:
+            runs = self.history_store.recent(self.max_history_items)
+        except sqlite3.Error as e:
+            print(f"Erro ao ler histórico de execução: {e}")
+            runs = []
+        
+        self.execution_history = [
+            {
+                "path": run["name"],
+                "timestamp": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(run["started_at"] or 0)),
+                "status": "Sucesso" if run["status"] == "succeeded" else (
+                    "Cancelado" if run["status"] == "cancelled" else (
+                        f"Limite excedido: {LIMIT_REASONS.get(run['limit_exceeded'], run['limit_exceeded'])}"
+                        if run["limit_exceeded"] else f"Erro (código {run['return_code']})"
+                    )
+                ),
+                "execution_time": run["duration"] or 0,
+                "output_path": run["output_path"],
+                "trigger": run["trigger"] or "manual",
+            }
+            for run in runs
+        ]
+    
+    def _update_history_display(self):
+        """Update the history display with current execution history"""
+        if not hasattr(self, 'history_list'):
+            return
+        
+        self._load_history()
+        self.history_list.controls.clear()
+        
+        for item in self.execution_history:
+            status_color = ft.Colors.GREEN if item["status"] == "Sucesso" else ft.Colors.RED
+            
+            history_item = ft.Container(
+                content=ft.Column([
+                    ft.Row([
+                        ft.Icon(
+                            name=ft.Icons.CHECK_CIRCLE if item["status"] == "Sucesso" else ft.Icons.ERROR,
+                            color=status_color,
+                            size=16
+                        ),
+                        ft.Text(
+                            item["path"],
+                            weight=ft.FontWeight.BOLD,
+                            size=14,
+                            expand=True,
+                        ),
+                        ft.IconButton(
+                            icon=ft.Icons.DESCRIPTION,
+                            tooltip="Ver log completo",
+                            icon_size=16,
+                            visible=bool(item["output_path"]) and os.path.exists(item["output_path"]),
+                            on_click=lambda e, path=item["output_path"]: self._show_log_viewer(RunLog.open(path), path),
+                        ),
+                    ]),
+                    ft.Row([
+                        ft.Icon(
+                            ft.Icons.SCHEDULE,
+                            size=14,
+                            color=ft.Colors.GREY_700,
+                            tooltip="Execução agendada",
+                            visible=item["trigger"] == "schedule",
+                        ),
+                        ft.Text(
+                            f"{item['timestamp']} | {item['status']} | Tempo: {self._format_time(item['execution_time'])}",
+                            size=12,
+                            color=ft.Colors.GREY_700,
+                        ),
+                    ]),
+                ]),
+                padding=10,
+                margin=ft.margin.only(bottom=5),
+                border_radius=5,
+                bgcolor=ft.Colors.BLUE_50,
+                border=ft.border.all(1, ft.Colors.BLUE_200),
+            )
             
-            while self.should_monitor and self.is_running and self.process:
+            self.history_list.controls.append(history_item)
+        
+        if not self.execution_history:
+            self.history_list.controls.append(
+                ft.Text("Nenhuma execução registrada", italic=True, color=ft.Colors.GREY_500)
+            )
+        
+        self.page.update()
+    
+    def _show_log_viewer(self, log, title, live_job=None):
+        """Abre o visualizador paginado do log completo de uma execução"""
+        viewer = {
+            "log": log,
+            "live_job": live_job,
+            "start": 0,
+            "follow": live_job is not None and live_job.is_active,
+            "rendered_count": -1,
+        }
+        
+        def close_viewer(e):
+            self.log_viewer = None
+            if live_job is None:
+                log.release()
+            viewer_dialog.open = False
+            self.page.update()
+        
+        def go_to(start):
+            viewer["start"] = max(0, min(start, max(log.line_count - LOG_VIEWER_PAGE_LINES, 0)))
+            self._render_log_viewer()
+            self.page.update()
+        
+        def toggle_follow(e):
+            viewer["follow"] = e.control.value
+            if viewer["follow"]:
+                go_to(log.line_count)
+        
+        def run_search(e):
+            pattern = search_field.value.strip()
+            viewer["results"].controls.clear()
+            if pattern:
                 try:
-                    # Get CPU and memory usage
-                    cpu_percent = process.cpu_percent(interval=1)
-                    memory_info = process.memory_info()
-                    memory_mb = memory_info.rss / (1024 * 1024)  # Convert to MB
-                    
-                    # Update resource usage display
-                    if self.page and hasattr(self, 'resource_text'):
-                        execution_time = time.time() - self.process_start_time
-                        self.resource_text.value = (
-                            f"Tempo: {self._format_time(execution_time)} | "
-                            f"CPU: {cpu_percent:.1f}% | "
-                            f"Memória: {memory_mb:.1f} MB"
+                    matches = log.search(pattern)
+                except re.error as ex:
+                    viewer["results"].controls.append(ft.Text(f"Expressão inválida: {ex}", color=ft.Colors.RED))
+                    matches = None
+                if matches is not None:
+                    suffix = "+" if len(matches) >= LOG_SEARCH_MAX_RESULTS else ""
+                    viewer["results"].controls.append(
+                        ft.Text(f"{len(matches)}{suffix} linhas encontradas", size=12, color=ft.Colors.GREY_700)
+                    )
+                    for line_number, spans, text in matches:
+                        start, end = spans[0]
+                        preview = text[max(start - 40, 0):end + 60]
+                        viewer["results"].controls.append(
+                            ft.TextButton(
+                                text=f"{line_number + 1}:{start + 1}  {preview}",
+                                tooltip=f"Linha {line_number + 1}, colunas " + ", ".join(f"{a + 1}-{b}" for a, b in spans),
+                                on_click=lambda e, n=line_number: go_to(n - LOG_VIEWER_PAGE_LINES // 2),
+                            )
                         )
-                        self.page.update()
-                    
-                    time.sleep(1)  # Update every second
-                except:
-                    # Process might have ended
-                    break
-        except:
-            # Process monitoring failed
-            pass
+            viewer["follow"] = False
+            follow_checkbox.value = False
+            self.page.update()
+        
+        search_field = ft.TextField(label="Buscar (expressão regular)", on_submit=run_search, expand=True)
+        follow_checkbox = ft.Checkbox(label="Acompanhar", value=viewer["follow"], on_change=toggle_follow,
+                                      visible=live_job is not None)
+        viewer["text"] = ft.Text("", size=12, color=ft.Colors.GREEN, selectable=True, font_family="monospace")
+        viewer["position"] = ft.Text("", size=12, color=ft.Colors.GREY_700)
+        viewer["results"] = ft.Column(scroll=ft.ScrollMode.AUTO, height=120, spacing=0)
+        
+        viewer_dialog = ft.AlertDialog(
+            title=ft.Text(f"Log: {os.path.basename(title)}"),
+            content=ft.Column(
+                [
+                    ft.Row([
+                        search_field,
+                        ft.IconButton(icon=ft.Icons.SEARCH, tooltip="Buscar", on_click=run_search),
+                    ]),
+                    viewer["results"],
+                    ft.Row([
+                        ft.IconButton(icon=ft.Icons.FIRST_PAGE, tooltip="Início", on_click=lambda e: go_to(0)),
+                        ft.IconButton(icon=ft.Icons.NAVIGATE_BEFORE, tooltip="Página anterior",
+                                      on_click=lambda e: go_to(viewer["start"] - LOG_VIEWER_PAGE_LINES)),
+                        ft.IconButton(icon=ft.Icons.NAVIGATE_NEXT, tooltip="Próxima página",
+                                      on_click=lambda e: go_to(viewer["start"] + LOG_VIEWER_PAGE_LINES)),
+                        ft.IconButton(icon=ft.Icons.LAST_PAGE, tooltip="Fim", on_click=lambda e: go_to(log.line_count)),
+                        viewer["position"],
+                        follow_checkbox,
+                    ]),
+                    ft.Container(
+                        content=ft.Column([viewer["text"]], scroll=ft.ScrollMode.AUTO),
+                        bgcolor=ft.Colors.BLACK,
+                        border_radius=5,
+                        padding=10,
+                        height=350,
+                    ),
+                ],
+                width=900,
+            ),
+            actions=[ft.TextButton("Fechar", on_click=close_viewer)],
+            on_dismiss=lambda e: setattr(self, "log_viewer", None),
+        )
+        
+        self.log_viewer = viewer
+        if viewer["follow"]:
+            viewer["start"] = max(log.line_count - LOG_VIEWER_PAGE_LINES, 0)
+        self._render_log_viewer()
+        self.page.dialog = viewer_dialog
+        viewer_dialog.open = True
+        self.page.update()
+    
+    def _render_log_viewer(self):
+        """Lê do disco apenas a página visível do log"""
+        viewer = self.log_viewer
+        log = viewer["log"]
+        total = log.line_count
+        lines = log.read_lines(viewer["start"], LOG_VIEWER_PAGE_LINES)
+        viewer["text"].value = "\n".join(lines)
+        viewer["position"].value = (
+            f"Linhas {viewer['start'] + 1 if lines else 0}-{viewer['start'] + len(lines)} de {total}"
+        )
+        viewer["rendered_count"] = total
+    
+    def _refresh_log_viewer(self):
+        """Acompanha o final do log enquanto a execução estiver em andamento"""
+        viewer = self.log_viewer
+        if not viewer or not viewer["follow"] or not self.page:
+            return
+        total = viewer["log"].line_count
+        if total == viewer["rendered_count"]:
+            return
+        viewer["start"] = max(total - LOG_VIEWER_PAGE_LINES, 0)
+        self._render_log_viewer()
+        self.page.update(viewer["text"], viewer["position"])
+    
+    def _handle_show_stats(self, e):
+        """Exibe as estatísticas de tempo de execução por script"""
+        try:
+            stats = self.history_store.script_stats()
+        except sqlite3.Error as ex:
+            stats = []
+            print(f"Erro ao ler estatísticas: {ex}")
+        
+        def format_duration(value):
+            return "-" if value is None else f"{value:.1f}s"
+        
+        def trend_cell(trend):
+            if trend is None:
+                return ft.Text("-")
+            color = ft.Colors.RED if trend > 10 else ft.Colors.GREEN if trend < -10 else ft.Colors.GREY_700
+            icon = ft.Icons.TRENDING_UP if trend > 0 else ft.Icons.TRENDING_DOWN
+            return ft.Row([ft.Icon(icon, color=color, size=16), ft.Text(f"{trend:+.0f}%", color=color)], spacing=2)
+        
+        rows = [
+            ft.DataRow(cells=[
+                ft.DataCell(ft.Text(item["name"], tooltip=item["script"])),
+                ft.DataCell(ft.Text(str(item["runs"]))),
+                ft.DataCell(ft.Text(
+                    f"{item['failure_rate']:.0f}%",
+                    color=ft.Colors.RED if item["failures"] else None,
+                )),
+                ft.DataCell(ft.Text(format_duration(item["p50"]))),
+                ft.DataCell(ft.Text(format_duration(item["p95"]))),
+                ft.DataCell(trend_cell(item["trend"])),
+                ft.DataCell(ft.Text(
+                    "-" if item["peak_memory_mb"] is None else f"{item['peak_memory_mb']:.0f} MB",
+                    tooltip=f"Máximo de {item['peak_processes'] or 1} processos simultâneos",
+                )),
+                ft.DataCell(ft.Text(time.strftime("%d/%m %H:%M", time.localtime(item["last_run"] or 0)))),
+            ])
+            for item in stats
+        ]
+        
+        content = ft.Column(
+            [
+                ft.DataTable(
+                    columns=[
+                        ft.DataColumn(ft.Text("Script")),
+                        ft.DataColumn(ft.Text("Execuções"), numeric=True),
+                        ft.DataColumn(ft.Text("Falhas"), numeric=True),
+                        ft.DataColumn(ft.Text("p50"), numeric=True),
+                        ft.DataColumn(ft.Text("p95"), numeric=True),
+                        ft.DataColumn(ft.Text("Tendência")),
+                        ft.DataColumn(ft.Text("Pico memória"), numeric=True),
+                        ft.DataColumn(ft.Text("Última")),
+                    ],
+                    rows=rows,
+                ) if rows else ft.Text("Nenhuma execução registrada", italic=True, color=ft.Colors.GREY_500),
+                ft.Text(
+                    f"p50/p95 e tendência consideram as últimas {STATS_SAMPLE_SIZE} execuções com sucesso; "
+                    f"a tendência compara a mediana das {TREND_WINDOW} mais recentes com as {TREND_WINDOW} anteriores.",
+                    size=12,
+                    color=ft.Colors.GREY_700,
+                ),
+            ],
+            scroll=ft.ScrollMode.AUTO,
+            height=450,
+            width=850,
+        )
+        
+        stats_dialog = ft.AlertDialog(
+            title=ft.Text("Estatísticas de execução"),
+            content=content,
+            actions=[ft.TextButton("Fechar", on_click=lambda e: self._close_dialog(stats_dialog))],
+        )
+        self.page.dialog = stats_dialog
+        stats_dialog.open = True
+        self.page.update()
+    
+    def _handle_run_button(self, e):
+        """Enfileira o script selecionado"""
+        script_path = self._selected_script_path()
+        if not os.path.exists(script_path):
+            self.status_text.value = f"Erro: Arquivo {script_path} não encontrado"
+            self.status_text.color = ft.Colors.RED
+            self.page.update()
+            return
+        
+        job = self._submit_script(script_path)
+        self.status_text.value = f"{job.name} adicionado à fila"
+        self.status_text.color = ft.Colors.GREEN
+        self._view_job(job)
     
-    def _format_time(self, seconds):
-        """Format time in seconds to a readable string"""
-        minutes, seconds = divmod(int(seconds), 60)
-        hours, minutes = divmod(minutes, 60)
+    def _handle_run_all_button(self, e):
+        """Enfileira todos os scripts da pasta atual"""
+        if not self.modules_list:
+            self.status_text.value = "Nenhum módulo encontrado na pasta atual"
+            self.status_text.color = ft.Colors.ORANGE
+            self.page.update()
+            return
         
-        if hours > 0:
-            return f"{hours}h {minutes}m {seconds}s"
-        elif minutes > 0:
-            return f"{minutes}m {seconds}s"
-        else:
-            return f"{seconds}s"
+        for module in self.modules_list:
+            self._submit_script(os.path.join(self.current_directory, module))
+        self.status_text.value = f"{len(self.modules_list)} scripts adicionados à fila"
+        self.status_text.color = ft.Colors.GREEN
+        self._update_jobs_display(force=True)
     
-    def _add_to_history(self, script_path, return_code, execution_time):
-        """Add an execution to history"""
-        relative_path = os.path.relpath(script_path, self.base_directory)
-        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+    def _show_limits_dialog(self, e):
+        """Configura os limites aplicados no modo restrito"""
+        limits = self.execution_limits
         
-        history_item = {
-            "path": relative_path,
-            "timestamp": timestamp,
-            "status": "Sucesso" if return_code == 0 else f"Erro (código {return_code})",
-            "execution_time": execution_time
-        }
+        def number_field(label, value, suffix):
+            return ft.TextField(
+                label=label,
+                value="" if value is None else str(value),
+                suffix_text=suffix,
+                hint_text="sem limite",
+                keyboard_type=ft.KeyboardType.NUMBER,
+                width=200,
+            )
+        
+        cpu_field = number_field("Tempo de CPU", limits.cpu_seconds, "s")
+        memory_field = number_field("Memória", limits.memory_mb, "MB")
+        files_field = number_field("Arquivos abertos", limits.open_files, "")
+        wall_field = number_field("Tempo máximo", limits.wall_seconds, "s")
+        nice_checkbox = ft.Checkbox(label="Prioridade de CPU reduzida (nice)", value=bool(limits.nice))
+        io_checkbox = ft.Checkbox(label="Prioridade de E/S ociosa (ionice)", value=limits.idle_io)
+        cgroup_checkbox = ft.Checkbox(
+            label="Usar cgroup v2 quando disponível",
+            value=limits.use_cgroup,
+            disabled=resource is None,
+        )
+        env_checkbox = ft.Checkbox(label="Ambiente mínimo (sem as variáveis do painel)", value=limits.minimal_env)
+        error_text = ft.Text("", color=ft.Colors.RED, size=12)
         
-        self.execution_history.insert(0, history_item)
+        def parse(field):
+            value = field.value.strip()
+            if not value:
+                return None
+            number = int(value)
+            if number <= 0:
+                raise ValueError
+            return number
         
-        # Limit history size
-        if len(self.execution_history) > self.max_history_items:
-            self.execution_history = self.execution_history[:self.max_history_items]
+        def save_limits(e):
+            try:
+                self.execution_limits = ExecutionLimits(
+                    cpu_seconds=parse(cpu_field),
+                    memory_mb=parse(memory_field),
+                    open_files=parse(files_field),
+                    wall_seconds=parse(wall_field),
+                    nice=10 if nice_checkbox.value else None,
+                    idle_io=io_checkbox.value,
+                    use_cgroup=cgroup_checkbox.value,
+                    minimal_env=env_checkbox.value,
+                )
+            except ValueError:
+                error_text.value = "Use números inteiros positivos ou deixe em branco"
+                self.page.update()
+                return
+            self.sandbox_checkbox.tooltip = self.execution_limits.describe()
+            limits_dialog.open = False
+            self.page.update()
         
-        # Update history display if available
-        if self.page and hasattr(self, 'history_list'):
-            self._update_history_display()
+        notes = (
+            "No Windows, CPU e memória são verificados a cada segundo pelo monitoramento "
+            "(não há setrlimit) e cgroups não estão disponíveis."
+            if resource is None else
+            "Limites aplicados com setrlimit no processo do script; o tempo máximo é verificado pelo monitoramento."
+        )
+        
+        limits_dialog = ft.AlertDialog(
+            title=ft.Text("Limites do modo restrito"),
+            content=ft.Column(
+                [
+                    ft.Row([cpu_field, memory_field]),
+                    ft.Row([files_field, wall_field]),
+                    nice_checkbox,
+                    io_checkbox,
+                    cgroup_checkbox,
+                    env_checkbox,
+                    ft.Text(notes, size=12, color=ft.Colors.GREY_700),
+                    error_text,
+                ],
+                tight=True,
+                width=440,
+            ),
+            actions=[
+                ft.TextButton("Cancelar", on_click=lambda e: self._close_dialog(limits_dialog)),
+                ft.TextButton("Salvar", on_click=save_limits),
+            ],
+        )
+        self.page.dialog = limits_dialog
+        limits_dialog.open = True
+        self.page.update()
     
-    def _update_history_display(self):
-        """Update the history display with current execution history"""
-        if not hasattr(self, 'history_list'):
+    def _show_schedules_dialog(self, e):
+        """Lista os agendamentos e permite agendar o script selecionado"""
+        script_path = self._selected_script_path()
+        
+        kind_dropdown = ft.Dropdown(
+            label="Recorrência",
+            value="daily",
+            options=[ft.dropdown.Option(key, label) for key, label in SCHEDULE_KINDS.items()],
+            width=260,
+        )
+        value_field = ft.TextField(label="Valor", hint_text="03:00, 60 ou 0 */2 * * *", value="03:00", width=200)
+        missed_dropdown = ft.Dropdown(
+            label="Execuções perdidas",
+            value="skip",
+            options=[ft.dropdown.Option(key, label) for key, label in MISSED_RUN_POLICIES.items()],
+            width=260,
+        )
+        overlap_checkbox = ft.Checkbox(label="Permitir execuções sobrepostas", value=False)
+        error_text = ft.Text("", color=ft.Colors.RED, size=12)
+        self.schedules_list = ft.Column(spacing=2, scroll=ft.ScrollMode.AUTO, height=220)
+        
+        def add_schedule(e):
+            if not os.path.exists(script_path):
+                error_text.value = f"Arquivo {script_path} não encontrado"
+                self.page.update()
+                return
+            try:
+                schedule = Schedule(
+                    script=os.path.abspath(script_path),
+                    name=os.path.relpath(script_path, self.base_directory),
+                    kind=kind_dropdown.value,
+                    value=(value_field.value or "").strip(),
+                    missed_policy=missed_dropdown.value,
+                    allow_overlap=bool(overlap_checkbox.value),
+                    priority=JOB_PRIORITIES.get(self.priority_dropdown.value, JOB_PRIORITIES["Normal"]),
+                    restricted=bool(self.sandbox_checkbox.value),
+                )
+            except ValueError as ex:
+                error_text.value = f"Agendamento inválido: {ex}"
+                self.page.update()
+                return
+            error_text.value = ""
+            self.scheduler.reschedule(schedule)
+            self._refresh_schedules_dialog(force=True)
+        
+        self.schedules_dialog = ft.AlertDialog(
+            title=ft.Text("Execuções agendadas"),
+            content=ft.Column(
+                [
+                    self.schedules_list,
+                    ft.Divider(),
+                    ft.Text(f"Agendar: {os.path.basename(script_path)}", weight=ft.FontWeight.BOLD),
+                    ft.Row([kind_dropdown, value_field]),
+                    ft.Row([missed_dropdown, overlap_checkbox]),
+                    ft.Text(
+                        "Prioridade e modo restrito seguem as opções selecionadas na tela.",
+                        size=12,
+                        color=ft.Colors.GREY_700,
+                    ),
+                    error_text,
+                ],
+                tight=True,
+                width=560,
+            ),
+            actions=[
+                ft.TextButton("Fechar", on_click=lambda e: self._close_schedules_dialog()),
+                ft.TextButton("Agendar", on_click=add_schedule),
+            ],
+            on_dismiss=lambda e: self._close_schedules_dialog(),
+        )
+        self._refresh_schedules_dialog(force=True, update=False)
+        self.page.dialog = self.schedules_dialog
+        self.schedules_dialog.open = True
+        self.page.update()
+    
+    def _close_schedules_dialog(self):
+        if self.schedules_dialog is not None:
+            self.schedules_dialog.open = False
+            self.schedules_dialog = None
+            self.page.update()
+    
+    def _refresh_schedules_dialog(self, force=False, update=True):
+        """Atualiza a lista do diálogo de agendamentos quando o agendador muda"""
+        if self.schedules_dialog is None or not self.page:
             return
-            
-        self.history_list.controls.clear()
+        if not force and self.rendered_schedules_version == self.scheduler.version:
+            return
+        self.rendered_schedules_version = self.scheduler.version
         
-        for item in self.execution_history:
-            status_color = ft.Colors.GREEN if item["status"] == "Sucesso" else ft.Colors.RED
-            
-            history_item = ft.Container(
-                content=ft.Column([
-                    ft.Row([
-                        ft.Icon(
-                            name=ft.Icons.CHECK_CIRCLE if item["status"] == "Sucesso" else ft.Icons.ERROR,
-                            color=status_color,
-                            size=16
-                        ),
-                        ft.Text(
-                            item["path"],
-                            weight=ft.FontWeight.BOLD,
-                            size=14,
-                        ),
-                    ]),
-                    ft.Row([
-                        ft.Text(
-                            f"{item['timestamp']} | {item['status']} | Tempo: {self._format_time(item['execution_time'])}",
-                            size=12,
-                            color=ft.Colors.GREY_700,
-                        ),
-                    ]),
-                ]),
-                padding=10,
-                margin=ft.margin.only(bottom=5),
-                border_radius=5,
-                bgcolor=ft.Colors.BLUE_50,
-                border=ft.border.all(1, ft.Colors.BLUE_200),
-            )
-            
-            self.history_list.controls.append(history_item)
+        def format_timestamp(value):
+            return time.strftime("%d/%m %H:%M", time.localtime(value)) if value else "-"
         
-        if not self.execution_history:
-            self.history_list.controls.append(
-                ft.Text("Nenhuma execução registrada", italic=True, color=ft.Colors.GREY_500)
-            )
+        def toggle(schedule, enabled):
+            schedule.enabled = enabled
+            self.scheduler.reschedule(schedule)
+            self._refresh_schedules_dialog(force=True)
         
+        def remove(schedule):
+            self.scheduler.remove(schedule.id)
+            self._refresh_schedules_dialog(force=True)
+        
+        controls = []
+        for schedule in self.scheduler.store.list():
+            details = [schedule.describe(), f"Próxima: {format_timestamp(schedule.next_run)}"]
+            if schedule.last_run:
+                details.append(f"Última: {format_timestamp(schedule.last_run)}")
+            if schedule.last_result:
+                details.append(schedule.last_result)
+            controls.append(
+                ft.Row([
+                    ft.Switch(
+                        value=schedule.enabled,
+                        tooltip="Ativar/desativar",
+                        on_change=lambda e, s=schedule: toggle(s, e.control.value),
+                    ),
+                    ft.Column([
+                        ft.Text(schedule.name, weight=ft.FontWeight.BOLD, size=13),
+                        ft.Text(" | ".join(details), size=12, color=ft.Colors.GREY_700),
+                    ], spacing=0, expand=True),
+                    ft.IconButton(
+                        icon=ft.Icons.PLAY_ARROW,
+                        tooltip="Executar agora",
+                        icon_size=18,
+                        on_click=lambda e, s=schedule: self.scheduler.run_now(s.id),
+                    ),
+                    ft.IconButton(
+                        icon=ft.Icons.DELETE,
+                        tooltip="Remover agendamento",
+                        icon_size=18,
+                        icon_color=ft.Colors.RED,
+                        on_click=lambda e, s=schedule: remove(s),
+                    ),
+                ])
+            )
+        if not controls:
+            controls.append(ft.Text("Nenhum agendamento", italic=True, color=ft.Colors.GREY_500))
+        self.schedules_list.controls = controls
+        if update:
+            self.page.update(self.schedules_list)
+    
+    def _handle_sample_interval_change(self, e):
+        """Altera o intervalo de amostragem de recursos das execuções"""
+        self.job_manager.set_sample_interval(float(e.control.value))
+        self.status_text.value = f"Amostragem de recursos a cada {self.job_manager.sample_interval:g}s"
+        self.status_text.color = ft.Colors.BLUE
         self.page.update()
     
-    def _handle_run_button(self, e):
-        if not self.is_running:
-            # Inicia o programa em uma thread separada
-            threading.Thread(target=self._run_program, daemon=True).start()
-        else:
-            # Tenta encerrar o programa se estiver em execução
-            if self.process:
-                try:
-                    self.process.terminate()
-                    self.status_text.value = "Programa interrompido"
-                    self.status_text.color = ft.Colors.ORANGE
-                    self.run_button.text = "Executar Programa"
-                    self.run_button.icon = ft.Icons.PLAY_ARROW
-                    self.is_running = False
-                    self.should_monitor = False
-                    self.page.update()
-                except Exception as e:
-                    self.status_text.value = f"Erro ao interromper o programa: {str(e)}"
-                    self.status_text.color = ft.Colors.RED
-                    self.page.update()
+    def _handle_workers_change(self, e):
+        """Altera a quantidade de execuções simultâneas"""
+        self.job_manager.set_max_workers(int(e.control.value))
+        self.status_text.value = f"Execuções simultâneas: {self.job_manager.max_workers}"
+        self.status_text.color = ft.Colors.BLUE
+        self.page.update()
     
     def _handle_directory_selection(self, e):
         """Handle directory selection from dropdown"""
@@ -379,6 +2582,9 @@ class Module:
     
     def _handle_refresh_button(self, e):
         """Refresh the list of available directories and modules"""
+        # Revalida o mtime das pastas; só as que mudaram são relidas
+        self.directory_cache.expire()
+        
         # Refresh directories
         directories = self._scan_directories()
         self.directory_dropdown.options.clear()
@@ -403,14 +2609,17 @@ class Module:
     
     def _handle_clear_output(self, e):
         """Clear the output text"""
+        if self.viewed_job is not None:
+            self.viewed_job.output.clear()
+        self.output_visible_lines = OUTPUT_VISIBLE_LINES
         if self.output_text:
-            self.output_text.value = ""
-            self.page.update()
+            self._flush_output(force=True)
     
     def _handle_copy_output(self, e):
         """Copy output text to clipboard"""
-        if self.output_text and self.output_text.value:
-            self.page.set_clipboard(self.output_text.value)
+        output = self.viewed_job.output.text() if self.viewed_job is not None else ""
+        if output:
+            self.page.set_clipboard(output)
             self.page.show_snack_bar(
                 ft.SnackBar(
                     content=ft.Text("Saída copiada para a área de transferência"),
@@ -507,46 +2716,34 @@ class Module:
             )
             self.folder_browser.controls.append(parent_item)
         
+        directories, scripts = self.directory_cache.listing(self.current_directory)
+        
         # Add directories
-        for item in sorted(os.listdir(self.current_directory)):
+        for item in directories:
             full_path = os.path.join(self.current_directory, item)
-            if os.path.isdir(full_path):
-                dir_item = ft.Container(
-                    content=ft.Row([
-                        ft.Icon(ft.Icons.FOLDER, color=ft.Colors.AMBER),
-                        ft.Text(item),
-                    ]),
-                    padding=10,
-                    margin=5,
-                    border_radius=5,
-                    bgcolor=ft.Colors.AMBER_50,
-                    on_click=lambda e, p=full_path: self._navigate_to_directory(p),
-                    data=full_path,
-                )
-                self.folder_browser.controls.append(dir_item)
+            dir_item = ft.Container(
+                content=ft.Row([
+                    ft.Icon(ft.Icons.FOLDER, color=ft.Colors.AMBER),
+                    ft.Text(item),
+                ]),
+                padding=10,
+                margin=5,
+                border_radius=5,
+                bgcolor=ft.Colors.AMBER_50,
+                on_click=lambda e, p=full_path: self._navigate_to_directory(p),
+                data=full_path,
+            )
+            self.folder_browser.controls.append(dir_item)
         
         # Add Python files only if we're not in the base directory
         if self.current_directory != self.base_directory:
-            for item in sorted(os.listdir(self.current_directory)):
-                full_path = os.path.join(self.current_directory, item)
-                if os.path.isfile(full_path) and item.endswith('.py'):
-                    # Skip this module itself if somehow we're in its directory
-                    if item == os.path.basename(__file__):
-                        continue
-                    
-                    file_item = ft.Container(
-                        content=ft.Row([
-                            ft.Icon(ft.Icons.CODE, color=ft.Colors.GREEN),
-                            ft.Text(item),
-                        ]),
-                        padding=10,
-                        margin=5,
-                        border_radius=5,
-                        bgcolor=ft.Colors.GREEN_50,
-                        on_click=lambda e, p=full_path: self._select_module_file(p),
-                        data=full_path,
-                    )
-                    self.folder_browser.controls.append(file_item)
+            for item in scripts:
+                # Skip this module itself if somehow we're in its directory
+                if item == os.path.basename(__file__):
+                    continue
+                self.folder_browser.controls.append(
+                    self._create_file_item(os.path.join(self.current_directory, item), item)
+                )
         
         # Update breadcrumb
         self._update_breadcrumb()
@@ -554,6 +2751,40 @@ class Module:
         if self.page:
             self.page.update()
     
+    def _create_file_item(self, full_path, label):
+        """Cria o item clicável de um script no navegador"""
+        return ft.Container(
+            content=ft.Row([
+                ft.Icon(ft.Icons.CODE, color=ft.Colors.GREEN),
+                ft.Text(label),
+            ]),
+            padding=10,
+            margin=5,
+            border_radius=5,
+            bgcolor=ft.Colors.GREEN_50,
+            on_click=lambda e, p=full_path: self._select_module_file(p),
+            data=full_path,
+        )
+    
+    def _handle_script_search(self, e):
+        """Busca aproximada de scripts em todas as subpastas"""
+        query = e.control.value.strip()
+        if not query:
+            self._update_folder_browser()
+            return
+        
+        results = self.script_index.search(query)
+        self.folder_browser.controls.clear()
+        for relative in results:
+            self.folder_browser.controls.append(
+                self._create_file_item(os.path.join(self.base_directory, relative), relative)
+            )
+        if not results:
+            self.folder_browser.controls.append(
+                ft.Text("Nenhum script encontrado", italic=True, color=ft.Colors.GREY_500)
+            )
+        self.page.update()
+    
     def _navigate_to_directory(self, directory):
         """Navigate to the specified directory"""
         # Ensure we're using the correct directory path
@@ -587,6 +2818,14 @@ class Module:
         # Get the module name (filename)
         module_name = os.path.basename(file_path)
         
+        # Resultados da busca podem estar em outra pasta
+        directory = os.path.dirname(file_path)
+        if os.path.normpath(directory) != os.path.normpath(self.current_directory):
+            self.current_directory = directory
+            self._scan_modules()
+            self.module_dropdown.options = [ft.dropdown.Option(module) for module in self.modules_list]
+            self._update_breadcrumb()
+        
         # Set as selected module
         self.selected_module = module_name
         self.module_dropdown.value = module_name
@@ -703,6 +2942,8 @@ class Module:
         # Initialize directory paths
         self.base_directory = os.path.dirname(__file__)
         self.current_directory = self.base_directory
+        self.script_index = ScriptIndex(self.directory_cache, self.base_directory)
+        self.directory_cache.watch(self.base_directory)
         
         # Scan for directories
         directories = self._scan_directories()
@@ -784,6 +3025,113 @@ class Module:
             ),
         )
         
+        # Prioridade das execuções enfileiradas
+        self.priority_dropdown = ft.Dropdown(
+            label="Prioridade",
+            value="Normal",
+            options=[ft.dropdown.Option(name) for name in JOB_PRIORITIES],
+            width=140,
+        )
+        
+        # Quantidade de execuções simultâneas
+        self.workers_dropdown = ft.Dropdown(
+            label="Execuções simultâneas",
+            value=str(self.job_manager.max_workers),
+            options=[ft.dropdown.Option(str(n)) for n in range(1, MAX_WORKERS_LIMIT + 1)],
+            width=190,
+            on_change=self._handle_workers_change,
+        )
+        
+        # Intervalo de amostragem de CPU/memória/E/S das execuções
+        self.sample_interval_dropdown = ft.Dropdown(
+            label="Amostragem",
+            value=f"{self.job_manager.sample_interval:g}",
+            options=[ft.dropdown.Option(f"{interval:g}", f"{interval:g}s") for interval in JOB_MONITOR_INTERVALS],
+            width=130,
+            on_change=self._handle_sample_interval_change,
+        )
+        
+        # Modo restrito
+        self.sandbox_checkbox = ft.Checkbox(
+            label="Modo restrito",
+            value=False,
+            tooltip=self.execution_limits.describe(),
+        )
+        limits_button = ft.IconButton(
+            icon=ft.Icons.TUNE,
+            tooltip="Configurar limites do modo restrito",
+            on_click=self._show_limits_dialog,
+        )
+        
+        schedules_button = ft.IconButton(
+            icon=ft.Icons.SCHEDULE,
+            tooltip="Agendar execuções recorrentes",
+            on_click=self._show_schedules_dialog,
+        )
+        
+        # Interpretador pré-carregado (servidor de fork)
+        self.warm_checkbox = ft.Checkbox(
+            label="Interpretador pré-carregado",
+            value=False,
+            disabled=self.job_manager.warm_pool is None,
+            tooltip=(
+                f"Executa o script em um processo derivado de um interpretador que já importou "
+                f"{', '.join(WARM_PRELOAD_MODULES)}"
+                if self.job_manager.warm_pool is not None else
+                "Disponível apenas em sistemas POSIX"
+            ),
+        )
+        
+        run_all_button = ft.OutlinedButton(
+            text="Executar todos da pasta",
+            icon=ft.Icons.PLAYLIST_PLAY,
+            on_click=self._handle_run_all_button,
+        )
+        
+        # Lista de execuções
+        self.jobs_summary_text = ft.Text("", size=12, color=ft.Colors.GREY_700)
+        self.jobs_list = ft.Column(
+            controls=[
+                ft.Text("Nenhuma execução na fila", italic=True, color=ft.Colors.GREY_500)
+            ],
+            scroll=ft.ScrollMode.AUTO,
+            spacing=2,
+            height=200,
+        )
+        
+        # Gráfico de CPU (%) e memória (MB) da árvore de processos do job exibido
+        self.resource_chart = ft.LineChart(
+            data_series=[
+                ft.LineChartData(data_points=[], stroke_width=2, color=ft.Colors.BLUE, curved=True),
+                ft.LineChartData(data_points=[], stroke_width=2, color=ft.Colors.PURPLE, curved=True),
+            ],
+            border=ft.border.all(1, ft.Colors.GREY_400),
+            horizontal_grid_lines=ft.ChartGridLines(color=ft.Colors.GREY_300, width=1),
+            tooltip_bgcolor=ft.Colors.with_opacity(0.8, ft.Colors.GREY_800),
+            left_axis=ft.ChartAxis(labels_size=40),
+            min_y=0,
+            min_x=0,
+            height=150,
+            visible=False,
+        )
+        self.rendered_chart_key = None
+        
+        jobs_container = ft.Container(
+            content=ft.Column([
+                ft.Row([
+                    ft.Text("Execuções:", weight=ft.FontWeight.BOLD),
+                    self.jobs_summary_text,
+                ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+                self.jobs_list,
+                ft.Text("CPU (%, azul) e memória (MB, roxo) do job exibido", size=12, color=ft.Colors.GREY_700),
+                self.resource_chart,
+            ]),
+            padding=10,
+            bgcolor=ft.Colors.SURFACE_VARIANT,
+            border_radius=5,
+            margin=ft.margin.only(top=10),
+        )
+        
         # Output text area
         self.output_text = ft.Text(
             value="",
@@ -793,11 +3141,21 @@ class Module:
             no_wrap=False,
         )
         
+        self.output_title = ft.Text("Saída do programa:", weight=ft.FontWeight.BOLD)
+        
+        # Botão para exibir linhas anteriores da saída
+        self.load_more_button = ft.TextButton(
+            text="Carregar mais",
+            icon=ft.Icons.EXPAND_LESS,
+            on_click=self._handle_load_more,
+            visible=False,
+        )
+        
         # Output container
         self.output_container = ft.Container(
             content=ft.Column([
                 ft.Row([
-                    ft.Text("Saída do programa:", weight=ft.FontWeight.BOLD),
+                    self.output_title,
                     ft.IconButton(
                         icon=ft.Icons.CONTENT_COPY,
                         tooltip="Copiar saída",
@@ -811,8 +3169,9 @@ class Module:
                         icon_color=ft.Colors.RED,
                     ),
                 ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+                self.load_more_button,
                 ft.Container(
-                    content=self.output_text,
+                    content=ft.Column([self.output_text], scroll=ft.ScrollMode.AUTO, auto_scroll=True),
                     bgcolor=ft.Colors.BLACK,
                     border_radius=5,
                     padding=10,
@@ -839,7 +3198,15 @@ class Module:
         # History container
         self.history_container = ft.Container(
             content=ft.Column([
-                ft.Text("Histórico de execuções:", weight=ft.FontWeight.BOLD),
+                ft.Row([
+                    ft.Text("Histórico de execuções:", weight=ft.FontWeight.BOLD),
+                    ft.IconButton(
+                        icon=ft.Icons.QUERY_STATS,
+                        tooltip="Estatísticas por script",
+                        on_click=self._handle_show_stats,
+                        icon_color=ft.Colors.BLUE,
+                    ),
+                ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
                 self.history_list,
             ]),
             padding=10,
@@ -852,7 +3219,16 @@ class Module:
         # Folder browser container
         folder_browser_container = ft.Container(
             content=ft.Column([
-                ft.Text("Navegador de arquivos:", weight=ft.FontWeight.BOLD),
+                ft.Row([
+                    ft.Text("Navegador de arquivos:", weight=ft.FontWeight.BOLD),
+                    ft.TextField(
+                        hint_text="Buscar script em todas as pastas",
+                        prefix_icon=ft.Icons.SEARCH,
+                        on_change=self._handle_script_search,
+                        dense=True,
+                        width=300,
+                    ),
+                ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
                 self.breadcrumb_row,
                 ft.Container(height=5),
                 self.folder_browser,
@@ -885,7 +3261,18 @@ class Module:
                         self.resource_text,
                     ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
                     ft.Container(height=10),
-                    self.run_button,
+                    ft.Row([
+                        self.run_button,
+                        run_all_button,
+                        self.priority_dropdown,
+                        self.workers_dropdown,
+                        self.sample_interval_dropdown,
+                        self.sandbox_checkbox,
+                        limits_button,
+                        schedules_button,
+                        self.warm_checkbox,
+                    ], wrap=True),
+                    jobs_container,
                     self.output_container,
                     self.history_container,
                 ],
@@ -917,13 +3304,365 @@ class Module:
         self.page = page
         # Agora que a página está disponível, atualize o navegador de pastas
         self._update_folder_browser()
+        self._update_history_display()
+        self._update_jobs_display(force=True)
+        self._start_ui_refresh()
     
     def will_unmount(self):
-        """Chamado quando o módulo é desmontado da página"""
-        if self.is_running and self.process:
+        """Chamado quando o módulo é desmontado da página
+
+        As execuções continuam em segundo plano; apenas a atualização da interface para.
+        """
+        self.ui_refresh_thread = None
+
+
+class CronExpression:
+    """Expressão cron de 5 campos: minuto, hora, dia do mês, mês e dia da semana
+
+    Aceita "*", listas ("1,15"), intervalos ("1-5") e passos ("*/10", "0-30/5").
+    Dia da semana: 0 ou 7 = domingo. Como no cron, se dia do mês e dia da semana
+    forem restritos, basta um deles coincidir.
+    """
+    
+    def __init__(self, expression):
+        self.expression = " ".join(expression.split())
+        fields = self.expression.split(" ")
+        if len(fields) != 5:
+            raise ValueError("A expressão cron deve ter 5 campos")
+        self.minutes, self.hours, self.days, self.months, self.weekdays = [
+            self._parse_field(field, low, high) for field, (low, high) in zip(fields, CRON_FIELDS[:4] + [(0, 7)])
+        ]
+        if 7 in self.weekdays:
+            self.weekdays = (self.weekdays - {7}) | {0}
+        self.day_restricted = fields[2] != "*"
+        self.weekday_restricted = fields[4] != "*"
+    
+    @staticmethod
+    def _parse_field(field, low, high):
+        values = set()
+        for part in field.split(","):
+            step = 1
+            if "/" in part:
+                part, step_text = part.split("/", 1)
+                step = int(step_text)
+                if step < 1:
+                    raise ValueError(f"Passo inválido: {step_text}")
+            if part == "*":
+                start, end = low, high
+            elif "-" in part:
+                start_text, end_text = part.split("-", 1)
+                start, end = int(start_text), int(end_text)
+            else:
+                start = end = int(part)
+                if step > 1:
+                    end = high
+            if start < low or end > high or start > end:
+                raise ValueError(f"Valor fora do intervalo {low}-{high}: {field}")
+            values.update(range(start, end + 1, step))
+        return values
+    
+    def _day_matches(self, moment):
+        # datetime.weekday(): segunda = 0; no cron, domingo = 0
+        weekday_match = (moment.weekday() + 1) % 7 in self.weekdays
+        day_match = moment.day in self.days
+        if self.day_restricted and self.weekday_restricted:
+            return day_match or weekday_match
+        return day_match and weekday_match
+    
+    def next_after(self, timestamp):
+        """Próximo instante (timestamp local) estritamente posterior a timestamp"""
+        moment = datetime.datetime.fromtimestamp(timestamp).replace(second=0, microsecond=0)
+        moment += datetime.timedelta(minutes=1)
+        limit = moment + datetime.timedelta(days=366 * 5)
+        while moment < limit:
+            if moment.month not in self.months:
+                moment = (moment.replace(day=1, hour=0, minute=0) + datetime.timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(moment):
+                moment = moment.replace(hour=0, minute=0) + datetime.timedelta(days=1)
+            elif moment.hour not in self.hours:
+                moment = moment.replace(minute=0) + datetime.timedelta(hours=1)
+            elif moment.minute not in self.minutes:
+                moment += datetime.timedelta(minutes=1)
+            else:
+                return moment.timestamp()
+        raise ValueError(f"A expressão cron nunca ocorre: {self.expression}")
+
+
+class Schedule:
+    """Agendamento recorrente de um script"""
+    
+    FIELDS = [
+        "id", "script", "name", "kind", "value", "enabled", "missed_policy", "allow_overlap",
+        "priority", "restricted", "last_run", "next_run", "last_result",
+    ]
+    
+    def __init__(self, script, kind, value, name=None, enabled=True, missed_policy="skip", allow_overlap=False,
+                 priority=JOB_PRIORITIES["Normal"], restricted=False, id=None, last_run=None, next_run=None,
+                 last_result=None):
+        self.id = id or f"{int(time.time()):x}{os.urandom(3).hex()}"
+        self.script = script
+        self.name = name or os.path.basename(script)
+        self.kind = kind
+        self.value = value
+        self.enabled = enabled
+        self.missed_policy = missed_policy
+        self.allow_overlap = allow_overlap
+        self.priority = priority
+        self.restricted = restricted
+        self.last_run = last_run
+        self.next_run = next_run
+        self.last_result = last_result
+        self.validate()
+    
+    def validate(self):
+        """Levanta ValueError se a recorrência for inválida"""
+        if self.kind not in SCHEDULE_KINDS:
+            raise ValueError(f"Tipo de agendamento desconhecido: {self.kind}")
+        if self.missed_policy not in MISSED_RUN_POLICIES:
+            raise ValueError(f"Política de execuções perdidas desconhecida: {self.missed_policy}")
+        self.next_after(time.time())
+    
+    def next_after(self, timestamp):
+        """Próxima execução posterior a timestamp"""
+        if self.kind == "interval":
+            minutes = float(self.value)
+            if minutes <= 0:
+                raise ValueError("O intervalo deve ser maior que zero")
+            # Mantém a cadência a partir da última execução, sem acumular atrasos
+            base = self.last_run or timestamp
+            periods = max(int((timestamp - base) // (minutes * 60)) + 1, 1)
+            return base + periods * minutes * 60
+        if self.kind == "daily":
+            hour, minute = (int(part) for part in str(self.value).split(":"))
+            return CronExpression(f"{minute} {hour} * * *").next_after(timestamp)
+        return CronExpression(str(self.value)).next_after(timestamp)
+    
+    def describe(self):
+        if self.kind == "interval":
+            return f"A cada {float(self.value):g} min"
+        if self.kind == "daily":
+            return f"Diariamente às {self.value}"
+        return f"Cron: {self.value}"
+    
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+    
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{field: data[field] for field in cls.FIELDS if field in data})
+
+
+class ScheduleStore:
+    """Agendamentos persistidos em JSON (gravação atômica com os.replace)"""
+    
+    def __init__(self, path=SCHEDULES_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.schedules = OrderedDict()
+        self._load()
+    
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                items = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Erro ao carregar agendamentos: {e}")
+            return
+        for item in items:
             try:
-                self.process.terminate()
-                self.should_monitor = False
-            except:
-                pass
+                schedule = Schedule.from_dict(item)
+            except (TypeError, ValueError) as e:
+                print(f"Agendamento inválido ignorado ({item.get('name')}): {e}")
+                continue
+            self.schedules[schedule.id] = schedule
+    
+    def save(self):
+        with self.lock:
+            data = [schedule.to_dict() for schedule in self.schedules.values()]
+            temp_path = f"{self.path}.tmp"
+            try:
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
+                os.replace(temp_path, self.path)
+            except OSError as e:
+                print(f"Erro ao salvar agendamentos: {e}")
+    
+    def list(self):
+        with self.lock:
+            return list(self.schedules.values())
+    
+    def get(self, schedule_id):
+        with self.lock:
+            return self.schedules.get(schedule_id)
+    
+    def put(self, schedule):
+        with self.lock:
+            self.schedules[schedule.id] = schedule
+        self.save()
+    
+    def remove(self, schedule_id):
+        with self.lock:
+            removed = self.schedules.pop(schedule_id, None)
+        if removed is not None:
+            self.save()
+        return removed
+
+
+class JobScheduler:
+    """Dispara os agendamentos no horário usando um heap de próximas execuções
+
+    A thread dorme na Condition até o próximo vencimento (no máximo SCHEDULER_MAX_SLEEP,
+    para tolerar ajustes de relógio) e é acordada quando a lista de agendamentos muda.
+    on_due(schedule) deve enfileirar a execução e retornar o job criado.
+    """
+    
+    def __init__(self, store, job_manager, on_due):
+        self.store = store
+        self.job_manager = job_manager
+        self.on_due = on_due
+        self.condition = threading.Condition()
+        self.heap = []
+        self.active_jobs = {}  # schedule_id -> job da última execução disparada
+        self.thread = None
+        self.running = False
+        self.version = 0
+    
+    def start(self):
+        """Aplica a política de execuções perdidas e inicia a thread do agendador"""
+        if self.thread is not None and self.thread.is_alive():
+            return
+        now = time.time()
+        due_now = []
+        for schedule in self.store.list():
+            if not schedule.enabled:
+                continue
+            if schedule.next_run is not None and schedule.next_run < now - SCHEDULE_MISSED_GRACE_SECONDS:
+                if schedule.missed_policy == "run_once":
+                    due_now.append(schedule)
+                    continue
+                schedule.last_result = "Execução perdida ignorada"
+                schedule.next_run = schedule.next_after(now)
+            elif schedule.next_run is None:
+                schedule.next_run = schedule.next_after(now)
+        self.store.save()
+        
+        with self.condition:
+            self.running = True
+            self._rebuild_heap()
+            for schedule in due_now:
+                schedule.next_run = now
+                heapq.heappush(self.heap, (now, schedule.id))
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+    
+    def stop(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+    
+    def _rebuild_heap(self):
+        self.heap = [
+            (schedule.next_run, schedule.id)
+            for schedule in self.store.list()
+            if schedule.enabled and schedule.next_run is not None
+        ]
+        heapq.heapify(self.heap)
+    
+    def reschedule(self, schedule):
+        """Recalcula a próxima execução de um agendamento novo ou alterado"""
+        if schedule.enabled:
+            schedule.next_run = schedule.next_after(time.time())
+        else:
+            schedule.next_run = None
+        self.store.put(schedule)
+        with self.condition:
+            self._rebuild_heap()
+            self.version += 1
+            self.condition.notify()
+    
+    def remove(self, schedule_id):
+        self.store.remove(schedule_id)
+        with self.condition:
+            self._rebuild_heap()
+            self.active_jobs.pop(schedule_id, None)
+            self.version += 1
+            self.condition.notify()
+    
+    def run_now(self, schedule_id):
+        """Dispara um agendamento imediatamente, sem alterar a próxima execução"""
+        schedule = self.store.get(schedule_id)
+        if schedule is not None:
+            self._fire(schedule, time.time(), reschedule=False)
+    
+    def _loop(self):
+        while True:
+            with self.condition:
+                if not self.running:
+                    return
+                if not self.heap:
+                    self.condition.wait(SCHEDULER_MAX_SLEEP)
+                    continue
+                due_at, schedule_id = self.heap[0]
+                delay = due_at - time.time()
+                if delay > 0:
+                    self.condition.wait(min(delay, SCHEDULER_MAX_SLEEP))
+                    continue
+                heapq.heappop(self.heap)
+            
+            schedule = self.store.get(schedule_id)
+            # Entradas antigas do heap (agendamento removido, desativado ou reagendado) são descartadas
+            if schedule is None or not schedule.enabled or schedule.next_run != due_at:
+                continue
+            self._fire(schedule, time.time())
+    
+    def _fire(self, schedule, now, reschedule=True):
+        previous = self.active_jobs.get(schedule.id)
+        if not schedule.allow_overlap and previous is not None and previous.is_active:
+            schedule.last_result = f"Pulada: execução #{previous.id} ainda ativa"
+        else:
+            try:
+                job = self.on_due(schedule)
+                self.active_jobs[schedule.id] = job
+                schedule.last_run = now
+                schedule.last_result = f"Enfileirada como #{job.id}"
+            except Exception as e:
+                schedule.last_result = f"Erro ao disparar: {e}"
+                print(f"Erro ao disparar agendamento {schedule.name}: {e}")
+        
+        if reschedule:
+            schedule.next_run = schedule.next_after(now)
+            with self.condition:
+                heapq.heappush(self.heap, (schedule.next_run, schedule.id))
+        self.store.save()
+        with self.condition:
+            self.version += 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Programa Externo - servidor de fork e benchmark de inicialização")
+    parser.add_argument("--fork-server", metavar="SOCKET", help="executa o servidor de fork no socket Unix indicado")
+    parser.add_argument("--preload", default=",".join(WARM_PRELOAD_MODULES),
+                        help="módulos importados antecipadamente (separados por vírgula)")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="compara a inicialização com interpretador novo e com o servidor de fork")
+    parser.add_argument("--runs", type=int, default=10, help="execuções por modo no benchmark")
+    args = parser.parse_args(argv)
+    preload = [name for name in args.preload.split(",") if name]
+    
+    if args.fork_server:
+        run_fork_server(args.fork_server, preload)
+        return 0
+    if args.benchmark:
+        if not WarmWorkerPool.is_supported():
+            print("O servidor de fork requer um sistema POSIX (os.fork e socket.send_fds)")
+            return 1
+        run_startup_benchmark(args.runs, preload)
+        return 0
+    parser.print_help()
+    return 0
+
 
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,477 @@
+import flet as ft
+import importlib.util
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Configurações
+PACS_DIR = os.path.join(os.path.dirname(__file__), "Pacs")
+SERVERS_FILE = os.path.join(PACS_DIR, "servidores.py")
+CUSTOM_SERVERS_FILE = os.path.join(PACS_DIR, "servidores_personalizados.json")
+AGENT_PORT = 9910  # Mesma porta padrão do agente do Monitor do Sistema
+DEFAULT_WORKERS = 32
+DEFAULT_TIMEOUT = 3  # segundos
+DEFAULT_CACHE_TTL = 30  # segundos
+
+
+def load_fleet_servers() -> List[Dict[str, Any]]:
+    """Carrega a lista de servidores do PACS, mesclando os servidores personalizados pelo IP"""
+    servers = []
+    try:
+        spec = importlib.util.spec_from_file_location("servidores", SERVERS_FILE)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        servers = list(module.SERVIDORES)
+    except Exception as e:
+        print(f"Erro ao carregar servidores: {e}")
+
+    servers_by_ip = {server["ip"]: server for server in servers}
+    try:
+        if os.path.exists(CUSTOM_SERVERS_FILE):
+            with open(CUSTOM_SERVERS_FILE, "r", encoding="utf-8") as f:
+                for server in json.load(f):
+                    servers_by_ip[server["ip"]] = server
+    except Exception as e:
+        print(f"Erro ao carregar servidores personalizados: {e}")
+
+    return list(servers_by_ip.values())
+
+
+class HostMetricsCache:
+    """Cache por host das últimas métricas recebidas dos agentes"""
+
+    def __init__(self, ttl=DEFAULT_CACHE_TTL):
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries: Dict[str, Dict[str, Any]] = {}
+
+    def get(self, ip) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            entry = self.entries.get(ip)
+            return dict(entry) if entry else None
+
+    def is_fresh(self, ip) -> bool:
+        """Indica se a entrada do host ainda está dentro do TTL"""
+        with self.lock:
+            entry = self.entries.get(ip)
+            return bool(entry) and (time.time() - entry["fetched_at"]) < self.ttl
+
+    def store(self, ip, data=None, error=None, latency=None):
+        """Registra o resultado de uma coleta (sucesso ou falha)"""
+        with self.lock:
+            previous = self.entries.get(ip, {})
+            self.entries[ip] = {
+                "online": error is None,
+                "data": data if error is None else previous.get("data"),
+                "error": error,
+                "latency": latency,
+                "fetched_at": time.time(),
+                "last_seen": time.time() if error is None else previous.get("last_seen"),
+            }
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class FleetCollector:
+    """Consulta os agentes de métricas de vários hosts usando um pool de threads"""
+
+    def __init__(self, servers, port=AGENT_PORT, max_workers=DEFAULT_WORKERS,
+                 timeout=DEFAULT_TIMEOUT, cache_ttl=DEFAULT_CACHE_TTL):
+        self.servers = servers
+        self.port = port
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.cache = HostMetricsCache(ttl=cache_ttl)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fleet")
+        self.refresh_lock = threading.Lock()
+
+        # Sessão compartilhada para reaproveitar conexões entre coletas
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers, max_retries=0)
+        self.session.mount("http://", adapter)
+
+    def fetch_host(self, server) -> bool:
+        """Busca as métricas atuais de um host e atualiza o cache"""
+        ip = server["ip"]
+        url = f"http://{ip}:{self.port}/metrics.json"
+        started = time.time()
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+            self.cache.store(ip, data=response.json(), latency=time.time() - started)
+            return True
+        except (requests.RequestException, ValueError) as e:
+            self.cache.store(ip, error=_short_error(e), latency=time.time() - started)
+            return False
+
+    def refresh(self, force=False, on_progress=None):
+        """Atualiza os hosts com cache expirado em paralelo
+
+        on_progress(concluídos, total) é chamado à medida que as respostas chegam.
+        Retorna False sem fazer nada se outra atualização já estiver em andamento.
+        """
+        if not self.refresh_lock.acquire(blocking=False):
+            return False  # Já existe uma atualização em andamento
+        try:
+            pending = [s for s in self.servers if force or not self.cache.is_fresh(s["ip"])]
+            total = len(pending)
+            futures = [self.executor.submit(self.fetch_host, server) for server in pending]
+            for done, _ in enumerate(as_completed(futures), start=1):
+                if on_progress:
+                    on_progress(done, total)
+        finally:
+            self.refresh_lock.release()
+        return True
+
+    def summary(self, sort_by="worst") -> List[Dict[str, Any]]:
+        """Monta as linhas do resumo da frota, ordenadas pelo critério informado"""
+        rows = []
+        for server in self.servers:
+            entry = self.cache.get(server["ip"])
+            current = (entry or {}).get("data", {}) or {}
+            current = current.get("current", {})
+            rows.append({
+                "name": server.get("nome", server["ip"]),
+                "ip": server["ip"],
+                "status": "unknown" if entry is None else ("online" if entry["online"] else "offline"),
+                "cpu": current.get("cpu"),
+                "memory": current.get("memory"),
+                "disk": current.get("disk"),
+                "disk_free": (current.get("disk_total") or 0) - (current.get("disk_used") or 0),
+                "error": (entry or {}).get("error"),
+                "last_seen": (entry or {}).get("last_seen"),
+            })
+
+        def metric(row, key):
+            return row[key] if row[key] is not None else -1
+
+        if sort_by == "cpu":
+            rows.sort(key=lambda r: metric(r, "cpu"), reverse=True)
+        elif sort_by == "disk":
+            rows.sort(key=lambda r: metric(r, "disk"), reverse=True)
+        elif sort_by == "memory":
+            rows.sort(key=lambda r: metric(r, "memory"), reverse=True)
+        elif sort_by == "name":
+            rows.sort(key=lambda r: r["name"].lower())
+        else:
+            # Pior caso entre CPU e disco primeiro; hosts sem dados vão para o final
+            rows.sort(key=lambda r: max(metric(r, "cpu"), metric(r, "disk")), reverse=True)
+        return rows
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
+        self.session.close()
+
+
+def _short_error(error) -> str:
+    """Resume a mensagem de erro de uma requisição para exibição"""
+    if isinstance(error, requests.Timeout):
+        return "Tempo esgotado"
+    if isinstance(error, requests.ConnectionError):
+        return "Agente inacessível"
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return f"HTTP {error.response.status_code}"
+    return str(error)[:80]
+
+
+class Module:
+    def __init__(self):
+        self.page = None
+        self.collector = None
+        self.refresh_interval = 60  # segundos
+        self.stop_event = None  # um evento por thread de atualização
+        self.refresh_thread = None
+        self.grid_lock = threading.Lock()  # serializa a reconstrução da grade
+        self.sort_by = "worst"
+        self.filter_text = ""
+        self.only_problems = False
+        self.alert_thresholds = {
+            "cpu": 80,
+            "memory": 80,
+            "disk": 90
+        }
+
+    def get_module_info(self):
+        return {
+            "name": "Monitor da Frota PACS",
+            "description": "Resumo das métricas dos servidores PACS coletadas pelos agentes",
+            "version": "1.0.0",
+            "icon": ft.Icons.DNS,
+            "color": ft.Colors.TEAL,
+        }
+
+    def _ensure_collector(self):
+        if self.collector is None:
+            self.collector = FleetCollector(load_fleet_servers())
+
+    def _refresh(self, force=False):
+        """Atualiza as métricas da frota e redesenha o resumo"""
+        self._ensure_collector()
+
+        def on_progress(done, total):
+            if self.page and total:
+                self.progress_bar.value = done / total
+                self.status_text.value = f"Consultando agentes... {done}/{total}"
+                # Atualiza a grade a cada lote para exibir os resultados conforme chegam
+                if done == total or done % DEFAULT_WORKERS == 0:
+                    self._update_grid()
+                self.page.update()
+
+        if self.page:
+            self.progress_bar.visible = True
+            self.progress_bar.value = 0
+            self.page.update()
+
+        if not self.collector.refresh(force=force, on_progress=on_progress):
+            return  # a atualização em andamento exibe o próprio progresso e horário
+
+        if self.page:
+            self.progress_bar.visible = False
+            self.status_text.value = f"Atualizado às {time.strftime('%H:%M:%S')}"
+            self._update_grid()
+            self.page.update()
+
+    def _auto_refresh_loop(self, stop_event):
+        while not stop_event.is_set():
+            try:
+                self._refresh()
+            except Exception as e:
+                print(f"Erro ao atualizar frota: {e}")
+            stop_event.wait(self.refresh_interval)
+
+    def _get_status_color(self, value, threshold):
+        """Retorna uma cor baseada no valor em relação ao limite"""
+        if value is None:
+            return ft.Colors.GREY_500
+        if value < threshold * 0.5:
+            return ft.Colors.GREEN
+        elif value < threshold * 0.8:
+            return ft.Colors.AMBER
+        else:
+            return ft.Colors.RED
+
+    def _format_bytes(self, bytes):
+        """Formata bytes para uma representação legível"""
+        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
+            if bytes < 1024:
+                return f"{bytes:.2f} {unit}"
+            bytes /= 1024
+        return f"{bytes:.2f} PB"
+
+    def _is_problem(self, row):
+        """Indica se o host está offline ou acima de algum limite de alerta"""
+        if row["status"] == "offline":
+            return True
+        for key in ("cpu", "memory", "disk"):
+            if row[key] is not None and row[key] >= self.alert_thresholds[key]:
+                return True
+        return False
+
+    def _metric_cell(self, value, threshold, width):
+        if value is None:
+            return ft.Container(content=ft.Text("-", color=ft.Colors.GREY_500), width=width)
+        color = self._get_status_color(value, threshold)
+        return ft.Container(
+            content=ft.Column([
+                ft.Text(f"{value:.1f}%", color=color, size=12),
+                ft.ProgressBar(value=min(value, 100) / 100, color=color, width=width - 20),
+            ], spacing=2),
+            width=width,
+        )
+
+    def _update_grid(self):
+        """Redesenha a grade de resumo a partir do cache"""
+        # Chamado pela thread de atualização e pelos handlers da interface
+        with self.grid_lock:
+            if not hasattr(self, 'fleet_list') or not self.collector:
+                return
+
+            rows = self.collector.summary(self.sort_by)
+            online = sum(1 for r in rows if r["status"] == "online")
+            offline = sum(1 for r in rows if r["status"] == "offline")
+            problems = sum(1 for r in rows if self._is_problem(r))
+            self.summary_text.value = (
+                f"{len(rows)} hosts | {online} online | {offline} sem agente | {problems} com problemas"
+            )
+
+            term = self.filter_text.lower()
+            if term:
+                rows = [r for r in rows if term in r["name"].lower() or term in r["ip"]]
+            if self.only_problems:
+                rows = [r for r in rows if self._is_problem(r)]
+
+            # A lista nova é montada à parte e trocada de uma vez, para que um page.update()
+            # concorrente nunca envie a grade pela metade
+            controls = []
+            for row in rows:
+                if row["status"] == "online":
+                    status_icon = ft.Icon(ft.Icons.CIRCLE, color=ft.Colors.GREEN, size=12, tooltip="Online")
+                elif row["status"] == "offline":
+                    status_icon = ft.Icon(ft.Icons.CIRCLE, color=ft.Colors.RED, size=12, tooltip=row["error"] or "Offline")
+                else:
+                    status_icon = ft.Icon(ft.Icons.CIRCLE_OUTLINED, color=ft.Colors.GREY_500, size=12, tooltip="Aguardando")
+
+                last_seen = (
+                    time.strftime("%H:%M:%S", time.localtime(row["last_seen"])) if row["last_seen"] else "-"
+                )
+                disk_free = self._format_bytes(row["disk_free"]) if row["disk"] is not None else "-"
+
+                controls.append(
+                    ft.Container(
+                        content=ft.Row([
+                            ft.Container(content=status_icon, width=20),
+                            ft.Container(
+                                content=ft.Column([
+                                    ft.Text(row["name"], weight=ft.FontWeight.BOLD, size=12,
+                                            overflow=ft.TextOverflow.ELLIPSIS, tooltip=row["name"]),
+                                    ft.Text(row["ip"], size=11, color=ft.Colors.GREY_700, selectable=True),
+                                ], spacing=0),
+                                expand=1,
+                            ),
+                            self._metric_cell(row["cpu"], self.alert_thresholds["cpu"], 110),
+                            self._metric_cell(row["memory"], self.alert_thresholds["memory"], 110),
+                            self._metric_cell(row["disk"], self.alert_thresholds["disk"], 110),
+                            ft.Container(content=ft.Text(disk_free, size=12), width=90),
+                            ft.Container(content=ft.Text(last_seen, size=12), width=70),
+                        ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+                        padding=ft.padding.symmetric(vertical=4, horizontal=8),
+                        border=ft.border.only(bottom=ft.BorderSide(1, ft.Colors.GREY_300)),
+                    )
+                )
+
+            if not rows:
+                controls.append(
+                    ft.Text("Nenhum host encontrado", italic=True, color=ft.Colors.GREY_500)
+                )
+            self.fleet_list.controls = controls
+
+    def _handle_refresh(self, e):
+        threading.Thread(target=self._refresh, kwargs={"force": True}, daemon=True).start()
+
+    def _handle_sort(self, e):
+        self.sort_by = e.control.value
+        self._update_grid()
+        self.page.update()
+
+    def _handle_filter(self, e):
+        self.filter_text = e.control.value or ""
+        self._update_grid()
+        self.page.update()
+
+    def _handle_only_problems(self, e):
+        self.only_problems = e.control.value
+        self._update_grid()
+        self.page.update()
+
+    def get_view(self):
+        self._ensure_collector()
+
+        self.status_text = ft.Text("Aguardando primeira coleta...", size=14, color=ft.Colors.GREY_700)
+        self.summary_text = ft.Text("", size=14, weight=ft.FontWeight.BOLD)
+        self.progress_bar = ft.ProgressBar(value=0, visible=False)
+
+        sort_dropdown = ft.Dropdown(
+            label="Ordenar por",
+            width=200,
+            value=self.sort_by,
+            options=[
+                ft.dropdown.Option(key="worst", text="Pior CPU/Disco"),
+                ft.dropdown.Option(key="cpu", text="CPU"),
+                ft.dropdown.Option(key="disk", text="Disco"),
+                ft.dropdown.Option(key="memory", text="Memória"),
+                ft.dropdown.Option(key="name", text="Nome"),
+            ],
+            on_change=self._handle_sort,
+        )
+
+        filter_field = ft.TextField(
+            label="Filtrar por nome ou IP",
+            prefix_icon=ft.Icons.SEARCH,
+            expand=True,
+            on_change=self._handle_filter,
+        )
+
+        only_problems_checkbox = ft.Checkbox(
+            label="Somente com problemas",
+            value=self.only_problems,
+            on_change=self._handle_only_problems,
+        )
+
+        header = ft.Container(
+            content=ft.Row([
+                ft.Container(width=20),
+                ft.Container(content=ft.Text("Servidor", weight=ft.FontWeight.BOLD), expand=1),
+                ft.Container(content=ft.Text("CPU", weight=ft.FontWeight.BOLD), width=110),
+                ft.Container(content=ft.Text("Memória", weight=ft.FontWeight.BOLD), width=110),
+                ft.Container(content=ft.Text("Disco", weight=ft.FontWeight.BOLD), width=110),
+                ft.Container(content=ft.Text("Livre", weight=ft.FontWeight.BOLD), width=90),
+                ft.Container(content=ft.Text("Visto", weight=ft.FontWeight.BOLD), width=70),
+            ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+            padding=ft.padding.symmetric(horizontal=8),
+        )
+
+        self.fleet_list = ft.ListView(
+            controls=[ft.Text("Carregando servidores...", italic=True)],
+            spacing=0,
+            expand=True,
+        )
+        self._update_grid()
+
+        return ft.Container(
+            content=ft.Column(
+                [
+                    ft.Row(
+                        [
+                            ft.Text("Monitor da Frota PACS", size=24, weight=ft.FontWeight.BOLD),
+                            ft.IconButton(
+                                icon=ft.Icons.REFRESH,
+                                tooltip="Atualizar todos os hosts",
+                                on_click=self._handle_refresh,
+                            ),
+                        ],
+                        alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
+                    ),
+                    ft.Text(
+                        f"Métricas coletadas dos agentes (porta {AGENT_PORT}) em {len(self.collector.servers)} servidores",
+                        size=14,
+                        color=ft.Colors.GREY_700,
+                    ),
+                    ft.Divider(),
+                    ft.Row([filter_field, sort_dropdown, only_problems_checkbox]),
+                    ft.Row([self.summary_text, self.status_text], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+                    self.progress_bar,
+                    header,
+                    ft.Divider(height=1),
+                    self.fleet_list,
+                ],
+                spacing=10,
+                expand=True,
+            ),
+            padding=20,
+            expand=True,
+        )
+
+    def did_mount(self, page):
+        """Chamado quando o módulo é montado na página"""
+        self.page = page
+        # Uma thread encerrada por will_unmount pode ainda estar no meio de uma coleta;
+        # ela termina sozinha com o próprio evento e uma nova assume a atualização
+        if self.stop_event is None or self.stop_event.is_set():
+            self.stop_event = threading.Event()
+            self.refresh_thread = threading.Thread(
+                target=self._auto_refresh_loop, args=(self.stop_event,), daemon=True
+            )
+            self.refresh_thread.start()
+
+    def will_unmount(self):
+        """Chamado quando o módulo é desmontado da página"""
+        if self.stop_event is not None:
+            self.stop_event.set()
@@ -1,4 +1,8 @@
-import flet as ft
+try:
+    import flet as ft
+except ImportError:
+    # Permite executar o agente em servidores sem interface gráfica
+    ft = None
 import psutil
 import platform
 import datetime
@@ -7,25 +11,863 @@ import time
 import os
 import socket
 import json
+import argparse
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
 from typing import Dict, List, Any
 
+# Métricas mantidas no histórico
+HISTORY_KEYS = ["cpu", "memory", "disk", "network_sent", "network_recv"]
+
+# Configurações padrão do agente sem interface
+AGENT_DEFAULT_HOST = "127.0.0.1"
+AGENT_DEFAULT_PORT = 9910
+AGENT_DEFAULT_HISTORY = 1800  # 1 hora de histórico com intervalo de 2 segundos
+
+# Histórico de alertas (um evento JSON por linha, somente acréscimo)
+ALERTS_LOG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "system_monitor_alerts.jsonl")
+ALERTS_LOG_MAX_BYTES = 1024 * 1024  # ao passar disso o arquivo vira .1 (uma cópia anterior mantida)
+ALERTS_LOG_READ_BLOCK = 64 * 1024  # bytes lidos por vez, do fim do arquivo, ao carregar o histórico
+
+
+class MetricsCollector:
+    """Coleta as métricas do sistema e mantém o histórico em buffers circulares"""
+
+    def __init__(self, max_history_points=60, disk_path="/"):
+        self.disk_path = disk_path
+        self.lock = threading.Lock()
+        self.max_history_points = max_history_points
+        self.history_data = {key: deque(maxlen=max_history_points) for key in HISTORY_KEYS}
+        self.prev_net_io = psutil.net_io_counters()
+        self.last_update = time.time()
+        self.sample_count = 0
+        self.process_tracker = ProcessTracker()
+        self.current = {
+            "timestamp": None,
+            "cpu": 0,
+            "cpu_per_core": [],
+            "memory": 0,
+            "memory_used": 0,
+            "memory_total": 0,
+            "disk": 0,
+            "disk_used": 0,
+            "disk_total": 0,
+            "network_sent": 0,
+            "network_recv": 0,
+        }
+
+    def sample(self) -> Dict[str, Any]:
+        """Lê os contadores do sistema, atualiza o histórico e retorna a amostra"""
+        # CPU
+        cpu_usage = psutil.cpu_percent(interval=0.5)
+        cpu_per_core = psutil.cpu_percent(interval=None, percpu=True)
+
+        # Memória
+        memory = psutil.virtual_memory()
+
+        # Disco
+        disk = psutil.disk_usage(self.disk_path)
+
+        # Rede
+        current_net_io = psutil.net_io_counters()
+        now = time.time()
+        time_diff = max(now - self.last_update, 0.001)
+        network_sent = (current_net_io.bytes_sent - self.prev_net_io.bytes_sent) / time_diff
+        network_recv = (current_net_io.bytes_recv - self.prev_net_io.bytes_recv) / time_diff
+        self.prev_net_io = current_net_io
+        self.last_update = now
+
+        snapshot = {
+            "timestamp": now,
+            "cpu": cpu_usage,
+            "cpu_per_core": cpu_per_core,
+            "memory": memory.percent,
+            "memory_used": memory.used,
+            "memory_total": memory.total,
+            "disk": disk.percent,
+            "disk_used": disk.used,
+            "disk_total": disk.total,
+            "network_sent": network_sent,
+            "network_recv": network_recv,
+        }
+
+        # Atualiza histórico
+        time_label = datetime.datetime.fromtimestamp(now).strftime("%H:%M:%S")
+        with self.lock:
+            self.current = snapshot
+            self.sample_count += 1
+            for key in HISTORY_KEYS:
+                self.history_data[key].append({"time": time_label, "timestamp": now, "value": snapshot[key]})
+
+        return snapshot
+
+    def set_max_history_points(self, max_history_points):
+        """Redimensiona os buffers de histórico mantendo os pontos mais recentes"""
+        with self.lock:
+            self.max_history_points = max_history_points
+            for key in HISTORY_KEYS:
+                self.history_data[key] = deque(self.history_data[key], maxlen=max_history_points)
+
+    def get_current(self) -> Dict[str, Any]:
+        """Retorna uma cópia da última amostra coletada"""
+        with self.lock:
+            return dict(self.current)
+
+    def get_history(self, key=None, points=None):
+        """Retorna o histórico (de uma métrica ou de todas) como listas"""
+        with self.lock:
+            keys = [key] if key else HISTORY_KEYS
+            history = {}
+            for k in keys:
+                values = list(self.history_data[k])
+                history[k] = values[-points:] if points else values
+        return history[key] if key else history
+
+    def collect_processes(self, sort_by="cpu", reverse=True, limit=10):
+        """Atualiza o rastreador de processos e retorna a lista ordenada e limitada"""
+        self.process_tracker.refresh()
+        return self.process_tracker.top(sort_by=sort_by, reverse=reverse, limit=limit)
+
+
+class ProcessTracker:
+    """Acompanha os processos de forma incremental, com histórico curto por PID
+
+    A cada atualização apenas os PIDs novos são abertos (nome, executável, usuário e
+    pai são lidos uma única vez); os demais reaproveitam o objeto psutil.Process já
+    existente e leem CPU, memória e E/S em uma única chamada (oneshot).
+    """
+
+    def __init__(self, history_points=30):
+        self.history_points = history_points
+        self.lock = threading.Lock()
+        self.entries: Dict[int, Dict[str, Any]] = {}
+        self.last_refresh = None
+        self.version = 0  # incrementado a cada refresh(), para a interface saber se há dados novos
+
+    def _open(self, pid):
+        """Abre um processo novo e lê as informações que não mudam"""
+        proc = psutil.Process(pid)
+        with proc.oneshot():
+            info = {
+                "pid": pid,
+                "ppid": proc.ppid(),
+                "name": proc.name(),
+                "create_time": proc.create_time(),
+            }
+            try:
+                info["exe"] = proc.exe() or info["name"]
+            except (psutil.AccessDenied, psutil.ZombieProcess, OSError):
+                info["exe"] = info["name"]
+            try:
+                info["username"] = proc.username()
+            except (psutil.AccessDenied, KeyError):
+                info["username"] = "?"
+        proc.cpu_percent(interval=None)  # inicia a medição de CPU
+        return {
+            "process": proc,
+            "info": info,
+            "cpu_percent": 0.0,
+            "memory_percent": 0.0,
+            "rss": 0,
+            "io_rate": 0.0,
+            "status": "",
+            "num_threads": 0,
+            "prev_io": None,
+            "cpu_history": deque(maxlen=self.history_points),
+            "rss_history": deque(maxlen=self.history_points),
+            "io_history": deque(maxlen=self.history_points),
+        }
+
+    def refresh(self):
+        """Abre os PIDs novos, descarta os encerrados e atualiza os contadores dos demais"""
+        now = time.time()
+        elapsed = max(now - self.last_refresh, 0.001) if self.last_refresh else None
+        current_pids = set(psutil.pids())
+
+        with self.lock:
+            for pid in set(self.entries) - current_pids:
+                del self.entries[pid]
+
+            for pid in current_pids:
+                entry = self.entries.get(pid)
+                try:
+                    if entry is None:
+                        entry = self.entries[pid] = self._open(pid)
+                        continue
+                    proc = entry["process"]
+                    # PID reaproveitado por outro processo: create_time() fica em cache no
+                    # objeto, mas is_running() compara com o tempo de criação atual do PID
+                    if not proc.is_running():
+                        del self.entries[pid]
+                        entry = self.entries[pid] = self._open(pid)
+                        continue
+                    with proc.oneshot():
+                        entry["cpu_percent"] = proc.cpu_percent(interval=None)
+                        memory_info = proc.memory_info()
+                        entry["rss"] = memory_info.rss
+                        entry["memory_percent"] = proc.memory_percent()
+                        entry["status"] = proc.status()
+                        entry["num_threads"] = proc.num_threads()
+                        try:
+                            io = proc.io_counters()
+                            io_total = io.read_bytes + io.write_bytes
+                        except (psutil.AccessDenied, AttributeError, NotImplementedError):
+                            io_total = None
+                except psutil.NoSuchProcess:
+                    self.entries.pop(pid, None)
+                    continue
+                except (psutil.AccessDenied, psutil.ZombieProcess):
+                    continue
+
+                if io_total is not None and entry["prev_io"] is not None and elapsed:
+                    entry["io_rate"] = max(io_total - entry["prev_io"], 0) / elapsed
+                entry["prev_io"] = io_total
+                entry["cpu_history"].append(entry["cpu_percent"])
+                entry["rss_history"].append(entry["rss"])
+                entry["io_history"].append(entry["io_rate"])
+
+        self.last_refresh = now
+        self.version += 1
+
+    def _row(self, entry):
+        return {
+            **entry["info"],
+            "cpu_percent": entry["cpu_percent"],
+            "memory_percent": entry["memory_percent"],
+            "rss": entry["rss"],
+            "io_rate": entry["io_rate"],
+            "status": entry["status"],
+            "num_threads": entry["num_threads"],
+        }
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Retorna o estado atual de todos os processos acompanhados"""
+        with self.lock:
+            return [self._row(entry) for entry in self.entries.values()]
+
+    def top(self, sort_by="cpu", reverse=True, limit=10):
+        """Retorna os processos ordenados e limitados"""
+        processes = self.snapshot()
+        sort_keys = {
+            "cpu": lambda x: x["cpu_percent"],
+            "memory": lambda x: x["memory_percent"],
+            "io": lambda x: x["io_rate"],
+            "pid": lambda x: x["pid"],
+            "name": lambda x: x["name"].lower(),
+        }
+        processes.sort(key=sort_keys.get(sort_by, sort_keys["cpu"]), reverse=reverse)
+        return processes[:limit] if limit else processes
+
+    def history(self, pid) -> Dict[str, List[float]]:
+        """Retorna o histórico de CPU, memória (RSS) e E/S de um processo"""
+        with self.lock:
+            entry = self.entries.get(pid)
+            if entry is None:
+                return {"cpu": [], "rss": [], "io": []}
+            return {
+                "cpu": list(entry["cpu_history"]),
+                "rss": list(entry["rss_history"]),
+                "io": list(entry["io_history"]),
+            }
+
+    def tree(self, processes=None):
+        """Organiza os processos em árvore; retorna lista de (profundidade, processo)"""
+        processes = processes if processes is not None else self.snapshot()
+        by_pid = {proc["pid"]: proc for proc in processes}
+        children: Dict[int, List[Dict[str, Any]]] = {}
+        roots = []
+        for proc in processes:
+            if proc["ppid"] in by_pid and proc["ppid"] != proc["pid"]:
+                children.setdefault(proc["ppid"], []).append(proc)
+            else:
+                roots.append(proc)
+
+        ordered = []
+        stack = [(0, proc) for proc in sorted(roots, key=lambda x: x["pid"], reverse=True)]
+        while stack:
+            depth, proc = stack.pop()
+            ordered.append((depth, proc))
+            for child in sorted(children.get(proc["pid"], []), key=lambda x: x["pid"], reverse=True):
+                stack.append((depth + 1, child))
+        return ordered
+
+    def groups(self, by="exe", processes=None):
+        """Agrupa os processos por executável ou usuário, somando os recursos"""
+        processes = processes if processes is not None else self.snapshot()
+        groups: Dict[str, Dict[str, Any]] = {}
+        for proc in processes:
+            key = proc.get(by) or "?"
+            group = groups.setdefault(key, {
+                "key": key, "count": 0, "cpu_percent": 0.0, "memory_percent": 0.0,
+                "rss": 0, "io_rate": 0.0, "pids": [],
+            })
+            group["count"] += 1
+            group["cpu_percent"] += proc["cpu_percent"]
+            group["memory_percent"] += proc["memory_percent"]
+            group["rss"] += proc["rss"]
+            group["io_rate"] += proc["io_rate"]
+            group["pids"].append(proc["pid"])
+        return sorted(groups.values(), key=lambda g: g["cpu_percent"], reverse=True)
+
+    def search(self, query, processes=None):
+        """Filtra por nome, executável, usuário ou PID"""
+        processes = processes if processes is not None else self.snapshot()
+        query = query.strip().lower()
+        if not query:
+            return processes
+        return [
+            proc for proc in processes
+            if query in proc["name"].lower()
+            or query in proc["exe"].lower()
+            or query in proc["username"].lower()
+            or query == str(proc["pid"])
+        ]
+
+
+class ThresholdRule:
+    """Regra de limite avaliada sobre uma janela deslizante, com histerese para encerrar
+
+    Modos:
+        "sustained": dispara quando todas as amostras da janela ficam acima do limite
+        "average": dispara quando a média da janela fica acima do limite
+    O alerta só é encerrado quando o valor fica abaixo de clear_threshold por clear_window segundos.
+    """
+
+    def __init__(self, rule_id, metric, threshold, window=300, mode="sustained",
+                 clear_threshold=None, clear_window=60, severity="warning", label=None):
+        self.rule_id = rule_id
+        self.metric = metric
+        self.threshold = threshold
+        self.window = window
+        self.mode = mode
+        self.clear_threshold = clear_threshold if clear_threshold is not None else threshold - 5
+        self.clear_window = clear_window
+        self.severity = severity
+        self.label = label or metric
+        self.reset()
+
+    def reset(self):
+        self.samples = deque()  # (timestamp, valor) dentro da janela
+        self.window_sum = 0.0
+        self.above_since = None
+        self.below_since = None
+
+    def configure(self, other):
+        """Adota os limites e a janela de outra regra, mantendo as amostras já coletadas"""
+        self.threshold = other.threshold
+        self.window = other.window
+        self.mode = other.mode
+        self.clear_threshold = other.clear_threshold
+        self.clear_window = other.clear_window
+        self.severity = other.severity
+        self.label = other.label
+        # Os marcadores só valem se a última amostra ainda estiver do mesmo lado dos novos limites
+        last_value = self.samples[-1][1] if self.samples else None
+        if last_value is None or last_value <= self.threshold:
+            self.above_since = None
+        if last_value is None or last_value >= self.clear_threshold:
+            self.below_since = None
+
+    def update(self, timestamp, value):
+        """Adiciona uma amostra à janela em custo constante (amortizado)"""
+        self.samples.append((timestamp, value))
+        self.window_sum += value
+        while self.samples and self.samples[0][0] < timestamp - self.window:
+            self.window_sum -= self.samples.popleft()[1]
+
+        if value > self.threshold:
+            if self.above_since is None:
+                self.above_since = timestamp
+        else:
+            self.above_since = None
+
+        if value < self.clear_threshold:
+            if self.below_since is None:
+                self.below_since = timestamp
+        else:
+            self.below_since = None
+
+    def current_value(self):
+        if self.mode == "average" and self.samples:
+            return self.window_sum / len(self.samples)
+        return self.samples[-1][1] if self.samples else 0
+
+    def should_fire(self, timestamp) -> bool:
+        if self.mode == "average":
+            window_filled = self.samples and (timestamp - self.samples[0][0]) >= self.window * 0.9
+            return bool(window_filled) and self.current_value() > self.threshold
+        return self.above_since is not None and (timestamp - self.above_since) >= self.window
+
+    def should_clear(self, timestamp) -> bool:
+        return self.below_since is not None and (timestamp - self.below_since) >= self.clear_window
+
+    def describe(self, value) -> str:
+        minutes = self.window / 60
+        qualifier = "em média" if self.mode == "average" else "contínuo"
+        if self.window:
+            return f"{self.label} acima de {self.threshold:.0f}% por {minutes:.0f} min ({qualifier}) - atual: {value:.1f}%"
+        return f"{self.label} acima de {self.threshold:.0f}% - atual: {value:.1f}%"
+
+
+class RateRule:
+    """Regra de taxa de variação (ex.: velocidade de preenchimento do disco)
+
+    A inclinação é calculada por mínimos quadrados sobre a janela, mantendo somatórios
+    incrementais para que cada amostra tenha custo constante. A taxa é expressa em
+    pontos percentuais por hora.
+    """
+
+    def __init__(self, rule_id, metric, rate_per_hour, window=1800, clear_rate=None,
+                 min_samples=10, severity="warning", label=None):
+        self.rule_id = rule_id
+        self.metric = metric
+        self.threshold = rate_per_hour
+        self.window = window
+        self.clear_threshold = clear_rate if clear_rate is not None else rate_per_hour / 2
+        self.min_samples = min_samples
+        self.severity = severity
+        self.label = label or metric
+        self.reset()
+
+    def reset(self):
+        self.samples = deque()
+        self.origin = None
+        self.sum_t = self.sum_v = self.sum_tt = self.sum_tv = 0.0
+        self.last_value = 0
+
+    def configure(self, other):
+        """Adota a taxa e a janela de outra regra, mantendo as amostras e os somatórios"""
+        self.threshold = other.threshold
+        self.window = other.window
+        self.clear_threshold = other.clear_threshold
+        self.min_samples = other.min_samples
+        self.severity = other.severity
+        self.label = other.label
+
+    def _add(self, t, v, sign):
+        self.sum_t += sign * t
+        self.sum_v += sign * v
+        self.sum_tt += sign * t * t
+        self.sum_tv += sign * t * v
+
+    def update(self, timestamp, value):
+        if self.origin is None:
+            self.origin = timestamp
+        elif timestamp - self.origin > 86400:
+            self._rebase(timestamp)
+        t = (timestamp - self.origin) / 3600  # horas, relativo à primeira amostra
+        self.samples.append((timestamp, t, value))
+        self._add(t, value, 1)
+        while self.samples and self.samples[0][0] < timestamp - self.window:
+            _, old_t, old_v = self.samples.popleft()
+            self._add(old_t, old_v, -1)
+        self.last_value = value
+
+    def _rebase(self, timestamp):
+        """Recalcula os somatórios com uma nova origem para evitar perda de precisão"""
+        self.origin = timestamp
+        samples = [(ts, v) for ts, _, v in self.samples]
+        self.samples.clear()
+        self.sum_t = self.sum_v = self.sum_tt = self.sum_tv = 0.0
+        for ts, v in samples:
+            t = (ts - self.origin) / 3600
+            self.samples.append((ts, t, v))
+            self._add(t, v, 1)
+
+    def current_value(self):
+        """Inclinação da janela em pontos percentuais por hora"""
+        n = len(self.samples)
+        if n < 2:
+            return 0.0
+        denominator = n * self.sum_tt - self.sum_t * self.sum_t
+        if abs(denominator) < 1e-12:
+            return 0.0
+        return (n * self.sum_tv - self.sum_t * self.sum_v) / denominator
+
+    def should_fire(self, timestamp) -> bool:
+        return len(self.samples) >= self.min_samples and self.current_value() > self.threshold
+
+    def should_clear(self, timestamp) -> bool:
+        return self.current_value() < self.clear_threshold
+
+    def describe(self, value) -> str:
+        message = f"{self.label} crescendo {value:.2f}%/h"
+        if value > 0:
+            hours_to_full = (100 - self.last_value) / value
+            message += f" (cheio em ~{hours_to_full:.1f} h)"
+        return message
+
+
+class AlertEngine:
+    """Avalia as regras a cada amostra, deduplica alertas ativos e registra o histórico"""
+
+    def __init__(self, rules, log_file=None, regroup_window=600):
+        self.rules = {rule.rule_id: rule for rule in rules}
+        self.log_file = log_file
+        self.regroup_window = regroup_window  # segundos para agrupar reincidências
+        self.lock = threading.Lock()
+        self.active: Dict[str, Dict[str, Any]] = {}
+        self.last_cleared: Dict[str, Dict[str, Any]] = {}
+
+    def set_rule(self, rule):
+        """Adiciona uma regra ou atualiza no lugar a existente, mantendo o alerta ativo se houver
+
+        Uma regra já registrada do mesmo tipo só recebe a nova configuração, para que
+        as janelas e a base da taxa não recomecem a cada alteração dos limites.
+        """
+        with self.lock:
+            existing = self.rules.get(rule.rule_id)
+            if existing is not None and type(existing) is type(rule):
+                existing.configure(rule)
+            else:
+                self.rules[rule.rule_id] = rule
+
+    def evaluate(self, snapshot) -> List[Dict[str, Any]]:
+        """Atualiza as regras com a amostra e retorna os eventos gerados (disparo/encerramento)"""
+        timestamp = snapshot.get("timestamp") or time.time()
+        events = []
+        with self.lock:
+            for rule in self.rules.values():
+                if rule.metric not in snapshot:
+                    continue
+                rule.update(timestamp, snapshot[rule.metric])
+                value = rule.current_value()
+                alert = self.active.get(rule.rule_id)
+
+                if alert is None and rule.should_fire(timestamp):
+                    alert = self._open_alert(rule, timestamp, value)
+                    events.append(self._event("fire", alert, timestamp))
+                elif alert is not None:
+                    alert["last_value"] = value
+                    alert["peak"] = max(alert["peak"], value)
+                    if rule.should_clear(timestamp):
+                        del self.active[rule.rule_id]
+                        self.last_cleared[rule.rule_id] = alert
+                        events.append(self._event("clear", alert, timestamp))
+
+        for event in events:
+            self._append_log(event)
+        return events
+
+    def _open_alert(self, rule, timestamp, value):
+        previous = self.last_cleared.get(rule.rule_id)
+        regrouped = previous is not None and (timestamp - previous["cleared_at"]) < self.regroup_window
+        alert = {
+            "rule_id": rule.rule_id,
+            "metric": rule.metric,
+            "severity": rule.severity,
+            "message": rule.describe(value),
+            "started_at": previous["started_at"] if regrouped else timestamp,
+            "last_value": value,
+            "peak": max(value, previous["peak"]) if regrouped else value,
+            "occurrences": previous["occurrences"] + 1 if regrouped else 1,
+            "regrouped": regrouped,
+        }
+        self.active[rule.rule_id] = alert
+        return alert
+
+    def _event(self, kind, alert, timestamp):
+        if kind == "clear":
+            alert["cleared_at"] = timestamp
+        return {
+            "event": kind,
+            "timestamp": timestamp,
+            "time": datetime.datetime.fromtimestamp(timestamp).isoformat(timespec="seconds"),
+            **{k: v for k, v in alert.items() if k != "cleared_at"},
+        }
+
+    def _append_log(self, event):
+        """Acrescenta o evento ao histórico em disco (um JSON por linha)"""
+        if not self.log_file:
+            return
+        try:
+            if os.path.exists(self.log_file) and os.path.getsize(self.log_file) > ALERTS_LOG_MAX_BYTES:
+                os.replace(self.log_file, self.log_file + ".1")
+            with open(self.log_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(event, ensure_ascii=False) + "\n")
+        except Exception as e:
+            print(f"Erro ao registrar alerta: {e}")
+
+    def get_active(self) -> List[Dict[str, Any]]:
+        with self.lock:
+            return [dict(alert) for alert in self.active.values()]
+
+    def load_history(self, limit=200) -> List[Dict[str, Any]]:
+        """Lê os eventos mais recentes do histórico em disco, do mais novo ao mais antigo
+
+        Lê o arquivo de trás para frente em blocos, parando quando já há linhas suficientes;
+        a cópia anterior (.1) só é consultada se o arquivo atual não tiver o bastante.
+        """
+        events = []
+        if not self.log_file:
+            return events
+        for path in (self.log_file, self.log_file + ".1"):
+            if len(events) >= limit or not os.path.exists(path):
+                continue
+            try:
+                events.extend(self._read_tail(path, limit - len(events)))
+            except Exception as e:
+                print(f"Erro ao ler histórico de alertas: {e}")
+        return events
+
+    @staticmethod
+    def _read_tail(path, limit) -> List[Dict[str, Any]]:
+        with open(path, "rb") as f:
+            position = f.seek(0, os.SEEK_END)
+            data = b""
+            while position > 0 and data.count(b"\n") <= limit:
+                size = min(ALERTS_LOG_READ_BLOCK, position)
+                position -= size
+                f.seek(position)
+                data = f.read(size) + data
+        lines = data.split(b"\n")
+        if position > 0:
+            lines = lines[1:]  # a primeira linha do bloco pode estar incompleta
+        events = []
+        for line in reversed(lines):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                events.append(json.loads(line))
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue
+            if len(events) >= limit:
+                break
+        return events
+
+def build_alert_rules(thresholds, window=300) -> List[Any]:
+    """Cria as regras padrão a partir dos limites configurados"""
+    return [
+        ThresholdRule("cpu", "cpu", thresholds["cpu"], window=window, mode="average",
+                      clear_threshold=thresholds["cpu"] - 10, label="CPU"),
+        ThresholdRule("memory", "memory", thresholds["memory"], window=window, mode="sustained",
+                      clear_threshold=thresholds["memory"] - 5, label="Memória"),
+        ThresholdRule("disk", "disk", thresholds["disk"], window=0, mode="sustained",
+                      clear_threshold=thresholds["disk"] - 2, clear_window=300, severity="critical", label="Disco"),
+        RateRule("disk_fill_rate", "disk", rate_per_hour=2.0, window=1800, label="Disco"),
+    ]
+
+
+def get_system_info() -> Dict[str, str]:
+    """Retorna as informações estáticas do sistema"""
+    try:
+        local_ip = socket.gethostbyname(socket.gethostname())
+    except OSError:
+        local_ip = "127.0.0.1"
+    return {
+        "system": platform.system(),
+        "version": platform.version(),
+        "processor": platform.processor(),
+        "architecture": platform.machine(),
+        "hostname": platform.node(),
+        "python": platform.python_version(),
+        "ip": local_ip,
+    }
+
+
+class MetricsAgent:
+    """Executa o coletor sem interface e expõe as métricas via HTTP (Prometheus e JSON)"""
+
+    def __init__(self, host=AGENT_DEFAULT_HOST, port=AGENT_DEFAULT_PORT, interval=2,
+                 max_history_points=AGENT_DEFAULT_HISTORY):
+        self.host = host
+        self.port = port
+        self.interval = interval
+        self.collector = MetricsCollector(max_history_points=max_history_points)
+        self.alert_engine = AlertEngine(build_alert_rules({"cpu": 80, "memory": 80, "disk": 90}),
+                                        log_file=ALERTS_LOG_FILE)
+        self.system_info = get_system_info()
+        self.started_at = time.time()
+        self.stop_event = threading.Event()
+        self.sampler_thread = None
+        self.server = None
+
+    def _sampler_loop(self):
+        while not self.stop_event.is_set():
+            try:
+                snapshot = self.collector.sample()
+                for event in self.alert_engine.evaluate(snapshot):
+                    print(f"[{event['time']}] {event['event']}: {event['message']}")
+            except Exception as e:
+                print(f"Erro ao coletar métricas: {e}")
+            self.stop_event.wait(self.interval)
+
+    def start(self):
+        """Inicia a coleta em segundo plano e cria o servidor HTTP"""
+        self.sampler_thread = threading.Thread(target=self._sampler_loop, daemon=True)
+        self.sampler_thread.start()
+        self.server = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+        self.server.daemon_threads = True
+
+    def serve_forever(self):
+        """Inicia o agente e atende requisições até ser interrompido"""
+        if not self.server:
+            self.start()
+        print(f"Agente de métricas em http://{self.host}:{self.server.server_address[1]} "
+              f"(/metrics, /metrics.json, /history.json, /alerts.json)")
+        try:
+            self.server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stop(self):
+        """Para a coleta e encerra o servidor HTTP"""
+        self.stop_event.set()
+        if self.server:
+            self.server.server_close()
+
+    def render_json(self) -> Dict[str, Any]:
+        """Retorna a amostra atual com as informações do host"""
+        return {
+            "host": self.system_info,
+            "uptime": time.time() - self.started_at,
+            "samples": self.collector.sample_count,
+            "current": self.collector.get_current(),
+            "alerts": self.alert_engine.get_active(),
+        }
+
+    def render_history(self, metric=None, points=None) -> Dict[str, Any]:
+        """Retorna o histórico de uma métrica ou de todas"""
+        if metric and metric not in HISTORY_KEYS:
+            raise KeyError(metric)
+        history = self.collector.get_history(metric, points)
+        return {metric: history} if metric else history
+
+    def render_prometheus(self) -> str:
+        """Formata a amostra atual no formato de exposição de texto do Prometheus"""
+        current = self.collector.get_current()
+        hostname = _prometheus_escape(self.system_info["hostname"])
+        lines = []
+
+        def metric(name, help_text, metric_type, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for labels, value in samples:
+                labels = dict(labels, host=hostname)
+                label_text = ",".join(f'{k}="{v}"' for k, v in sorted(labels.items()))
+                lines.append(f"{name}{{{label_text}}} {value}")
+
+        metric("ogs_cpu_usage_percent", "Uso total de CPU em percentual.", "gauge",
+               [({}, current["cpu"])])
+        metric("ogs_cpu_core_usage_percent", "Uso de CPU por núcleo em percentual.", "gauge",
+               [({"core": str(i)}, v) for i, v in enumerate(current["cpu_per_core"])])
+        metric("ogs_memory_usage_percent", "Uso de memória em percentual.", "gauge",
+               [({}, current["memory"])])
+        metric("ogs_memory_used_bytes", "Memória utilizada em bytes.", "gauge",
+               [({}, current["memory_used"])])
+        metric("ogs_memory_total_bytes", "Memória total em bytes.", "gauge",
+               [({}, current["memory_total"])])
+        disk_label = {"path": _prometheus_escape(self.collector.disk_path)}
+        metric("ogs_disk_usage_percent", "Uso de disco em percentual.", "gauge",
+               [(disk_label, current["disk"])])
+        metric("ogs_disk_used_bytes", "Espaço em disco utilizado em bytes.", "gauge",
+               [(disk_label, current["disk_used"])])
+        metric("ogs_disk_total_bytes", "Espaço total em disco em bytes.", "gauge",
+               [(disk_label, current["disk_total"])])
+        metric("ogs_network_sent_bytes_per_second", "Taxa de envio de rede em bytes por segundo.", "gauge",
+               [({}, current["network_sent"])])
+        metric("ogs_network_recv_bytes_per_second", "Taxa de recebimento de rede em bytes por segundo.", "gauge",
+               [({}, current["network_recv"])])
+        metric("ogs_alert_active", "Alertas ativos por regra (1 = ativo).", "gauge",
+               [({"rule": a["rule_id"], "severity": a["severity"]}, 1) for a in self.alert_engine.get_active()])
+        metric("ogs_agent_samples_total", "Total de amostras coletadas pelo agente.", "counter",
+               [({}, self.collector.sample_count)])
+        metric("ogs_agent_last_sample_timestamp_seconds", "Horário da última amostra (epoch).", "gauge",
+               [({}, current["timestamp"] or 0)])
+        return "\n".join(lines) + "\n"
+
+    def _make_handler(self):
+        agent = self
+
+        class AgentRequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+                try:
+                    if url.path == "/metrics":
+                        self._send(200, agent.render_prometheus(), "text/plain; version=0.0.4; charset=utf-8")
+                    elif url.path == "/metrics.json":
+                        self._send_json(200, agent.render_json())
+                    elif url.path == "/history.json":
+                        metric = query.get("metric", [None])[0]
+                        points = int(query["points"][0]) if "points" in query else None
+                        self._send_json(200, agent.render_history(metric, points))
+                    elif url.path == "/alerts.json":
+                        limit = int(query["limit"][0]) if "limit" in query else 100
+                        self._send_json(200, {
+                            "active": agent.alert_engine.get_active(),
+                            "history": agent.alert_engine.load_history(limit),
+                        })
+                    elif url.path == "/health":
+                        self._send_json(200, {"status": "ok"})
+                    else:
+                        self._send_json(404, {"error": "não encontrado"})
+                except (KeyError, ValueError) as e:
+                    self._send_json(400, {"error": f"parâmetro inválido: {e}"})
+
+            def _send_json(self, status, data):
+                self._send(status, json.dumps(data, default=str), "application/json; charset=utf-8")
+
+            def _send(self, status, body, content_type):
+                payload = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                # Evita poluir o console a cada coleta do Prometheus
+                pass
+
+        return AgentRequestHandler
+
+
+def _prometheus_escape(value) -> str:
+    """Escapa um valor de rótulo do Prometheus"""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _sparkline(values, max_value=None) -> str:
+    """Gera um minigráfico em texto com blocos Unicode"""
+    if not values:
+        return ""
+    blocks = "▁▂▃▄▅▆▇█"
+    top = max_value or max(values) or 1
+    return "".join(blocks[min(int(v / top * (len(blocks) - 1)), len(blocks) - 1)] for v in values)
+
+
 class Module:
     def __init__(self):
         self.update_interval = 2  # segundos
-        self.stop_thread = False
+        self.stop_event = None  # um evento por ciclo de montagem, compartilhado pelas duas threads
         self.update_thread = None
+        self.render_thread = None
+        self.render_fps = 4  # limite de atualizações da interface por segundo
+        self.data_ready = threading.Event()
+        self.last_render_time = 0
+        self.rendered_sample_count = -1
+        self.rendered_process_rows = []
+        self.process_rows = []
+        self.explorer_open = False
+        self.explorer_mode = "tree"
+        self.explorer_query = ""
+        self.explorer_max_rows = 200
+        self.explorer_lock = threading.Lock()  # a lista é atualizada pela renderização e pela busca
+        self.explorer_rendered_key = None
+        self.explorer_rows = {"process": [], "group": []}  # linhas reaproveitadas por tipo
         self.cpu_usage = 0
         self.memory_usage = 0
         self.disk_usage = 0
         self.network_sent = 0
         self.network_recv = 0
-        self.prev_net_io = psutil.net_io_counters()
-        self.last_update = datetime.datetime.now()
         self.page = None
-        self.cpu_history = []
-        self.memory_history = []
-        self.disk_history = []
         self.max_history_points = 60  # 2 minutos de histórico com intervalo de 2 segundos
+        self.collector = MetricsCollector(max_history_points=self.max_history_points)
         self.processes = []
         self.show_processes = True
         self.sort_by = "cpu"  # Ordenar processos por CPU por padrão
@@ -34,21 +876,17 @@ class Module:
         self.chart_height = 200
         self.chart_width = 600
         self.theme_mode = "light"
-        self.history_data = {
-            "cpu": [],
-            "memory": [],
-            "disk": [],
-            "network_sent": [],
-            "network_recv": []
-        }
         self.alert_thresholds = {
             "cpu": 80,
             "memory": 80,
             "disk": 90
         }
         self.alerts_enabled = True
-        self.last_alert_time = {}
-        self.alert_cooldown = 60  # segundos entre alertas do mesmo tipo
+        self.alert_window = 300  # segundos que o recurso precisa ficar acima do limite
+        self.alert_engine = AlertEngine(
+            build_alert_rules(self.alert_thresholds, self.alert_window),
+            log_file=ALERTS_LOG_FILE,
+        )
         
     def get_module_info(self):
         return {
@@ -59,190 +897,202 @@ class Module:
             "color": ft.Colors.BLUE,
         }
     
-    def _update_stats(self):
-        while not self.stop_thread:
+    def _update_stats(self, stop_event):
+        while not stop_event.is_set():
             try:
-                # CPU
-                self.cpu_usage = psutil.cpu_percent(interval=0.5)
-                cpu_per_core = psutil.cpu_percent(interval=0.1, percpu=True)
-                
-                # Memória
-                memory = psutil.virtual_memory()
-                self.memory_usage = memory.percent
-                
-                # Disco
-                disk = psutil.disk_usage('/')
-                self.disk_usage = disk.percent
-                
-                # Rede
-                current_net_io = psutil.net_io_counters()
-                time_diff = (datetime.datetime.now() - self.last_update).total_seconds()
-                
-                self.network_sent = (current_net_io.bytes_sent - self.prev_net_io.bytes_sent) / time_diff
-                self.network_recv = (current_net_io.bytes_recv - self.prev_net_io.bytes_recv) / time_diff
-                
-                self.prev_net_io = current_net_io
-                self.last_update = datetime.datetime.now()
-                
-                # Atualiza histórico
-                timestamp = datetime.datetime.now().strftime("%H:%M:%S")
-                
-                self.history_data["cpu"].append({"time": timestamp, "value": self.cpu_usage})
-                self.history_data["memory"].append({"time": timestamp, "value": self.memory_usage})
-                self.history_data["disk"].append({"time": timestamp, "value": self.disk_usage})
-                self.history_data["network_sent"].append({"time": timestamp, "value": self.network_sent})
-                self.history_data["network_recv"].append({"time": timestamp, "value": self.network_recv})
-                
-                # Limita o tamanho do histórico
-                for key in self.history_data:
-                    if len(self.history_data[key]) > self.max_history_points:
-                        self.history_data[key] = self.history_data[key][-self.max_history_points:]
+                snapshot = self.collector.sample()
+                self.cpu_usage = snapshot["cpu"]
+                self.memory_usage = snapshot["memory"]
+                self.disk_usage = snapshot["disk"]
+                self.network_sent = snapshot["network_sent"]
+                self.network_recv = snapshot["network_recv"]
                 
                 # Atualiza lista de processos
-                if self.show_processes:
-                    self.processes = []
-                    for proc in psutil.process_iter(['pid', 'name', 'username', 'cpu_percent', 'memory_percent', 'create_time', 'status']):
-                        try:
-                            pinfo = proc.info
-                            pinfo['cpu_percent'] = proc.cpu_percent(interval=0.1)
-                            self.processes.append(pinfo)
-                        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                            pass
-                    
-                    # Ordena processos
-                    if self.sort_by == "cpu":
-                        self.processes.sort(key=lambda x: x['cpu_percent'], reverse=self.sort_reverse)
-                    elif self.sort_by == "memory":
-                        self.processes.sort(key=lambda x: x['memory_percent'], reverse=self.sort_reverse)
-                    elif self.sort_by == "pid":
-                        self.processes.sort(key=lambda x: x['pid'], reverse=self.sort_reverse)
-                    elif self.sort_by == "name":
-                        self.processes.sort(key=lambda x: x['name'].lower(), reverse=self.sort_reverse)
-                    
-                    # Limita o número de processos
-                    self.processes = self.processes[:self.max_processes]
+                if self.explorer_open and not self.show_processes:
+                    self.collector.process_tracker.refresh()
+                elif self.show_processes:
+                    self.processes = self.collector.collect_processes(
+                        sort_by=self.sort_by,
+                        reverse=self.sort_reverse,
+                        limit=self.max_processes,
+                    )
                 
-                # Verifica alertas
-                if self.alerts_enabled:
-                    self._check_alerts()
+                # Verifica alertas (as regras são sempre alimentadas para manter as janelas)
+                self._check_alerts(snapshot)
                 
-                # Atualiza a interface
-                if hasattr(self, 'page') and self.page:
-                    self._update_ui()
+                # Sinaliza a thread de renderização; a interface não é tocada aqui
+                self.data_ready.set()
             except Exception as e:
                 print(f"Erro ao atualizar estatísticas: {e}")
             
-            time.sleep(self.update_interval)
+            stop_event.wait(self.update_interval)
     
-    def _check_alerts(self):
-        """Verifica se algum recurso ultrapassou o limite e exibe alertas"""
-        current_time = time.time()
-        
-        # Verifica CPU
-        if self.cpu_usage > self.alert_thresholds["cpu"]:
-            if "cpu" not in self.last_alert_time or (current_time - self.last_alert_time["cpu"]) > self.alert_cooldown:
-                self.last_alert_time["cpu"] = current_time
+    def _render_loop(self, stop_event):
+        """Aplica os dados coletados na interface, agrupando atualizações e limitando ao FPS alvo"""
+        while not stop_event.is_set():
+            if not self.data_ready.wait(timeout=1):
+                continue
+            if stop_event.is_set():
+                break
+            
+            # Espera o restante do quadro; amostras que chegarem nesse intervalo são agrupadas
+            frame_interval = 1.0 / max(self.render_fps, 0.1)
+            remaining = self.last_render_time + frame_interval - time.time()
+            if remaining > 0:
+                time.sleep(remaining)
+            self.data_ready.clear()
+            
+            try:
                 if self.page:
-                    self.page.show_snack_bar(
-                        ft.SnackBar(
-                            content=ft.Text(f"Alerta: Uso de CPU acima de {self.alert_thresholds['cpu']}% (Atual: {self.cpu_usage:.1f}%)"),
-                            bgcolor=ft.Colors.RED_700,
-                            action="OK",
-                        )
-                    )
+                    self._update_ui()
+            except Exception as e:
+                print(f"Erro ao atualizar interface: {e}")
+            self.last_render_time = time.time()
+    
+    def _set_if_changed(self, control, dirty, **values):
+        """Altera as propriedades do controle apenas se diferirem do último valor renderizado"""
+        changed = False
+        for name, value in values.items():
+            if getattr(control, name) != value:
+                setattr(control, name, value)
+                changed = True
+        if changed:
+            dirty.append(control)
+    
+    def _check_alerts(self, snapshot):
+        """Avalia as regras de alerta com a nova amostra e exibe os eventos gerados"""
+        events = self.alert_engine.evaluate(snapshot)
         
-        # Verifica Memória
-        if self.memory_usage > self.alert_thresholds["memory"]:
-            if "memory" not in self.last_alert_time or (current_time - self.last_alert_time["memory"]) > self.alert_cooldown:
-                self.last_alert_time["memory"] = current_time
-                if self.page:
-                    self.page.show_snack_bar(
-                        ft.SnackBar(
-                            content=ft.Text(f"Alerta: Uso de Memória acima de {self.alert_thresholds['memory']}% (Atual: {self.memory_usage:.1f}%)"),
-                            bgcolor=ft.Colors.RED_700,
-                            action="OK",
-                        )
-                    )
+        if not self.alerts_enabled or not self.page:
+            return
         
-        # Verifica Disco
-        if self.disk_usage > self.alert_thresholds["disk"]:
-            if "disk" not in self.last_alert_time or (current_time - self.last_alert_time["disk"]) > self.alert_cooldown:
-                self.last_alert_time["disk"] = current_time
-                if self.page:
-                    self.page.show_snack_bar(
-                        ft.SnackBar(
-                            content=ft.Text(f"Alerta: Uso de Disco acima de {self.alert_thresholds['disk']}% (Atual: {self.disk_usage:.1f}%)"),
-                            bgcolor=ft.Colors.RED_700,
-                            action="OK",
-                        )
-                    )
+        for event in events:
+            if event["event"] == "fire":
+                prefix = "Alerta" if event["occurrences"] == 1 else f"Alerta (reincidência {event['occurrences']}x)"
+                message = f"{prefix}: {event['message']}"
+                bgcolor = ft.Colors.RED_700
+            else:
+                minutes = max(1, int((event["timestamp"] - event["started_at"]) / 60))
+                message = f"Encerrado após {minutes} min: {event['message'].split(' - ')[0]} (pico: {event['peak']:.1f})"
+                bgcolor = ft.Colors.GREEN_700
+            self.page.show_snack_bar(
+                ft.SnackBar(
+                    content=ft.Text(message),
+                    bgcolor=bgcolor,
+                    action="OK",
+                )
+            )
     
-    def _update_ui(self):
-        """Atualiza todos os elementos da interface"""
-        # Atualiza indicadores principais
-        self.cpu_text.value = f"{self.cpu_usage:.1f}%"
-        self.cpu_progress.value = self.cpu_usage / 100
-        self.cpu_progress.color = self._get_status_color(self.cpu_usage, self.alert_thresholds["cpu"])
+    def _rebuild_alert_rules(self):
+        """Aplica os limites atuais às regras, mantendo as janelas e os alertas ativos"""
+        for rule in build_alert_rules(self.alert_thresholds, self.alert_window):
+            self.alert_engine.set_rule(rule)
+    
+    def _show_alert_history_dialog(self, e):
+        """Exibe os alertas ativos e o histórico registrado em disco"""
+        active_alerts = self.alert_engine.get_active()
+        history = self.alert_engine.load_history(limit=100)
         
-        self.memory_text.value = f"{self.memory_usage:.1f}%"
-        self.memory_progress.value = self.memory_usage / 100
-        self.memory_progress.color = self._get_status_color(self.memory_usage, self.alert_thresholds["memory"])
+        active_controls = [
+            ft.Row([
+                ft.Icon(ft.Icons.WARNING, color=ft.Colors.RED, size=16),
+                ft.Text(alert["message"], size=13, expand=True),
+                ft.Text(f"{alert['occurrences']}x", size=12, color=ft.Colors.GREY_700),
+            ])
+            for alert in active_alerts
+        ] or [ft.Text("Nenhum alerta ativo", italic=True, color=ft.Colors.GREY_500)]
         
-        self.disk_text.value = f"{self.disk_usage:.1f}%"
-        self.disk_progress.value = self.disk_usage / 100
-        self.disk_progress.color = self._get_status_color(self.disk_usage, self.alert_thresholds["disk"])
+        history_controls = [
+            ft.Row([
+                ft.Icon(
+                    ft.Icons.NOTIFICATION_IMPORTANT if event["event"] == "fire" else ft.Icons.CHECK_CIRCLE,
+                    color=ft.Colors.RED if event["event"] == "fire" else ft.Colors.GREEN,
+                    size=16,
+                ),
+                ft.Text(event.get("time", ""), size=12, color=ft.Colors.GREY_700, width=150),
+                ft.Text(event.get("message", ""), size=12, expand=True),
+            ])
+            for event in history
+        ] or [ft.Text("Nenhum alerta registrado", italic=True, color=ft.Colors.GREY_500)]
         
-        self.network_sent_text.value = f"{self._format_bytes(self.network_sent)}/s"
-        self.network_recv_text.value = f"{self._format_bytes(self.network_recv)}/s"
+        history_dialog = ft.AlertDialog(
+            title=ft.Text("Alertas"),
+            content=ft.Column(
+                [
+                    ft.Text("Ativos", weight=ft.FontWeight.BOLD),
+                    *active_controls,
+                    ft.Divider(),
+                    ft.Text("Histórico", weight=ft.FontWeight.BOLD),
+                    *history_controls,
+                ],
+                scroll=ft.ScrollMode.AUTO,
+                height=400,
+                width=600,
+            ),
+            actions=[
+                ft.TextButton("Fechar", on_click=lambda e: setattr(history_dialog, "open", False)),
+            ],
+            actions_alignment=ft.MainAxisAlignment.END,
+        )
+        
+        self.page.dialog = history_dialog
+        history_dialog.open = True
+        self.page.update()
+    
+    def _update_ui(self):
+        """Atualiza apenas os elementos da interface cujos valores mudaram"""
+        dirty = []
+        
+        # Atualiza indicadores principais
+        for name, usage in (("cpu", self.cpu_usage), ("memory", self.memory_usage), ("disk", self.disk_usage)):
+            self._set_if_changed(getattr(self, f"{name}_text"), dirty, value=f"{usage:.1f}%")
+            self._set_if_changed(
+                getattr(self, f"{name}_progress"),
+                dirty,
+                value=round(usage / 100, 3),
+                color=self._get_status_color(usage, self.alert_thresholds[name]),
+            )
+        
+        self._set_if_changed(self.network_sent_text, dirty, value=f"{self._format_bytes(self.network_sent)}/s")
+        self._set_if_changed(self.network_recv_text, dirty, value=f"{self._format_bytes(self.network_recv)}/s")
         
         # Atualiza gráficos
-        self._update_charts()
+        dirty.extend(self._update_charts())
         
         # Atualiza lista de processos
         if self.show_processes and hasattr(self, 'process_list'):
-            self._update_process_list()
+            if self._update_process_list():
+                dirty.append(self.process_list)
         
-        # Atualiza a página
-        self.page.update()
+        # Atualiza o explorador de processos, se aberto
+        if self.explorer_open and self._update_process_explorer():
+            dirty.extend([self.explorer_status, self.explorer_list])
+        
+        # Envia somente os controles alterados
+        if dirty:
+            self.page.update(*dirty)
     
     def _update_charts(self):
-        """Atualiza os gráficos com os dados históricos"""
-        if hasattr(self, 'cpu_chart'):
-            # Prepara dados para o gráfico de CPU
-            cpu_data = [{"x": i, "y": point["value"]} for i, point in enumerate(self.history_data["cpu"][-30:])]
-            self.cpu_chart.data = cpu_data
-            
-            # Prepara dados para o gráfico de memória
-            memory_data = [{"x": i, "y": point["value"]} for i, point in enumerate(self.history_data["memory"][-30:])]
-            self.memory_chart.data = memory_data
-            
-            # Prepara dados para o gráfico de rede
-            network_sent_data = [{"x": i, "y": min(point["value"] / 1024 / 1024, 100)} for i, point in enumerate(self.history_data["network_sent"][-30:])]
-            network_recv_data = [{"x": i, "y": min(point["value"] / 1024 / 1024, 100)} for i, point in enumerate(self.history_data["network_recv"][-30:])]
-            
-            self.network_chart.data_series = [
-                ft.LineChartData(
-                    data_points=[ft.LineChartDataPoint(x=p["x"], y=p["y"]) for p in network_sent_data],
-                    stroke_width=2,
-                    color=ft.Colors.RED,
-                    curved=True,
-                    stroke_cap_round=True,
-                ),
-                ft.LineChartData(
-                    data_points=[ft.LineChartDataPoint(x=p["x"], y=p["y"]) for p in network_recv_data],
-                    stroke_width=2,
-                    color=ft.Colors.BLUE,
-                    curved=True,
-                    stroke_cap_round=True,
-                ),
-            ]
-    
-    def _update_process_list(self):
-        """Atualiza a lista de processos"""
-        self.process_list.controls.clear()
+        """Atualiza os gráficos quando há novas amostras no histórico; retorna os gráficos alterados"""
+        if not hasattr(self, 'cpu_chart') or self.collector.sample_count == self.rendered_sample_count:
+            return []
+        self.rendered_sample_count = self.collector.sample_count
+        history = self.collector.get_history(points=30)
+        
+        def points(key, scale=lambda v: v):
+            return [ft.LineChartDataPoint(x=i, y=scale(point["value"])) for i, point in enumerate(history[key])]
+        
+        to_mb = lambda v: min(v / 1024 / 1024, 100)
         
-        # Adiciona cabeçalho
-        header = ft.Row(
+        self.cpu_chart.data_series[0].data_points = points("cpu")
+        self.memory_chart.data_series[0].data_points = points("memory")
+        self.network_chart.data_series[0].data_points = points("network_sent", to_mb)
+        self.network_chart.data_series[1].data_points = points("network_recv", to_mb)
+        return [self.cpu_chart, self.memory_chart, self.network_chart]
+    
+    def _build_process_header(self):
+        """Cria o cabeçalho da tabela de processos"""
+        return ft.Row(
             [
                 ft.Container(
                     content=ft.Text("PID", weight=ft.FontWeight.BOLD),
@@ -275,58 +1125,252 @@ class Module:
             ],
             alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
         )
-        self.process_list.controls.append(header)
+    
+    def _build_process_row(self):
+        """Cria uma linha vazia da tabela de processos, reaproveitada entre atualizações"""
+        row = ft.Row(
+            [
+                ft.Container(content=ft.Text(""), width=60),
+                ft.Container(content=ft.Text("", overflow=ft.TextOverflow.ELLIPSIS), expand=1),
+                ft.Container(content=ft.Text(""), width=80),
+                ft.Container(content=ft.Text(""), width=100),
+                ft.Container(content=ft.Text(""), width=80),
+                ft.Container(
+                    content=ft.IconButton(
+                        icon=ft.Icons.CLOSE,
+                        icon_color=ft.Colors.RED,
+                        icon_size=18,
+                        tooltip="Encerrar processo",
+                        on_click=lambda e: self._terminate_process(row.data),
+                    ),
+                    width=80,
+                ),
+            ],
+            alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
+        )
+        return row
+    
+    def _update_process_list(self):
+        """Atualiza a lista de processos reaproveitando as linhas; retorna True se algo mudou"""
+        rows = [
+            (
+                proc['pid'],
+                proc['name'],
+                f"{proc['cpu_percent']:.1f}%",
+                f"{proc['memory_percent']:.1f}%",
+                proc['status'],
+                self._get_status_color(proc['cpu_percent'], 50),
+                self._get_status_color(proc['memory_percent'], 50),
+            )
+            for proc in self.processes
+        ]
+        if rows == self.rendered_process_rows and self.process_rows:
+            return False
+        self.rendered_process_rows = rows
+        
+        # Cria o cabeçalho apenas na primeira renderização
+        if not self.process_rows:
+            self.process_list.controls.clear()
+            self.process_list.controls.append(self._build_process_header())
+            self.process_list.controls.append(ft.Divider(height=1))
         
-        # Adiciona separador
-        self.process_list.controls.append(ft.Divider(height=1))
+        while len(self.process_rows) < len(rows):
+            row = self._build_process_row()
+            self.process_rows.append(row)
+            self.process_list.controls.append(row)
         
-        # Adiciona processos
-        for proc in self.processes:
-            # Define cores baseadas no uso de recursos
-            cpu_color = self._get_status_color(proc['cpu_percent'], 50)
-            memory_color = self._get_status_color(proc['memory_percent'], 50)
+        for row, (pid, name, cpu, memory, status, cpu_color, memory_color) in zip(self.process_rows, rows):
+            pid_cell, name_cell, cpu_cell, memory_cell, status_cell, _ = row.controls
+            row.data = pid
+            row.visible = True
+            pid_cell.content.value = str(pid)
+            name_cell.content.value = name
+            name_cell.tooltip = name
+            cpu_cell.content.value = cpu
+            cpu_cell.content.color = cpu_color
+            memory_cell.content.value = memory
+            memory_cell.content.color = memory_color
+            status_cell.content.value = status
+            status_cell.content.color = ft.Colors.GREEN if status == 'running' else ft.Colors.ORANGE
+        
+        # Linhas excedentes ficam ocultas para serem reaproveitadas depois
+        for row in self.process_rows[len(rows):]:
+            row.visible = False
+        return True
+    
+    def _refresh_process_list(self, e):
+        """Recoleta os processos imediatamente e agenda a renderização"""
+        self.processes = self.collector.collect_processes(
+            sort_by=self.sort_by,
+            reverse=self.sort_reverse,
+            limit=self.max_processes,
+        )
+        self.data_ready.set()
+    
+    def _explorer_process_row(self):
+        """Cria uma linha de processo do explorador (preenchida por _fill_explorer_process_row)"""
+        return ft.Row(
+            [
+                ft.Container(
+                    content=ft.Text("", overflow=ft.TextOverflow.ELLIPSIS),
+                    expand=1,
+                ),
+                ft.Text("", width=60),
+                ft.Text("", font_family="monospace", width=120),
+                ft.Text("", width=90),
+                ft.Text("", font_family="monospace", width=120),
+                ft.Text("", width=100),
+                ft.Text("", font_family="monospace", width=120),
+                ft.IconButton(
+                    icon=ft.Icons.CLOSE,
+                    icon_color=ft.Colors.RED,
+                    icon_size=16,
+                    tooltip="Encerrar processo",
+                    on_click=lambda e: self._terminate_process(e.control.data),
+                ),
+            ],
+        )
+    
+    def _fill_explorer_process_row(self, row, proc, depth=0):
+        """Atualiza os valores de uma linha existente, com minigráficos do histórico"""
+        history = self.collector.process_tracker.history(proc["pid"])
+        name_cell, cpu, cpu_history, rss, rss_history, io, io_history, terminate = row.controls
+        if name_cell.data != depth:
+            name_cell.data = depth
+            name_cell.padding = ft.padding.only(left=16 * depth)
+        name_cell.content.value = f"{proc['name']} ({proc['pid']})"
+        name_cell.content.tooltip = f"{proc['exe']}\nUsuário: {proc['username']}\nThreads: {proc['num_threads']}"
+        cpu.value = f"{proc['cpu_percent']:.1f}%"
+        cpu_history.value = _sparkline(history["cpu"], 100)
+        rss.value = self._format_bytes(proc["rss"])
+        rss_history.value = _sparkline(history["rss"])
+        io.value = f"{self._format_bytes(proc['io_rate'])}/s"
+        io_history.value = _sparkline(history["io"])
+        terminate.data = proc["pid"]
+    
+    def _explorer_group_row(self):
+        """Cria uma linha de agrupamento (executável ou usuário) do explorador"""
+        return ft.Row([
+            ft.Text("", weight=ft.FontWeight.BOLD, overflow=ft.TextOverflow.ELLIPSIS, expand=1),
+            ft.Text("", width=70),
+            ft.Text("", width=60),
+            ft.Text("", width=90),
+            ft.Text("", width=100),
+        ])
+    
+    def _fill_explorer_group_row(self, row, group):
+        key, count, cpu, rss, io = row.controls
+        key.value = group["key"]
+        count.value = f"{group['count']} proc."
+        cpu.value = f"{group['cpu_percent']:.1f}%"
+        rss.value = self._format_bytes(group["rss"])
+        io.value = f"{self._format_bytes(group['io_rate'])}/s"
+    
+    def _update_process_explorer(self):
+        """Atualiza a lista do explorador conforme o modo e a busca atuais
+
+        Só trabalha quando há dados novos no rastreador ou a busca/modo mudou, e
+        reaproveita as linhas existentes alterando apenas os valores, para que o Flet
+        envie somente o que mudou. Retorna True se a lista foi alterada.
+        """
+        tracker = self.collector.process_tracker
+        with self.explorer_lock:
+            key = (tracker.version, self.explorer_mode, self.explorer_query)
+            if key == self.explorer_rendered_key:
+                return False
+            self.explorer_rendered_key = key
+            
+            processes = tracker.search(self.explorer_query)
+            if self.explorer_mode in ("exe", "username"):
+                kind, create, fill = "group", self._explorer_group_row, self._fill_explorer_group_row
+                items = [(group,) for group in tracker.groups(by=self.explorer_mode, processes=processes)]
+            else:
+                kind, create, fill = "process", self._explorer_process_row, self._fill_explorer_process_row
+                if self.explorer_mode == "tree" and not self.explorer_query:
+                    items = [(proc, depth) for depth, proc in tracker.tree(processes)]
+                else:
+                    processes.sort(key=lambda x: x["cpu_percent"], reverse=True)
+                    items = [(proc,) for proc in processes]
+            items = items[:self.explorer_max_rows]
             
-            # Define cor do status
-            status_color = ft.Colors.GREEN if proc['status'] == 'running' else ft.Colors.ORANGE
+            rows = self.explorer_rows[kind]
+            while len(rows) < len(items):
+                rows.append(create())
+            for row, item in zip(rows, items):
+                fill(row, *item)
             
-            # Cria linha do processo
-            process_row = ft.Row(
+            controls = rows[:len(items)] or [
+                ft.Text("Nenhum processo encontrado", italic=True, color=ft.Colors.GREY_500)
+            ]
+            if [id(c) for c in controls] != [id(c) for c in self.explorer_list.controls]:
+                self.explorer_list.controls = controls
+            self.explorer_status.value = f"{len(processes)} processos"
+            return True
+    
+    def _show_process_explorer(self, e):
+        """Abre o explorador de processos (árvore, agrupamentos e histórico por processo)"""
+        def on_search(e):
+            self.explorer_query = e.control.value
+            self._update_process_explorer()
+            self.page.update()
+        
+        def on_mode_change(e):
+            self.explorer_mode = e.control.value
+            self._update_process_explorer()
+            self.page.update()
+        
+        def close_explorer(e):
+            self.explorer_open = False
+            explorer_dialog.open = False
+            self.page.update()
+        
+        with self.explorer_lock:
+            # Nova janela: as linhas da anterior não são reaproveitadas
+            self.explorer_list = ft.Column(spacing=2, scroll=ft.ScrollMode.AUTO, height=450)
+            self.explorer_status = ft.Text("", size=12, color=ft.Colors.GREY_700)
+            self.explorer_rows = {"process": [], "group": []}
+            self.explorer_rendered_key = None
+        
+        explorer_dialog = ft.AlertDialog(
+            title=ft.Text("Explorador de Processos"),
+            content=ft.Column(
                 [
-                    ft.Container(
-                        content=ft.Text(str(proc['pid'])),
-                        width=60,
-                    ),
-                    ft.Container(
-                        content=ft.Text(proc['name'], overflow=ft.TextOverflow.ELLIPSIS),
-                        expand=1,
-                        tooltip=proc['name'],
-                    ),
-                    ft.Container(
-                        content=ft.Text(f"{proc['cpu_percent']:.1f}%", color=cpu_color),
-                        width=80,
-                    ),
-                    ft.Container(
-                        content=ft.Text(f"{proc['memory_percent']:.1f}%", color=memory_color),
-                        width=100,
-                    ),
-                    ft.Container(
-                        content=ft.Text(proc['status'], color=status_color),
-                        width=80,
-                    ),
-                    ft.Container(
-                        content=ft.IconButton(
-                            icon=ft.Icons.CLOSE,
-                            icon_color=ft.Colors.RED,
-                            icon_size=18,
-                            tooltip="Encerrar processo",
-                            on_click=lambda e, pid=proc['pid']: self._terminate_process(pid),
+                    ft.Row([
+                        ft.TextField(
+                            label="Buscar (nome, executável, usuário ou PID)",
+                            value=self.explorer_query,
+                            on_change=on_search,
+                            expand=True,
                         ),
-                        width=80,
-                    ),
+                        ft.Dropdown(
+                            value=self.explorer_mode,
+                            options=[
+                                ft.dropdown.Option("tree", "Árvore"),
+                                ft.dropdown.Option("list", "Lista"),
+                                ft.dropdown.Option("exe", "Por executável"),
+                                ft.dropdown.Option("username", "Por usuário"),
+                            ],
+                            on_change=on_mode_change,
+                            width=170,
+                        ),
+                    ]),
+                    self.explorer_status,
+                    self.explorer_list,
                 ],
-                alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
-            )
-            self.process_list.controls.append(process_row)
+                width=900,
+            ),
+            actions=[ft.TextButton("Fechar", on_click=close_explorer)],
+            actions_alignment=ft.MainAxisAlignment.END,
+            on_dismiss=lambda e: setattr(self, "explorer_open", False),
+        )
+        
+        if not self.collector.process_tracker.entries:
+            self.collector.process_tracker.refresh()
+        self._update_process_explorer()
+        self.explorer_open = True
+        self.page.dialog = explorer_dialog
+        explorer_dialog.open = True
+        self.page.update()
     
     def _sort_processes(self, sort_key):
         """Altera a ordenação dos processos"""
@@ -387,17 +1431,27 @@ class Module:
     
     def _start_monitoring(self):
         """Inicia o monitoramento em uma thread separada"""
-        if self.update_thread is None or not self.update_thread.is_alive():
-            self.stop_thread = False
-            self.update_thread = threading.Thread(target=self._update_stats)
-            self.update_thread.daemon = True
-            self.update_thread.start()
+        # Threads de uma montagem anterior podem ainda estar terminando; elas saem
+        # sozinhas pelo próprio evento e um novo par assume o monitoramento
+        if self.stop_event is not None and not self.stop_event.is_set():
+            return
+        self.stop_event = threading.Event()
+        self.update_thread = threading.Thread(target=self._update_stats, args=(self.stop_event,))
+        self.update_thread.daemon = True
+        self.update_thread.start()
+        self.render_thread = threading.Thread(target=self._render_loop, args=(self.stop_event,))
+        self.render_thread.daemon = True
+        self.render_thread.start()
     
     def _stop_monitoring(self):
         """Para o monitoramento"""
-        self.stop_thread = True
+        if self.stop_event is not None:
+            self.stop_event.set()
+        self.data_ready.set()
         if self.update_thread:
             self.update_thread.join(timeout=1)
+        if self.render_thread:
+            self.render_thread.join(timeout=1)
     
     def _toggle_processes(self, e):
         """Alterna a exibição da lista de processos"""
@@ -454,7 +1508,7 @@ class Module:
                     "network_sent": self.network_sent,
                     "network_recv": self.network_recv,
                 },
-                "history_data": self.history_data,
+                "history_data": self.collector.get_history(),
                 "processes": self.processes,
             }
             
@@ -509,6 +1563,15 @@ class Module:
             label="{value}%",
         )
         
+        # Campo para janela de alerta
+        alert_window_slider = ft.Slider(
+            min=1,
+            max=15,
+            divisions=14,
+            value=self.alert_window / 60,
+            label="{value} min",
+        )
+        
         # Campo para intervalo de atualização
         update_interval_slider = ft.Slider(
             min=1,
@@ -532,6 +1595,8 @@ class Module:
             self.alert_thresholds["cpu"] = cpu_threshold_slider.value
             self.alert_thresholds["memory"] = memory_threshold_slider.value
             self.alert_thresholds["disk"] = disk_threshold_slider.value
+            self.alert_window = int(alert_window_slider.value) * 60
+            self._rebuild_alert_rules()
             self.update_interval = update_interval_slider.value
             self.max_processes = int(max_processes_slider.value)
             
@@ -560,6 +1625,8 @@ class Module:
                     memory_threshold_slider,
                     ft.Text("Disco:"),
                     disk_threshold_slider,
+                    ft.Text("Tempo acima do limite para alertar (CPU e Memória):"),
+                    alert_window_slider,
                     ft.Divider(),
                     ft.Text("Intervalo de Atualização (segundos):"),
                     update_interval_slider,
@@ -739,7 +1806,10 @@ class Module:
             height=200,
         )
         
-        # Lista de processos
+        # Lista de processos (controles novos: descarta o estado da renderização anterior)
+        self.process_rows = []
+        self.rendered_process_rows = []
+        self.rendered_sample_count = -1
         self.process_list = ft.Column(
             controls=[
                 ft.Text("Carregando processos...", italic=True),
@@ -755,10 +1825,15 @@ class Module:
                 ft.Row([
                     ft.Text("Processos em Execução", size=18, weight=ft.FontWeight.BOLD),
                     ft.Row([
+                        ft.IconButton(
+                            icon=ft.Icons.ACCOUNT_TREE,
+                            tooltip="Explorador de processos",
+                            on_click=self._show_process_explorer,
+                        ),
                         ft.IconButton(
                             icon=ft.Icons.REFRESH,
                             tooltip="Atualizar lista",
-                            on_click=lambda e: self._update_process_list(),
+                            on_click=self._refresh_process_list,
                         ),
                     ]),
                 ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
@@ -783,6 +1858,12 @@ class Module:
             on_click=self._toggle_alerts,
         )
         
+        alert_history_button = ft.IconButton(
+            icon=ft.Icons.HISTORY,
+            tooltip="Histórico de alertas",
+            on_click=self._show_alert_history_dialog,
+        )
+        
         export_button = ft.IconButton(
             icon=ft.Icons.DOWNLOAD,
             tooltip="Exportar dados",
@@ -806,6 +1887,7 @@ class Module:
                             [
                                 self.toggle_processes_button,
                                 self.toggle_alerts_button,
+                                alert_history_button,
                                 export_button,
                                 settings_button,
                             ],
@@ -1025,3 +2107,26 @@ class Module:
         """Chamado quando o módulo é desmontado da página"""
         self._stop_monitoring()
 
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monitor do Sistema - agente de métricas sem interface")
+    parser.add_argument("--agent", action="store_true", help="executa o coletor como agente HTTP em segundo plano")
+    parser.add_argument("--host", default=AGENT_DEFAULT_HOST, help=f"endereço de escuta (padrão: {AGENT_DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=AGENT_DEFAULT_PORT, help=f"porta de escuta (padrão: {AGENT_DEFAULT_PORT})")
+    parser.add_argument("--interval", type=float, default=2, help="intervalo de coleta em segundos (padrão: 2)")
+    parser.add_argument("--history", type=int, default=AGENT_DEFAULT_HISTORY,
+                        help=f"número de pontos mantidos no histórico (padrão: {AGENT_DEFAULT_HISTORY})")
+    args = parser.parse_args(argv)
+
+    if not args.agent:
+        parser.print_help()
+        return 1
+
+    agent = MetricsAgent(host=args.host, port=args.port, interval=args.interval, max_history_points=args.history)
+    agent.serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,7 +4,557 @@ import os
 import webbrowser
 import csv
 import io
+import re
+import math
+import bisect
+import threading
+import unicodedata
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Pesquisa de links
+SEARCH_DEBOUNCE_SECONDS = 0.2  # espera após a última tecla antes de filtrar
+SEARCH_FIELD_WEIGHTS = {"title": 4.0, "category": 2.5, "description": 1.5, "url": 1.0}
+SEARCH_MATCH_QUALITY = {"exact": 1.0, "prefix": 0.7, "fuzzy": 0.4}
+SEARCH_USAGE_WEIGHT = 0.15  # peso do número de aberturas na ordenação dos resultados
+
+# Verificação dos links
+HEALTH_CACHE_FILE = "useful_links_health.json"
+HEALTH_CONCURRENCY = 8  # verificações simultâneas no total
+HEALTH_HOST_INTERVAL = 0.5  # segundos entre requisições ao mesmo servidor
+HEALTH_TIMEOUT = (5, 10)  # segundos: conexão, resposta
+HEALTH_TTL = 15 * 60  # resultados mais novos que isso não são verificados de novo ao abrir a tela
+HEALTH_RECHECK_INTERVAL = 60 * 60  # segundos entre verificações automáticas
+HEALTH_SAVE_DELAY = 2  # segundos: vários resultados seguidos geram uma única gravação
+HEALTH_STATUS_STYLES = {
+    # status: (texto, cor)
+    "ok": ("Online", ft.Colors.GREEN_600),
+    "broken": ("Quebrado", ft.Colors.RED_600),
+    "unreachable": ("Fora do ar", ft.Colors.RED_600),
+    "checking": ("...", ft.Colors.GREY_500),
+}
+
+# Importação em massa
+IMPORT_READ_SIZE = 64 * 1024  # caracteres lidos por vez de arquivos de favoritos
+IMPORT_ERROR_DISPLAY_LIMIT = 200  # erros listados no relatório da importação
+
+def normalize_text(text):
+    """Minúsculas e sem acentos, para que "Documentação" e "documentacao" sejam iguais"""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+def tokenize(text):
+    return re.findall(r"[a-z0-9]+", normalize_text(text))
+
+def within_distance(a, b, limit, prefix=False):
+    """Distância de edição entre a e b é no máximo limit (interrompe cedo quando passa)
+
+    Com prefix=True, compara a com o prefixo de b mais próximo (o restante de b é ignorado).
+    """
+    if len(a) - len(b) > limit or (not prefix and len(b) - len(a) > limit):
+        return False
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > limit:
+            return False
+        previous = current
+    return (min(previous) if prefix else previous[-1]) <= limit
+
+class LinkSearchIndex:
+    """Índice invertido de palavras dos links, atualizado a cada inclusão/edição/exclusão
+
+    As palavras são normalizadas (sem acentos) e mantidas em uma lista ordenada, o que
+    permite encontrar prefixos por busca binária. Uma palavra da pesquisa sem nenhum
+    prefixo correspondente é comparada por distância de edição (erros de digitação).
+    """
+    
+    def __init__(self):
+        self.postings = {}  # palavra -> {id(link): peso do campo}
+        self.sorted_tokens = []
+        self.entries = {}  # id(link) -> (link, palavras indexadas)
+    
+    def build(self, links):
+        self.postings = {}
+        self.entries = {}
+        self.sorted_tokens = None  # ordenada uma única vez no final
+        for link in links:
+            self._index(link)
+        self.sorted_tokens = sorted(self.postings)
+    
+    def _index(self, link):
+        weights = {}
+        for field, weight in SEARCH_FIELD_WEIGHTS.items():
+            for token in tokenize(link.get(field, "")):
+                weights[token] = max(weights.get(token, 0.0), weight)
+        for token, weight in weights.items():
+            posting = self.postings.get(token)
+            if posting is None:
+                posting = self.postings[token] = {}
+                if self.sorted_tokens is not None:
+                    bisect.insort(self.sorted_tokens, token)
+            posting[id(link)] = weight
+        self.entries[id(link)] = (link, list(weights))
+    
+    def add(self, link):
+        self._index(link)
+    
+    def remove(self, link):
+        entry = self.entries.pop(id(link), None)
+        if entry is None:
+            return
+        for token in entry[1]:
+            posting = self.postings.get(token)
+            if posting is None:
+                continue
+            posting.pop(id(link), None)
+            if not posting:
+                del self.postings[token]
+                position = bisect.bisect_left(self.sorted_tokens, token)
+                if position < len(self.sorted_tokens) and self.sorted_tokens[position] == token:
+                    del self.sorted_tokens[position]
+    
+    def update(self, link):
+        self.remove(link)
+        self._index(link)
+    
+    def _prefix_range(self, prefix):
+        start = bisect.bisect_left(self.sorted_tokens, prefix)
+        end = bisect.bisect_left(self.sorted_tokens, prefix + "\uffff")
+        return self.sorted_tokens[start:end]
+    
+    def _matches(self, term):
+        """Palavras do índice que correspondem a um termo, com a qualidade da correspondência"""
+        matches = [(token, SEARCH_MATCH_QUALITY["exact" if token == term else "prefix"])
+                   for token in self._prefix_range(term)]
+        if matches or len(term) < 4:
+            return matches
+        # Sem prefixo: tolera 1 erro de digitação (2 em palavras longas), mantendo a primeira letra
+        limit = 1 if len(term) < 8 else 2
+        # Prefixos mais longos que term + limit não podem ficar dentro do limite
+        return [(token, SEARCH_MATCH_QUALITY["fuzzy"]) for token in self._prefix_range(term[0])
+                if within_distance(term, token[:len(term) + limit], limit, prefix=True)]
+    
+    def search(self, query):
+        """Links que contêm todas as palavras da pesquisa, do mais relevante ao menos relevante"""
+        terms = tokenize(query)
+        if not terms:
+            return [link for link, _ in self.entries.values()]
+        scores = None
+        for term in dict.fromkeys(terms):
+            term_scores = {}
+            for token, quality in self._matches(term):
+                for key, weight in self.postings[token].items():
+                    term_scores[key] = max(term_scores.get(key, 0.0), weight * quality)
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {key: score + term_scores[key] for key, score in scores.items() if key in term_scores}
+            if not scores:
+                return []
+        
+        def rank(key):
+            link = self.entries[key][0]
+            usage = 1 + SEARCH_USAGE_WEIGHT * math.log1p(link.get("open_count", 0))
+            return (-scores[key] * usage, normalize_text(link.get("title", "")))
+        
+        return [self.entries[key][0] for key in sorted(scores, key=rank)]
+
+
+class LinkHealthChecker:
+    """Verifica em segundo plano se as URLs dos links respondem
+
+    Usa uma sessão HTTP compartilhada (conexões reaproveitadas) com no máximo
+    HEALTH_CONCURRENCY requisições simultâneas e um intervalo mínimo entre requisições
+    ao mesmo servidor. Tenta HEAD primeiro e recorre a GET quando o servidor não aceita
+    HEAD. ETag e Last-Modified de cada URL são guardados e enviados na verificação
+    seguinte, de modo que um 304 confirma o link sem baixar o conteúdo.
+    on_result(url, resultado) é chamado a partir das threads de verificação.
+    As threads e a sessão só existem entre start() e stop().
+    """
+    
+    def __init__(self, cache_file=HEALTH_CACHE_FILE, on_result=None,
+                 concurrency=HEALTH_CONCURRENCY, host_interval=HEALTH_HOST_INTERVAL):
+        self.cache_file = cache_file
+        self.on_result = on_result
+        self.concurrency = concurrency
+        self.host_interval = host_interval
+        self.results = {}
+        self.lock = threading.Lock()
+        self.in_flight = set()
+        self.host_locks = {}
+        self.host_last_request = {}
+        self.save_timer = None
+        self.schedule_event = None
+        self.executor = None
+        self.session = None
+    
+    def start(self):
+        """Cria as threads de verificação e a sessão HTTP (se ainda não existirem)"""
+        with self.lock:
+            if self.executor is not None:
+                return
+            self.executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="link-check")
+            
+            # Sessão compartilhada para reaproveitar conexões entre verificações
+            self.session = requests.Session()
+            self.session.headers["User-Agent"] = "ogs-pannel-link-checker"
+            adapter = HTTPAdapter(pool_connections=self.concurrency, pool_maxsize=self.concurrency, max_retries=0)
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
+    
+    def load(self):
+        try:
+            if os.path.exists(self.cache_file):
+                with open(self.cache_file, "r", encoding="utf-8") as f:
+                    self.results = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Erro ao carregar verificação de links: {e}")
+            self.results = {}
+    
+    def _save(self):
+        with self.lock:
+            self.save_timer = None
+            data = dict(self.results)
+        try:
+            temp_file = self.cache_file + ".tmp"
+            with open(temp_file, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(temp_file, self.cache_file)
+        except OSError as e:
+            print(f"Erro ao salvar verificação de links: {e}")
+    
+    def _schedule_save(self):
+        with self.lock:
+            if self.save_timer is not None:
+                return
+            self.save_timer = threading.Timer(HEALTH_SAVE_DELAY, self._save)
+            self.save_timer.daemon = True
+            self.save_timer.start()
+    
+    def get(self, url):
+        return self.results.get(url)
+    
+    def is_fresh(self, url):
+        result = self.results.get(url)
+        return result is not None and time.time() - result.get("checked_at", 0) < HEALTH_TTL
+    
+    def check(self, urls, force=False):
+        """Agenda a verificação das URLs (ignora as verificadas há pouco, salvo com force)
+
+        Não faz nada antes de start() ou depois de stop().
+        """
+        for url in dict.fromkeys(urls):
+            with self.lock:
+                executor = self.executor
+                if executor is None:
+                    return
+                if url in self.in_flight or (not force and self.is_fresh(url)):
+                    continue
+                self.in_flight.add(url)
+            executor.submit(self._check, url, self.session)
+    
+    def _wait_for_host(self, host):
+        """Respeita o intervalo mínimo entre requisições ao mesmo servidor"""
+        with self.lock:
+            host_lock = self.host_locks.setdefault(host, threading.Lock())
+        with host_lock:
+            wait = self.host_last_request.get(host, 0) + self.host_interval - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self.host_last_request[host] = time.monotonic()
+    
+    def _request(self, session, method, url, headers):
+        self._wait_for_host(urlsplit(url).netloc.lower())
+        response = session.request(
+            method, url, headers=headers, timeout=HEALTH_TIMEOUT, allow_redirects=True, stream=True
+        )
+        # Só o status e os cabeçalhos interessam: não baixa o corpo
+        response.close()
+        return response
+    
+    def _check(self, url, session):
+        previous = self.results.get(url) or {}
+        headers = {}
+        if previous.get("status") == "ok":
+            if previous.get("etag"):
+                headers["If-None-Match"] = previous["etag"]
+            if previous.get("last_modified"):
+                headers["If-Modified-Since"] = previous["last_modified"]
+        
+        started = time.monotonic()
+        try:
+            response = self._request(session, "HEAD", url, headers)
+            # Vários servidores não implementam HEAD (405/501) ou respondem diferente a ele
+            if response.status_code >= 400:
+                response = self._request(session, "GET", url, headers)
+            elapsed_ms = (time.monotonic() - started) * 1000
+            if response.status_code == 304:
+                result = dict(previous, checked_at=time.time(), elapsed_ms=elapsed_ms)
+            else:
+                result = {
+                    "status": "ok" if response.status_code < 400 else "broken",
+                    "code": response.status_code,
+                    "elapsed_ms": elapsed_ms,
+                    "checked_at": time.time(),
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                    "error": "" if response.status_code < 400 else response.reason,
+                }
+        except requests.RequestException as e:
+            result = {
+                "status": "unreachable",
+                "code": None,
+                "elapsed_ms": (time.monotonic() - started) * 1000,
+                "checked_at": time.time(),
+                "error": e.__class__.__name__,
+            }
+        
+        with self.lock:
+            if session is not self.session:
+                # stop() encerrou a sessão no meio da verificação: o resultado não vale
+                return
+            self.results[url] = result
+            self.in_flight.discard(url)
+        self._schedule_save()
+        if self.on_result:
+            try:
+                self.on_result(url, result)
+            except Exception as e:
+                print(f"Erro ao atualizar verificação de link: {e}")
+    
+    def start_schedule(self, get_urls, interval=HEALTH_RECHECK_INTERVAL):
+        """Verifica de novo todas as URLs (get_urls()) a cada interval segundos"""
+        if self.schedule_event is not None:
+            return
+        # Cada agendamento tem seu próprio evento: um stop() seguido de novo start_schedule()
+        # encerra o laço anterior mesmo que ele ainda esteja esperando
+        stop_event = self.schedule_event = threading.Event()
+        
+        def loop():
+            while not stop_event.wait(interval):
+                self.check(get_urls(), force=True)
+        
+        threading.Thread(target=loop, daemon=True).start()
+    
+    def stop(self):
+        """Encerra o agendamento, as threads de verificação e a sessão HTTP"""
+        with self.lock:
+            stop_event, self.schedule_event = self.schedule_event, None
+            executor, self.executor = self.executor, None
+            session, self.session = self.session, None
+            # Verificações na fila são descartadas e poderão ser pedidas de novo
+            self.in_flight.clear()
+        if stop_event is not None:
+            stop_event.set()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        if session is not None:
+            session.close()
+        with self.lock:
+            timer = self.save_timer
+        if timer is not None:
+            timer.cancel()
+            self._save()
+
+def normalize_url(url):
+    """Forma canônica de uma URL para detectar duplicados (esquema/host minúsculos, sem porta padrão, / final ou #)"""
+    url = (url or "").strip()
+    if not url:
+        return ""
+    if "://" not in url:
+        url = "http://" + url
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        # Porta ou host malformados (ex.: http://host:abc/): compara a URL como foi escrita
+        return url
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if (scheme, port) in (("http", 80), ("https", 443)):
+        port = None
+    netloc = f"{host}:{port}" if port else host
+    path = parts.path.rstrip("/")
+    return f"{scheme}://{netloc}{path}" + (f"?{parts.query}" if parts.query else "")
+
+def _iter_csv_rows(lines):
+    """Linhas de um CSV (título,descrição,url,categoria), com cabeçalho opcional"""
+    columns = {"title": 0, "description": 1, "url": 2, "category": 3}
+    header_aliases = {
+        "titulo": "title", "title": "title", "nome": "title", "name": "title",
+        "descricao": "description", "description": "description",
+        "url": "url", "link": "url", "endereco": "url",
+        "categoria": "category", "category": "category", "grupo": "category",
+    }
+    first = True
+    for number, row in enumerate(csv.reader(lines), start=1):
+        if not any(cell.strip() for cell in row):
+            continue
+        if first:
+            first = False
+            names = [header_aliases.get(normalize_text(cell.strip())) for cell in row]
+            if "url" in names:
+                columns = {name: index for index, name in enumerate(names) if name}
+                continue
+        
+        def cell(name):
+            index = columns.get(name)
+            return row[index].strip() if index is not None and index < len(row) else ""
+        
+        if columns["url"] >= len(row):
+            yield number, None, "Linha sem a coluna de URL (esperado: título, descrição, url, categoria)"
+            continue
+        yield number, {
+            "title": cell("title"),
+            "description": cell("description"),
+            "url": cell("url"),
+            "category": cell("category"),
+        }, None
+
+def _json_row(number, item):
+    if not isinstance(item, dict):
+        return number, None, "Item não é um objeto JSON"
+    return number, {
+        "title": str(item.get("title") or item.get("name") or "").strip(),
+        "description": str(item.get("description") or "").strip(),
+        "url": str(item.get("url") or item.get("href") or "").strip(),
+        "category": str(item.get("category") or "").strip(),
+    }, None
+
+def _iter_json_rows(text):
+    """Itens de uma lista JSON (um de cada vez) ou de JSON Lines (um objeto por linha)"""
+    stripped = text.lstrip()
+    if not stripped.startswith("["):
+        for number, line in enumerate(text.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                yield _json_row(number, json.loads(line))
+            except ValueError as e:
+                yield number, None, f"JSON inválido: {e}"
+        return
+    
+    # Decodifica os elementos da lista um a um: um item inválido não impede os demais
+    decoder = json.JSONDecoder()
+    position = text.index("[") + 1
+    number = 0
+    while True:
+        while position < len(text) and text[position] in " \t\r\n,":
+            position += 1
+        if position >= len(text) or text[position] == "]":
+            return
+        number += 1
+        try:
+            item, position = decoder.raw_decode(text, position)
+        except ValueError as e:
+            yield number, None, f"JSON inválido: {e}"
+            return
+        yield _json_row(number, item)
+
+class _BookmarkParser(HTMLParser):
+    """Favoritos exportados pelos navegadores (formato NETSCAPE-Bookmark-file-1)
+
+    Cada pasta (<H3>) vira a categoria dos links contidos nela.
+    """
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.folders = []
+        self.pending_folder = None
+        self.current = None
+        self.rows = []
+        self.count = 0
+        self.reading = None
+    
+    def handle_starttag(self, tag, attrs):
+        if tag == "h3":
+            self.reading = "folder"
+            self.pending_folder = ""
+        elif tag == "a":
+            self.count += 1
+            self.current = {
+                "title": "",
+                "description": "",
+                "url": dict(attrs).get("href") or "",
+                "category": self.folders[-1] if self.folders else "",
+            }
+            self.reading = "link"
+        elif tag == "dl" and self.pending_folder is not None:
+            self.folders.append(self.pending_folder.strip())
+            self.pending_folder = None
+    
+    def handle_endtag(self, tag):
+        if tag == "a" and self.current is not None:
+            self.current["title"] = self.current["title"].strip()
+            self.rows.append((self.count, self.current, None))
+            self.current = None
+            self.reading = None
+        elif tag == "h3":
+            self.reading = None
+        elif tag == "dl" and self.folders:
+            self.folders.pop()
+    
+    def handle_data(self, data):
+        if self.reading == "link" and self.current is not None:
+            self.current["title"] += data
+        elif self.reading == "folder":
+            self.pending_folder += data
+
+def _iter_bookmark_rows(chunks):
+    parser = _BookmarkParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+        # Entrega os links já lidos sem esperar o fim do arquivo
+        yield from parser.rows
+        parser.rows = []
+    parser.close()
+    yield from parser.rows
+
+def detect_import_format(sample):
+    """csv, json ou html, a partir do início do conteúdo"""
+    head = sample.lstrip()[:512].lower()
+    if head.startswith("<!doctype netscape-bookmark") or head.startswith("<") and "<a " in sample.lower():
+        return "html"
+    if head.startswith("[") or head.startswith("{"):
+        return "json"
+    return "csv"
+
+def iter_import_rows(text=None, path=None):
+    """Linhas a importar como (número, dados ou None, erro ou None), lidas sob demanda
+
+    Aceita o texto colado na tela ou o caminho de um arquivo CSV, JSON/JSON Lines ou
+    favoritos HTML exportados do navegador. Arquivos CSV e HTML são lidos aos poucos.
+    """
+    if path:
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            sample = f.read(4096)
+            f.seek(0)
+            import_format = detect_import_format(sample)
+            if import_format == "csv":
+                yield from _iter_csv_rows(f)
+            elif import_format == "html":
+                yield from _iter_bookmark_rows(iter(lambda: f.read(IMPORT_READ_SIZE), ""))
+            else:
+                yield from _iter_json_rows(f.read())
+        return
+    
+    text = text or ""
+    import_format = detect_import_format(text[:4096])
+    if import_format == "csv":
+        yield from _iter_csv_rows(io.StringIO(text))
+    elif import_format == "html":
+        yield from _iter_bookmark_rows([text])
+    else:
+        yield from _iter_json_rows(text)
 
 class Module:
     def __init__(self):
@@ -13,6 +563,12 @@ class Module:
         self.links = []
         self.filtered_links = []
         self.search_term = ""
+        self.search_index = LinkSearchIndex()
+        self.search_timer = None
+        self.last_link_id = 0
+        self.card_cache = {}  # id(link) -> (dados exibidos, card)
+        self.health_badges = {}  # id(link) -> selo de disponibilidade exibido no card
+        self.health_checker = LinkHealthChecker(on_result=self._on_health_result)
         
     def get_module_info(self):
         return {
@@ -55,13 +611,17 @@ class Module:
             self.links = []
         
         # Inicializa os links filtrados com todos os links
+        self.search_index.build(self.links)
+        self.health_checker.load()
         self.filtered_links = self.links.copy()
     
     def _save_links(self):
-        """Salva os links no arquivo JSON"""
+        """Salva os links no arquivo JSON (arquivo temporário + substituição atômica)"""
         try:
-            with open(self.links_file, "w", encoding="utf-8") as f:
+            temp_file = self.links_file + ".tmp"
+            with open(temp_file, "w", encoding="utf-8") as f:
                 json.dump(self.links, f, ensure_ascii=False, indent=2)
+            os.replace(temp_file, self.links_file)
         except Exception as e:
             print(f"Erro ao salvar links: {e}")
             if self.page:
@@ -73,10 +633,15 @@ class Module:
                     )
                 )
     
-    def _open_link(self, e, url):
+    def _open_link(self, e, url, link=None):
         """Abre o link no navegador padrão"""
         try:
             webbrowser.open(url)
+            if link is not None:
+                # Links mais abertos sobem nos resultados da pesquisa
+                link["open_count"] = link.get("open_count", 0) + 1
+                link["last_opened_at"] = datetime.now().isoformat()
+                self._save_links()
         except Exception as e:
             print(f"Erro ao abrir link: {e}")
             if self.page:
@@ -90,8 +655,7 @@ class Module:
     
     def _add_link(self, title, description, url, category="Geral"):
         """Adiciona um novo link à lista"""
-        # Gera um ID único baseado no timestamp
-        link_id = str(int(datetime.now().timestamp()))
+        link_id = self._new_link_id({link["id"] for link in self.links})
         
         new_link = {
             "id": link_id,
@@ -103,10 +667,85 @@ class Module:
         }
         
         self.links.append(new_link)
+        self.search_index.add(new_link)
+        self.health_checker.check([url])
         self._save_links()
         self._filter_links()  # Atualiza os links filtrados
         self._update_links_view()
     
+    def _new_link_id(self, used_ids):
+        """ID único baseado no timestamp (incrementado quando há vários links no mesmo segundo)"""
+        candidate = max(int(datetime.now().timestamp()), self.last_link_id + 1)
+        while str(candidate) in used_ids:
+            candidate += 1
+        self.last_link_id = candidate
+        used_ids.add(str(candidate))
+        return str(candidate)
+    
+    def _bulk_import(self, rows):
+        """Valida e aplica as linhas importadas com uma única gravação e uma única atualização da tela
+
+        rows vem de iter_import_rows. URLs já cadastradas (ou repetidas na própria
+        importação) são ignoradas, comparando a forma normalizada por meio de um conjunto.
+        Retorna o número de links importados, de duplicados e a lista de (linha, erro).
+        """
+        known_urls = {normalize_url(link["url"]) for link in self.links}
+        used_ids = {link["id"] for link in self.links}
+        created_at = datetime.now().isoformat()
+        new_links = []
+        duplicates = 0
+        errors = []
+        
+        for number, data, error in rows:
+            if error:
+                errors.append((number, error))
+                continue
+            title = data["title"]
+            url = data["url"]
+            if not title or not url:
+                errors.append((number, "Título e URL são obrigatórios"))
+                continue
+            # Esquemas como javascript:, place: ou mailto: (comuns em favoritos) não são links web
+            has_scheme = re.match(r"^[a-z][a-z0-9+-]*:(?!\d)", url, re.IGNORECASE)
+            if has_scheme and not url.lower().startswith(("http://", "https://")):
+                errors.append((number, f"Endereço não suportado: {url[:60]}"))
+                continue
+            if not url.lower().startswith(("http://", "https://")):
+                url = "http://" + url
+            try:
+                parts = urlsplit(url)
+                parts.port  # levanta ValueError para portas inválidas (http://host:abc/)
+                valid = bool(parts.hostname) and not any(c.isspace() for c in url)
+            except ValueError:
+                valid = False
+            if not valid:
+                errors.append((number, f"URL inválida: {url[:60]}"))
+                continue
+            
+            key = normalize_url(url)
+            if key in known_urls:
+                duplicates += 1
+                continue
+            known_urls.add(key)
+            new_links.append({
+                "id": self._new_link_id(used_ids),
+                "title": title,
+                "description": data["description"],
+                "url": url,
+                "created_at": created_at,
+                "category": data["category"] or "Geral",
+            })
+        
+        if new_links:
+            self.links.extend(new_links)
+            for link in new_links:
+                self.search_index.add(link)
+            self._save_links()
+            self._filter_links()
+            self._update_links_view()
+            self.health_checker.check([link["url"] for link in new_links])
+        return len(new_links), duplicates, errors
+    
     def _edit_link(self, link_id, title, description, url, category):
         """Edita um link existente"""
         for i, link in enumerate(self.links):
@@ -115,6 +754,8 @@ class Module:
                 self.links[i]["description"] = description
                 self.links[i]["url"] = url
                 self.links[i]["category"] = category
+                self.search_index.update(self.links[i])
+                self.health_checker.check([url])
                 break
         
         self._save_links()
@@ -123,31 +764,48 @@ class Module:
     
     def _delete_link(self, link_id):
         """Remove um link da lista"""
+        for link in self.links:
+            if link["id"] == link_id:
+                self.search_index.remove(link)
         self.links = [link for link in self.links if link["id"] != link_id]
         self._save_links()
         self._filter_links()  # Atualiza os links filtrados
         self._update_links_view()
     
     def _filter_links(self):
-        """Filtra os links com base no termo de pesquisa"""
-        if not self.search_term:
+        """Filtra os links com base no termo de pesquisa (ordenados por relevância)"""
+        if not self.search_term.strip():
             self.filtered_links = self.links.copy()
         else:
-            term = self.search_term.lower()
-            self.filtered_links = [
-                link for link in self.links
-                if term in link["title"].lower() or 
-                   term in link["description"].lower() or 
-                   term in link["url"].lower() or
-                   term in link["category"].lower()
-            ]
+            self.filtered_links = self.search_index.search(self.search_term)
     
     def _handle_search(self, e):
-        """Manipula a pesquisa de links"""
-        self.search_term = e.control.value
+        """Manipula a pesquisa de links, aguardando o usuário parar de digitar"""
+        self.search_term = e.control.value or ""
+        if self.search_timer is not None:
+            self.search_timer.cancel()
+        self.search_timer = threading.Timer(SEARCH_DEBOUNCE_SECONDS, self._apply_search)
+        self.search_timer.daemon = True
+        self.search_timer.start()
+    
+    def _apply_search(self):
         self._filter_links()
         self._update_links_view()
     
+    def _link_grid_item(self, link):
+        """Card do link, reaproveitado enquanto os dados exibidos não mudarem"""
+        signature = (link["title"], link["description"], link["url"], link.get("category", "Geral"))
+        cached = self.card_cache.get(id(link))
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        item = ft.Container(
+            content=self._create_link_card(link),
+            col={"xs": 12, "sm": 6, "md": 4, "lg": 4, "xl": 3},
+            padding=8,
+        )
+        self.card_cache[id(link)] = (signature, item)
+        return item
+    
     def _update_links_view(self):
         """Atualiza a visualização dos links"""
         if not hasattr(self, 'links_list') or not self.links_list:
@@ -188,6 +846,12 @@ class Module:
                 )
             )
         else:
+            # Descarta cards de links excluídos
+            current = {id(link) for link in self.links}
+            for key in [key for key in self.card_cache if key not in current]:
+                del self.card_cache[key]
+                self.health_badges.pop(key, None)
+            
             # Agrupa links por categoria
             links_by_category = {}
             for link in self.filtered_links:
@@ -196,8 +860,13 @@ class Module:
                     links_by_category[category] = []
                 links_by_category[category].append(link)
             
+            # Na pesquisa, a categoria do resultado mais relevante vem primeiro
+            categories = list(links_by_category.items())
+            if not self.search_term.strip():
+                categories.sort()
+            
             # Adiciona os links agrupados por categoria
-            for category, links in sorted(links_by_category.items()):
+            for category, links in categories:
                 # Adiciona o cabeçalho da categoria
                 self.links_list.controls.append(
                     ft.Container(
@@ -239,15 +908,7 @@ class Module:
                 )
                 
                 # Adiciona os links da categoria em um grid responsivo
-                grid_items = []
-                for link in links:
-                    grid_items.append(
-                        ft.Container(
-                            content=self._create_link_card(link),
-                            col={"xs": 12, "sm": 6, "md": 4, "lg": 4, "xl": 3},
-                            padding=8,
-                        )
-                    )
+                grid_items = [self._link_grid_item(link) for link in links]
                 
                 self.links_list.controls.append(
                     ft.Container(
@@ -260,7 +921,7 @@ class Module:
                 )
                 
                 # Adiciona um divisor após cada categoria, exceto a última
-                if category != list(sorted(links_by_category.keys()))[-1]:
+                if category != categories[-1][0]:
                     self.links_list.controls.append(
                         ft.Container(
                             content=ft.Divider(
@@ -274,6 +935,61 @@ class Module:
         if self.page:
             self.page.update()
     
+    def _health_badge_content(self, result):
+        """Texto, cor e dica do selo de disponibilidade de um link"""
+        if result is None:
+            text, color = HEALTH_STATUS_STYLES["checking"]
+            return text, color, "Ainda não verificado"
+        text, color = HEALTH_STATUS_STYLES[result["status"]]
+        checked = datetime.fromtimestamp(result["checked_at"]).strftime("%d/%m %H:%M")
+        if result["status"] == "ok":
+            tooltip = f"HTTP {result['code']} em {result['elapsed_ms']:.0f} ms (verificado {checked})"
+        elif result["status"] == "broken":
+            tooltip = f"HTTP {result['code']} {result['error']} (verificado {checked})"
+        else:
+            tooltip = f"Sem resposta: {result['error']} (verificado {checked})"
+        return text, color, tooltip
+    
+    def _create_health_badge(self, link):
+        text, color, tooltip = self._health_badge_content(self.health_checker.get(link["url"]))
+        badge = ft.Container(
+            content=ft.Text(text, size=11, color=ft.Colors.WHITE, weight=ft.FontWeight.BOLD),
+            bgcolor=color,
+            tooltip=tooltip,
+            border_radius=10,
+            padding=ft.padding.only(left=8, right=8, top=2, bottom=2),
+        )
+        self.health_badges[id(link)] = badge
+        return badge
+    
+    def _on_health_result(self, url, result):
+        """Atualiza os selos dos cards com a URL verificada (chamado pelas threads do verificador)"""
+        text, color, tooltip = self._health_badge_content(result)
+        for link in self.links:
+            badge = self.health_badges.get(id(link))
+            if link["url"] != url or badge is None:
+                continue
+            badge.content.value = text
+            badge.bgcolor = color
+            badge.tooltip = tooltip
+            try:
+                badge.update()
+            except Exception:
+                # O card não está na tela no momento (filtrado ou ainda não montado)
+                pass
+    
+    def _check_all_links(self, e=None):
+        """Verifica de novo todos os links, ignorando o cache"""
+        self.health_checker.check([link["url"] for link in self.links], force=True)
+        if self.page:
+            self.page.show_snack_bar(
+                ft.SnackBar(
+                    content=ft.Text(f"Verificando {len(self.links)} links..."),
+                    bgcolor=ft.Colors.INDIGO,
+                    action="OK",
+                )
+            )
+    
     def _create_link_card(self, link):
         """Cria um card para exibir um link"""
         # Determina a cor do card com base na categoria
@@ -330,6 +1046,7 @@ class Module:
                                         overflow=ft.TextOverflow.ELLIPSIS,
                                         expand=True,
                                     ),
+                                    self._create_health_badge(link),
                                 ],
                                 spacing=0,
                                 alignment=ft.MainAxisAlignment.START,
@@ -394,7 +1111,7 @@ class Module:
                                         spacing=4,
                                         alignment=ft.MainAxisAlignment.CENTER,
                                     ),
-                                    on_click=lambda e, url=link["url"]: self._open_link(e, url),
+                                    on_click=lambda e, url=link["url"], l=link: self._open_link(e, url, l),
                                     style=ft.ButtonStyle(
                                         shape=ft.RoundedRectangleBorder(radius=8),
                                         color=ft.Colors.WHITE,
@@ -736,9 +1453,20 @@ class Module:
     
     def _show_import_dialog(self, e=None):
         """Exibe o diálogo para importar links em massa"""
+        # Arquivo exportado (CSV, JSON ou favoritos do navegador)
+        import_path = ft.TextField(
+            label="Arquivo (CSV, JSON ou favoritos HTML do navegador)",
+            hint_text="Deixe em branco para usar o texto colado abaixo",
+            border=ft.InputBorder.OUTLINE,
+            width=600,
+            prefix_icon=ft.Icons.FOLDER_OPEN,
+            focused_border_color=ft.Colors.INDIGO,
+            focused_color=ft.Colors.INDIGO,
+        )
+        
         # Área de texto para colar os links
         import_text = ft.TextField(
-            label="Cole os links no formato CSV",
+            label="Ou cole os links (CSV, JSON ou HTML de favoritos)",
             hint_text="título,descrição,url,categoria",
             border=ft.InputBorder.OUTLINE,
             width=600,
@@ -770,6 +1498,13 @@ class Module:
                             padding=8,
                             margin=ft.margin.only(top=4, bottom=8),
                         ),
+                        ft.Text(
+                            "Também aceita CSV com cabeçalho, lista JSON (ou um objeto por linha) "
+                            "com title/description/url/category e favoritos exportados do navegador "
+                            "(as pastas viram categorias). URLs já cadastradas são ignoradas.",
+                            size=12,
+                            color=ft.Colors.GREY_700,
+                        ),
                         ft.Text(
                             "Exemplo:",
                             weight=ft.FontWeight.BOLD,
@@ -795,11 +1530,23 @@ class Module:
             color=ft.Colors.SURFACE_VARIANT,
         )
         
+        # Relatório da última importação (linhas com erro)
+        report_text = ft.Text("", size=12, selectable=True, font_family="monospace", color=ft.Colors.RED_700)
+        report_container = ft.Container(
+            content=ft.Column([report_text], scroll=ft.ScrollMode.AUTO),
+            bgcolor=ft.Colors.RED_50,
+            border_radius=4,
+            padding=8,
+            height=150,
+            visible=False,
+        )
+        
         # Função para processar a importação
         def handle_import(e):
             csv_text = import_text.value
+            path = (import_path.value or "").strip()
             
-            if not csv_text:
+            if not csv_text and not path:
                 self.page.show_snack_bar(
                     ft.SnackBar(
                         content=ft.Text("Nenhum dado para importar"),
@@ -810,37 +1557,8 @@ class Module:
                 return
             
             try:
-                # Processa o CSV
-                reader = csv.reader(io.StringIO(csv_text))
-                imported_count = 0
-                
-                for row in reader:
-                    if len(row) >= 3:  # Pelo menos título, descrição e URL
-                        title = row[0].strip()
-                        description = row[1].strip()
-                        url = row[2].strip()
-                        category = row[3].strip() if len(row) > 3 else "Geral"
-                        
-                        if title and url:  # Título e URL são obrigatórios
-                            # Adiciona o protocolo http:// se não estiver presente
-                            if not url.startswith("http://") and not url.startswith("https://"):
-                                url = "http://" + url
-                            
-                            self._add_link(title, description, url, category)
-                            
-                            imported_count += 1
-                
-                # Fecha o diálogo
-                import_dialog.open = False
-                self.page.update()
-                
-                # Exibe mensagem de sucesso
-                self.page.show_snack_bar(
-                    ft.SnackBar(
-                        content=ft.Text(f"{imported_count} links importados com sucesso"),
-                        bgcolor=ft.Colors.GREEN_500,
-                        action="OK",
-                    )
+                imported_count, duplicates, errors = self._bulk_import(
+                    iter_import_rows(text=None if path else csv_text, path=path or None)
                 )
             except Exception as e:
                 self.page.show_snack_bar(
@@ -850,6 +1568,30 @@ class Module:
                         action="OK",
                     )
                 )
+                return
+            
+            summary = f"{imported_count} links importados"
+            if duplicates:
+                summary += f", {duplicates} já existentes ignorados"
+            if errors:
+                summary += f", {len(errors)} linhas com erro"
+                # Mantém o diálogo aberto com as linhas que precisam de correção
+                lines = [f"Linha {number}: {message}" for number, message in errors[:IMPORT_ERROR_DISPLAY_LIMIT]]
+                if len(errors) > IMPORT_ERROR_DISPLAY_LIMIT:
+                    lines.append(f"... e mais {len(errors) - IMPORT_ERROR_DISPLAY_LIMIT} erros")
+                report_text.value = "\n".join(lines)
+                report_container.visible = True
+            else:
+                import_dialog.open = False
+            self.page.update()
+            
+            self.page.show_snack_bar(
+                ft.SnackBar(
+                    content=ft.Text(summary),
+                    bgcolor=ft.Colors.ORANGE_700 if errors else ft.Colors.GREEN_500,
+                    action="OK",
+                )
+            )
         
         # Cria o diálogo
         import_dialog = ft.AlertDialog(
@@ -858,7 +1600,11 @@ class Module:
                 [
                     example_card,
                     ft.Container(height=16),
+                    import_path,
+                    ft.Container(height=16),
                     import_text,
+                    ft.Container(height=16),
+                    report_container,
                 ],
                 spacing=0,
                 width=600,
@@ -944,6 +1690,13 @@ class Module:
             height=40,
         )
         
+        check_button = ft.IconButton(
+            icon=ft.Icons.HEALTH_AND_SAFETY,
+            icon_color=ft.Colors.INDIGO,
+            tooltip="Verificar se os links respondem",
+            on_click=self._check_all_links,
+        )
+        
         import_button = ft.ElevatedButton(
             content=ft.Row(
                 [
@@ -1011,6 +1764,8 @@ class Module:
                                                     add_button,
                                                     ft.Container(width=8),
                                                     import_button,
+                                                    ft.Container(width=8),
+                                                    check_button,
                                                 ],
                                                 spacing=0,
                                             ),
@@ -1050,8 +1805,15 @@ class Module:
     def did_mount(self, page):
         """Chamado quando o módulo é montado na página"""
         self.page = page
+        
+        # Verifica os links sem resultado recente e agenda as próximas verificações
+        self.health_checker.start()
+        self.health_checker.check([link["url"] for link in self.links])
+        self.health_checker.start_schedule(lambda: [link["url"] for link in self.links])
     
     def will_unmount(self):
         """Chamado quando o módulo é desmontado da página"""
-        pass
+        if self.search_timer is not None:
+            self.search_timer.cancel()
+        self.health_checker.stop()
 